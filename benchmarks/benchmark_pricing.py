@@ -0,0 +1,811 @@
+"""Pricing benchmark suite.
+
+Run from the root of the project:
+
+    python -m benchmarks.benchmark_pricing --output bench_output.json
+
+Every benchmark reports its throughput (calls per second). When a baseline is given (by default
+`benchmarks/baseline.json`), the script exits with status 1 whenever the throughput of a
+benchmark falls more than `--threshold` (relative) below its baseline value.
+Use `--update-baseline` to store the current results as the new baseline.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy
+
+from src.pricing.barrier_options import BarrierOption
+from src.pricing.base.curve_bootstrap import (
+    CurveBootstrapper,
+    Deposit,
+    ForwardRateAgreement,
+    Swap,
+)
+from src.pricing.base.curve_risk import CurveRisk, pad_cash_flows
+from src.pricing.base.heston import HestonParameters, calibrate_heston
+from src.pricing.base.parametric_volatility import (
+    SSVIVolatility,
+    SVIVolatility,
+    ssvi_total_variance,
+)
+from src.pricing.base.rate import Rate
+from src.pricing.base.volatility import Volatility
+from src.pricing.binary_options import BinaryOption
+from src.pricing.fixed_income import Bond, BondPortfolio
+from src.pricing.heston_options import HestonOption
+from src.pricing.option_strategies import (
+    ButterflyStrategy,
+    CallSpreadStrategy,
+    MultiLegStrategy,
+    PutSpreadStrategy,
+    StraddleStrategy,
+    StrangleStrategy,
+    StrapStrategy,
+    StripStrategy,
+)
+from src.pricing.product_builder import (
+    BarrierComponent,
+    BondComponent,
+    ComposedProduct,
+    DigitalComponent,
+    VanillaComponent,
+    capital_protected_note,
+)
+from src.pricing.risk import HistoricalVaR, MarketShocks, Position
+from src.pricing.solver import reverse_convertible_coupons
+from src.pricing.structured_products import (
+    AutocallableNote,
+    BasketReverseConvertible,
+    OutperformerCertificate,
+    ReverseConvertible,
+)
+from src.pricing.vanilla_options import VanillaBook, VanillaOption
+from src.utility.types import Maturity
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+BATCH_SIZE = 1000
+
+RATE = Rate(rate=0.03)
+RATE_CURVE = Rate(
+    rate_curve={Maturity(0.5): 0.02, Maturity(1.0): 0.03, Maturity(2.0): 0.035}
+)
+VOLATILITY = Volatility(volatility=0.2)
+VOLATILITY_SURFACE_QUOTES = {
+    (0.9, 1.0): 0.14,
+    (1.0, 1.0): 0.10,
+    (1.1, 1.0): 0.12,
+    (0.9, 1.5): 0.13,
+    (1.0, 1.5): 0.09,
+    (1.1, 1.5): 0.13,
+    (0.9, 2.0): 0.10,
+    (1.0, 2.0): 0.10,
+    (1.1, 2.0): 0.08,
+}
+VOLATILITY_SURFACE = Volatility(volatility_surface=VOLATILITY_SURFACE_QUOTES)
+MATURITY = Maturity(maturity_in_years=1.0)
+BATCH_STRIKES = np.linspace(80.0, 120.0, BATCH_SIZE)
+HESTON_PARAMETERS = HestonParameters(0.04, 1.5, 0.05, 0.6, -0.7)
+PROFILE_SPOTS = np.linspace(50.0, 150.0, BATCH_SIZE)
+SCENARIO_SPOT_SHIFTS = np.linspace(-0.1, 0.1, 21)
+SCENARIO_VOLATILITY_SHIFTS = np.linspace(-0.05, 0.05, 11)
+
+
+def _price_and_greeks(product: Any) -> None:
+    product.compute_price()
+    product.compute_greeks()
+
+
+def _vanilla_scalar() -> None:
+    _price_and_greeks(
+        VanillaOption(100.0, 105.0, MATURITY, RATE, VOLATILITY, "call", 0.0)
+    )
+
+
+def _vanilla_scalar_surface() -> None:
+    _price_and_greeks(
+        VanillaOption(
+            100.0, 105.0, MATURITY, RATE_CURVE, VOLATILITY_SURFACE, "call", 0.0
+        )
+    )
+
+
+def _vanilla_batch() -> None:
+    for strike in BATCH_STRIKES:
+        VanillaOption(
+            100.0, strike, MATURITY, RATE, VOLATILITY, "call", 0.0
+        ).compute_price()
+
+
+def _vanilla_book_tick() -> Callable[[], None]:
+    book = VanillaBook(
+        [
+            VanillaOption(100.0, strike, MATURITY, RATE_CURVE, VOLATILITY_SURFACE, "call", 0.0)
+            for strike in BATCH_STRIKES
+        ]
+    )
+    spot_prices = itertools.cycle(np.linspace(95.0, 105.0, 101))
+
+    def run() -> None:
+        book.reprice({None: next(spot_prices)})
+
+    return run
+
+
+def _volatility_surface_lookup(compiled: bool) -> Callable[[], None]:
+    generator = np.random.default_rng(0)
+    moneyness = generator.uniform(0.9, 1.1, 10 * BATCH_SIZE)
+    maturities = generator.uniform(1.0, 2.0, 10 * BATCH_SIZE)
+    surface = Volatility(
+        volatility_surface=VOLATILITY_SURFACE_QUOTES,
+        lookup_resolution=(1024, 256) if compiled else None,
+    )
+
+    def run() -> None:
+        surface.get_volatilities(moneyness, maturities)
+
+    return run
+
+
+def _smile_quotes() -> Dict[Tuple[float, float], float]:
+    """Quotes of a 9 strikes x 4 maturities SSVI surface with a negative skew."""
+    return {
+        (float(moneyness), maturity): float(
+            np.sqrt(
+                ssvi_total_variance(np.log(moneyness), 0.04 * maturity, -0.5, 1.2, 0.4)
+                / maturity
+            )
+        )
+        for moneyness in np.linspace(0.7, 1.3, 9)
+        for maturity in (0.25, 0.5, 1.0, 2.0)
+    }
+
+
+def _parametric_calibration(model: Any) -> Callable[[], None]:
+    quotes = _smile_quotes()
+
+    def run() -> None:
+        model(quotes)
+
+    return run
+
+
+def _parametric_lookup() -> Callable[[], None]:
+    generator = np.random.default_rng(0)
+    moneyness = generator.uniform(0.7, 1.3, 10 * BATCH_SIZE)
+    maturities = generator.uniform(0.25, 2.0, 10 * BATCH_SIZE)
+    surface = SSVIVolatility(_smile_quotes())
+
+    def run() -> None:
+        surface.get_volatilities(moneyness, maturities)
+
+    return run
+
+
+def _heston_chain() -> None:
+    HestonOption(
+        100.0, 100.0, MATURITY, RATE, VOLATILITY, "call", 0.0,
+        HESTON_PARAMETERS,
+    ).compute_chain(BATCH_STRIKES)
+
+
+def _heston_calibration() -> Callable[[], None]:
+    surface = SSVIVolatility(_smile_quotes())
+
+    def run() -> None:
+        calibrate_heston(surface, 100.0, RATE, (0.25, 0.5, 1.0, 2.0))
+
+    return run
+
+
+def _binary_scalar() -> None:
+    _price_and_greeks(BinaryOption(100.0, 105.0, MATURITY, RATE, VOLATILITY, "call", 0.0))
+
+
+def _binary_batch() -> None:
+    for strike in BATCH_STRIKES:
+        BinaryOption(100.0, strike, MATURITY, RATE, VOLATILITY, "call", 0.0).compute_price()
+
+
+def _barrier(num_paths: int) -> Callable[[], None]:
+    def run() -> None:
+        BarrierOption(
+            100.0, 100.0, MATURITY, RATE, VOLATILITY, "put", 80.0, "ki", "down", 0.0
+        ).compute_price(num_paths=num_paths, num_steps=252)
+
+    return run
+
+
+def _check_local_volatility_greeks(surface: Volatility) -> None:
+    """The greeks of a local volatility barrier option bump the market around the surface (vega shifts the
+    surface) and restore it: on the same draws, the price is unchanged after the greeks."""
+    option = BarrierOption(
+        100.0, 100.0, MATURITY, RATE_CURVE, surface, "put", 80.0, "ki", "down", 0.0,
+        local_volatility=True,
+    )
+    np.random.seed(0)
+    price = option.compute_price()
+    np.random.seed(0)
+    shifted_price = option.compute_price_variation(volatility_shift=0.01)
+    greeks = option.compute_greeks()
+    np.random.seed(0)
+    assert option.compute_price() == price, "Error the greeks did not restore the market of the option."
+    assert shifted_price > price, "Error a shift of the volatility surface does not raise the price of a put."
+    assert all(np.isfinite(value) for value in greeks.values()), "Error provide finite greeks."
+
+
+def _local_volatility_barrier(num_paths: int) -> Callable[[], None]:
+    surface = SSVIVolatility(_smile_quotes())
+    _check_local_volatility_greeks(surface)
+
+    def run() -> None:
+        BarrierOption(
+            100.0, 100.0, MATURITY, RATE, surface, "put", 80.0, "ki", "down", 0.0,
+            local_volatility=True,
+        ).compute_price(num_paths=num_paths, num_steps=252)
+
+    return run
+
+
+def _heston_barrier(num_paths: int) -> Callable[[], None]:
+    def run() -> None:
+        BarrierOption(
+            100.0, 100.0, MATURITY, RATE, VOLATILITY, "put", 80.0, "ki", "down", 0.0,
+            heston_parameters=HESTON_PARAMETERS,
+        ).compute_price(num_paths=num_paths, num_steps=252)
+
+    return run
+
+
+def _curve_instruments() -> List[Any]:
+    """Deposits, FRAs and annual par swaps up to 30 years (20 instruments)."""
+    return (
+        [Deposit(maturity, 0.03 + 0.002 * maturity) for maturity in (1 / 12, 1 / 6, 0.25)]
+        + [ForwardRateAgreement(start, start + 0.25, 0.031 + 0.002 * start) for start in (0.25, 0.5)]
+        + [Swap(float(maturity), 0.033 + 0.001 * np.log(maturity)) for maturity in (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 15, 20, 25, 30)]
+    )
+
+
+def _curve_bootstrap() -> None:
+    CurveBootstrapper(_curve_instruments()).curve
+
+
+def _check_incremental_bootstrap() -> None:
+    """The curve updated by `update_quotes` is the one bootstrapped from scratch on the new quotes. The swaps are
+    quarterly and the first pillar is 3 months, so that several cash flows of a swap depend on the same pillar."""
+    instruments = [
+        instrument._replace(frequency=4) if isinstance(instrument, Swap) else instrument
+        for instrument in _curve_instruments()
+        if not (isinstance(instrument, Deposit) and instrument.maturity_in_years < 0.25)
+    ]
+    for index in (0, 4, len(instruments) - 2):
+        bootstrapper = CurveBootstrapper(instruments)
+        bootstrapper.update_quotes({index: bootstrapper.instruments[index].rate + 1e-3})
+        rebuilt = CurveBootstrapper(bootstrapper.instruments)
+        assert np.allclose(
+            bootstrapper.zero_rates, rebuilt.zero_rates, rtol=0.0, atol=1e-10
+        ), f"Error the incremental bootstrap of a tick on the instrument {index} differs from a full bootstrap."
+
+
+def _curve_tick() -> Callable[[], None]:
+    _check_incremental_bootstrap()
+    bootstrapper = CurveBootstrapper(_curve_instruments())
+    quote = bootstrapper.instruments[-2].rate
+
+    def run() -> None:
+        bootstrapper.update_quotes({len(bootstrapper.instruments) - 2: quote + 1e-4})
+
+    return run
+
+
+def _rate_curve_lookup(
+    interpolation_type: str, num_points: Optional[int] = None
+) -> Callable[[], None]:
+    """Lookups on the bootstrapped curve: one maturity when `num_points` is None, else an array of maturities."""
+    bootstrapper = CurveBootstrapper(_curve_instruments())
+    rate = Rate(
+        rate_curve={
+            Maturity(maturity_in_years=float(pillar)): float(zero_rate)
+            for pillar, zero_rate in zip(bootstrapper.pillars, bootstrapper.zero_rates)
+        },
+        interpolation_type=interpolation_type,
+    )
+    if num_points is None:
+        maturity = Maturity(maturity_in_years=7.3)
+        return lambda: rate.get_rate(maturity)
+    maturities = np.random.default_rng(0).uniform(0.0, 35.0, num_points)
+    return lambda: rate.get_rates(maturities)
+
+
+def _key_rate_dv01(num_bonds: int) -> Callable[[], None]:
+    """Key rate DV01 of a book of coupon bonds (maturities up to 30 years) on the 20 pillars of the bootstrapped curve."""
+    bootstrapper = CurveBootstrapper(_curve_instruments())
+    rng = np.random.default_rng(0)
+    cash_flows = []
+    for maturity, coupon_rate, frequency in zip(
+        rng.uniform(0.5, 30.0, num_bonds), rng.uniform(0.0, 0.06, num_bonds), rng.choice([1, 2, 4], num_bonds)
+    ):
+        times = maturity - np.arange(int(np.ceil(maturity * frequency)))[::-1] / frequency
+        amounts = np.full(times.size, 100 * coupon_rate / frequency)
+        amounts[-1] += 100
+        cash_flows.append((times, amounts))
+    risk = CurveRisk(bootstrapper.pillars)
+
+    def run() -> None:
+        risk.compute(bootstrapper.curve, pad_cash_flows(cash_flows))
+
+    return run
+
+
+def _bond_book(num_bonds: int) -> Dict[str, List[float]]:
+    """Nominals, coupon rates, frequencies and maturities (up to 30 years) of a book of bonds."""
+    rng = np.random.default_rng(0)
+    return {
+        "nominals": rng.uniform(1_000, 1_000_000, num_bonds).tolist(),
+        "coupon_rates": rng.uniform(0.0, 0.06, num_bonds).tolist(),
+        "frequencies": rng.choice([1, 2, 4], num_bonds).tolist(),
+        "maturities": rng.uniform(0.5, 30.0, num_bonds).tolist(),
+    }
+
+
+def _check_bond_portfolio_parity() -> None:
+    """The prices and yields of `BondPortfolio` are the ones of `Bond`, whatever the coupon frequency (the
+    maturities are multiples of the coupon periods, where a floating point schedule could add a coupon)."""
+    frequencies = [1, 2, 3, 4, 12]
+    maturities = [0.5, 1.0, 1.5, 2.0, 7.25, 30.0]
+    book = {
+        "nominals": [1000.0] * len(frequencies) * len(maturities),
+        "coupon_rates": [0.04] * len(frequencies) * len(maturities),
+        "frequencies": [frequency for frequency in frequencies for _ in maturities],
+        "maturities": maturities * len(frequencies),
+    }
+    portfolio = BondPortfolio(RATE_CURVE, **book)
+    bonds = [
+        Bond(RATE_CURVE, Maturity(maturity_in_years=maturity), 1000, 0.04, frequency)
+        for frequency, maturity in zip(book["frequencies"], book["maturities"])
+    ]
+    assert np.allclose(
+        portfolio.compute_price(), [bond.compute_price() for bond in bonds], rtol=1e-12, atol=0.0
+    ), "Error the prices of BondPortfolio differ from the ones of Bond."
+    assert np.allclose(
+        portfolio.ytm(), [bond.ytm() for bond in bonds], rtol=0.0, atol=1e-10
+    ), "Error the yields to maturity of BondPortfolio differ from the ones of Bond."
+
+
+def _bond_portfolio(num_bonds: int) -> Callable[[], None]:
+    _check_bond_portfolio_parity()
+    book = _bond_book(num_bonds)
+    return lambda: BondPortfolio(RATE_CURVE, **book).compute()
+
+
+def _bond_ytm() -> None:
+    bond = Bond(RATE_CURVE, Maturity(maturity_in_years=5.0), 1000, 0.04, 2)
+    bond.compute_price()
+    bond.ytm()
+
+
+def _strategies() -> None:
+    arguments = (MATURITY, RATE, VOLATILITY, 0.0)
+    for strategy in (
+        StraddleStrategy(100.0, 100.0, *arguments),
+        StrangleStrategy(100.0, 95.0, 105.0, *arguments),
+        ButterflyStrategy(100.0, 90.0, 100.0, 110.0, *arguments),
+        CallSpreadStrategy(100.0, 95.0, 105.0, *arguments),
+        PutSpreadStrategy(100.0, 95.0, 105.0, *arguments),
+        StripStrategy(100.0, 95.0, 105.0, *arguments),
+        StrapStrategy(100.0, 95.0, 105.0, *arguments),
+    ):
+        _price_and_greeks(strategy)
+
+
+def _multi_leg_strategy() -> None:
+    legs = [
+        (1.0 if index % 2 else -1.0, "call" if index % 3 else "put", strike)
+        for index, strike in enumerate(np.linspace(80.0, 120.0, 50))
+    ]
+    _price_and_greeks(
+        MultiLegStrategy(100.0, legs, MATURITY, RATE_CURVE, VOLATILITY_SURFACE, 0.0)
+    )
+
+
+def _strategy_profile() -> None:
+    ButterflyStrategy(
+        100.0, 90.0, 100.0, 110.0, MATURITY, RATE, VOLATILITY, 0.0
+    ).compute_profile(PROFILE_SPOTS, horizons=[0.0, 0.5, 1.0])
+
+
+def _scenario_grid() -> None:
+    ReverseConvertible(
+        RATE_CURVE, MATURITY, 100.0, VOLATILITY_SURFACE, 0.05, 0.0
+    ).compute_scenarios(SCENARIO_SPOT_SHIFTS, SCENARIO_VOLATILITY_SHIFTS)
+
+
+def _historical_var(num_positions: int, num_scenarios: int) -> Callable[[], None]:
+    generator = np.random.default_rng(0)
+    shocks = MarketShocks(
+        generator.normal(0.0, 0.015, (num_scenarios, 10)),
+        generator.normal(0.0, 0.005, (num_scenarios, 10)),
+        generator.normal(0.0, 0.0005, num_scenarios),
+    )
+    products = [
+        VanillaOption(100.0, 105.0, MATURITY, RATE_CURVE, VOLATILITY_SURFACE, "call", 0.0),
+        BinaryOption(100.0, 100.0, MATURITY, RATE_CURVE, VOLATILITY_SURFACE, "put", 0.0),
+        StrangleStrategy(100.0, 95.0, 105.0, MATURITY, RATE_CURVE, VOLATILITY_SURFACE, 0.0),
+        ReverseConvertible(RATE_CURVE, MATURITY, 100.0, VOLATILITY_SURFACE, 0.05, 0.0),
+        Bond(RATE_CURVE, Maturity(maturity_in_years=5.0), 1000, 0.04, 2),
+    ]
+    positions = [
+        Position(products[index % len(products)], 1.0 + index % 3, index % 10)
+        for index in range(num_positions)
+    ]
+
+    def run() -> None:
+        HistoricalVaR(positions, shocks).compute_risk()
+
+    return run
+
+
+def _reverse_convertible() -> None:
+    _price_and_greeks(ReverseConvertible(RATE, MATURITY, 100.0, VOLATILITY, 0.05, 0.0))
+
+
+def _reverse_convertible_coupon_grid() -> None:
+    reverse_convertible_coupons(
+        RATE_CURVE,
+        VOLATILITY_SURFACE,
+        100.0,
+        np.linspace(0.5, 2.0, 20),
+        np.linspace(80.0, 120.0, 50),
+        98.0,
+    )
+
+
+def _outperformer_certificate() -> None:
+    _price_and_greeks(
+        OutperformerCertificate(RATE, MATURITY, 100.0, VOLATILITY, 1.2, 0.0)
+    )
+
+
+def _autocallable(
+    num_paths: int, heston_parameters: Optional[HestonParameters] = None
+) -> Callable[[], None]:
+    def run() -> None:
+        note = AutocallableNote(
+            RATE, Maturity(maturity_in_years=2.0), 100.0, VOLATILITY, 0.02, nb_observations=8,
+            heston_parameters=heston_parameters,
+        )
+        note.compute_price(num_paths=num_paths)
+        note.compute_greeks(num_paths=num_paths)
+
+    return run
+
+
+def _worst_of_basket(num_underlyings: int, num_paths: int) -> Callable[[], None]:
+    correlation = np.full((num_underlyings, num_underlyings), 0.5)
+    np.fill_diagonal(correlation, 1.0)
+    spot_prices = np.linspace(80.0, 120.0, num_underlyings)
+    volatilities = [Volatility(volatility=v) for v in np.linspace(0.15, 0.3, num_underlyings)]
+
+    def run() -> None:
+        note = AutocallableNote(
+            RATE,
+            Maturity(maturity_in_years=2.0),
+            spot_prices,
+            volatilities,
+            0.02,
+            nb_observations=8,
+            correlation=correlation,
+        )
+        note.compute_price(num_paths=num_paths)
+        note.compute_greeks(num_paths=num_paths)
+        BasketReverseConvertible(
+            RATE, MATURITY, spot_prices, volatilities, 0.05, correlation
+        ).compute_price(num_paths=num_paths)
+
+    return run
+
+
+def _capital_protected_note() -> None:
+    _price_and_greeks(capital_protected_note(RATE, MATURITY, 100.0, VOLATILITY, 0.9, 1.2, 1.3))
+
+
+def _composed_product(num_strikes: int) -> Callable[[], None]:
+    strike_prices = np.linspace(80.0, 120.0, num_strikes)
+    components = (
+        [BondComponent(100.0)]
+        + [VanillaComponent(k, "call", 0.1) for k in strike_prices]
+        + [DigitalComponent(k, "put", -1.0) for k in strike_prices]
+    )
+
+    def run() -> None:
+        _price_and_greeks(
+            ComposedProduct(RATE, MATURITY, 100.0, VOLATILITY_SURFACE, components)
+        )
+
+    return run
+
+
+def _composed_barriers(num_legs: int, num_paths: int) -> Callable[[], None]:
+    components = [
+        BarrierComponent(k, "put", 70.0, "ki", "down", -1.0)
+        for k in np.linspace(90.0, 110.0, num_legs)
+    ]
+
+    def run() -> None:
+        product = ComposedProduct(RATE, MATURITY, 100.0, VOLATILITY, components)
+        product.compute_price(num_paths=num_paths, num_steps=250)
+        product.compute_greeks(num_paths=num_paths, num_steps=250)
+
+    return run
+
+
+def _api_benchmarks() -> List[Tuple[str, Callable[[], None]]]:
+    from fastapi.testclient import TestClient
+
+    from src.main_backend import app
+
+    client = TestClient(app)
+    requests = [
+        (
+            "api_vanilla_option",
+            "/api/v1/price/option/vanilla",
+            {
+                "spot_price": 100,
+                "strike_price": 100,
+                "maturity": 1,
+                "rate": 0.05,
+                "dividend": 0.0,
+                "volatility": 0.2,
+                "option_type": "call",
+            },
+        ),
+        (
+            "api_straddle_strategy",
+            "/api/v1/price/option-strategy/straddle",
+            {
+                "spot_price": 100,
+                "strike_price": 100,
+                "maturity": 1,
+                "rate": 0.05,
+                "dividend": 0.0,
+                "volatility": 0.2,
+            },
+        ),
+        (
+            "api_reverse_convertible",
+            "/api/v1/price/structured-product/reverse-convertible",
+            {
+                "spot_price": 100,
+                "maturity": 1,
+                "rate_curve": {"0.5": 0.02, "1": 0.06},
+                "coupon": 0.05,
+                "dividend": 0.0,
+                "volatility_surface": {
+                    "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
+                    "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
+                    "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
+                },
+            },
+        ),
+        (
+            "api_bond_portfolio_1000_bonds",
+            "/api/v1/price/bond-portfolio",
+            {"rate_curve": {"0.5": 0.02, "1": 0.06, "30": 0.04}, **_bond_book(1_000)},
+        ),
+        (
+            "api_vanilla_bond",
+            "/api/v1/price/bond/vanilla",
+            {
+                "rate": 0.05,
+                "maturity": 1,
+                "nominal": 1000,
+                "coupon_rate": 0.2,
+                "nb_coupon": 2,
+            },
+        ),
+    ]
+
+    def post(url: str, body: Dict[str, Any]) -> Callable[[], None]:
+        def run() -> None:
+            response = client.post(url, json=body)
+            response.raise_for_status()
+
+        return run
+
+    return [(name, post(url, body)) for name, url, body in requests]
+
+
+def get_benchmarks(include_api: bool = True) -> List[Tuple[str, Callable[[], None]]]:
+    benchmarks: List[Tuple[str, Callable[[], None]]] = [
+        ("vanilla_option_scalar", _vanilla_scalar),
+        ("vanilla_option_scalar_surface", _vanilla_scalar_surface),
+        (f"vanilla_option_batch_{BATCH_SIZE}", _vanilla_batch),
+        (f"vanilla_book_spot_tick_{BATCH_SIZE}", _vanilla_book_tick()),
+        (f"volatility_surface_lookup_{10 * BATCH_SIZE}_points", _volatility_surface_lookup(False)),
+        (
+            f"volatility_compiled_lookup_{10 * BATCH_SIZE}_points",
+            _volatility_surface_lookup(True),
+        ),
+        ("svi_calibration_36_quotes", _parametric_calibration(SVIVolatility)),
+        ("ssvi_calibration_36_quotes", _parametric_calibration(SSVIVolatility)),
+        (f"ssvi_surface_lookup_{10 * BATCH_SIZE}_points", _parametric_lookup()),
+        (f"heston_fft_chain_{BATCH_SIZE}_strikes", _heston_chain),
+        ("heston_calibration_36_quotes", _heston_calibration()),
+        ("binary_option_scalar", _binary_scalar),
+        (f"binary_option_batch_{BATCH_SIZE}", _binary_batch),
+        ("barrier_option_mc_1000_paths", _barrier(1_000)),
+        ("barrier_option_mc_5000_paths", _barrier(5_000)),
+        ("barrier_option_mc_20000_paths", _barrier(20_000)),
+        ("barrier_option_local_vol_mc_20000_paths", _local_volatility_barrier(20_000)),
+        ("barrier_option_heston_mc_20000_paths", _heston_barrier(20_000)),
+        ("bond_ytm", _bond_ytm),
+        ("bond_portfolio_10000_bonds", _bond_portfolio(10_000)),
+        ("curve_bootstrap_20_instruments", _curve_bootstrap),
+        ("curve_bootstrap_swap_tick", _curve_tick()),
+        ("key_rate_dv01_5000_bonds_20_pillars", _key_rate_dv01(5_000)),
+        ("rate_curve_scalar_lookup_linear", _rate_curve_lookup("linear")),
+        ("rate_curve_scalar_lookup_monotone_convex", _rate_curve_lookup("monotone-convex")),
+        (
+            f"rate_curve_lookup_linear_{100 * BATCH_SIZE}_points",
+            _rate_curve_lookup("linear", 100 * BATCH_SIZE),
+        ),
+        (
+            f"rate_curve_lookup_monotone_convex_{100 * BATCH_SIZE}_points",
+            _rate_curve_lookup("monotone-convex", 100 * BATCH_SIZE),
+        ),
+        ("historical_var_2000_positions_500_days", _historical_var(2_000, 500)),
+        ("option_strategies", _strategies),
+        ("multi_leg_strategy_50_legs", _multi_leg_strategy),
+        (f"strategy_profile_3x{BATCH_SIZE}_points", _strategy_profile),
+        ("reverse_convertible", _reverse_convertible),
+        ("reverse_convertible_scenario_grid_21x11", _scenario_grid),
+        ("reverse_convertible_coupon_grid_20x50", _reverse_convertible_coupon_grid),
+        ("outperformer_certificate", _outperformer_certificate),
+        ("autocallable_mc_100000_paths_8_dates", _autocallable(100_000)),
+        (
+            "autocallable_heston_mc_100000_paths_8_dates",
+            _autocallable(100_000, HESTON_PARAMETERS),
+        ),
+        ("worst_of_5_assets_mc_100000_paths", _worst_of_basket(5, 100_000)),
+        ("capital_protected_note", _capital_protected_note),
+        ("composed_product_41_closed_form_components", _composed_product(20)),
+        ("composed_product_10_barriers_mc_20000_paths", _composed_barriers(10, 20_000)),
+    ]
+    if include_api:
+        benchmarks += _api_benchmarks()
+    return benchmarks
+
+
+def run_benchmark(
+    function: Callable[[], None], min_time: float, repeats: int
+) -> Dict[str, float]:
+    """Time a function, the calls are grouped in rounds lasting at least `min_time` seconds and the
+    best round is kept to limit the noise of the machine.
+
+    Args:
+        function (Callable[[], None]): The function to benchmark.
+        min_time (float): Minimum duration of a round in seconds.
+        repeats (int): Number of rounds.
+
+    Returns:
+        Dict[str, float]: The throughput (calls per second) and the mean duration of a call.
+    """
+    function()  # warm-up (imports, caches, process pool...)
+    best = float("inf")
+    calls = 0
+    for _ in range(repeats):
+        calls, start = 0, time.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return {"ops_per_second": 1.0 / best, "mean_seconds": best, "calls": calls}
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """List the benchmarks whose throughput regressed more than `threshold` against the baseline.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): The current results.
+        baseline (Dict[str, Dict[str, float]]): The baseline results.
+        threshold (float): The tolerated relative throughput loss (0.25 = 25%).
+
+    Returns:
+        List[str]: A description of every regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]["ops_per_second"]
+        ratio = result["ops_per_second"] / reference
+        result["baseline_ratio"] = ratio
+        if ratio < 1.0 - threshold:
+            regressions.append(
+                f"{name}: {result['ops_per_second']:.2f} ops/s vs baseline {reference:.2f} ops/s ({ratio:.0%})"
+            )
+    return regressions
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Path of the JSON results file.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.environ.get("BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD)),
+        help="Tolerated relative throughput loss before failing (0.25 = 25%%).",
+    )
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--filter", default="", help="Only run the benchmarks containing this string."
+    )
+    parser.add_argument("--no-api", action="store_true", help="Skip the API benchmarks.")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(arguments)
+
+    warnings.filterwarnings("ignore")
+    results: Dict[str, Dict[str, float]] = {}
+    for name, function in get_benchmarks(include_api=not args.no_api):
+        if args.filter not in name:
+            continue
+        results[name] = run_benchmark(function, args.min_time, args.repeats)
+        print(
+            f"{name:<40} {results[name]['ops_per_second']:>12.2f} ops/s",
+            file=sys.stderr,
+        )
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "machine": platform.machine(),
+            "threshold": args.threshold,
+        },
+        "results": results,
+    }
+
+    regressions: List[str] = []
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+    report["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,57 @@
+import asyncio
+import json
+import logging
 import os
 import sys
-from typing import Annotated, Dict, Union
+import time
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, Dict, Union
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import Body, FastAPI, HTTPException, Depends
-from fastapi.responses import RedirectResponse
+from fastapi import (
+    Body,
+    FastAPI,
+    HTTPException,
+    Depends,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, RedirectResponse
+from pydantic import BaseModel, ValidationError
+from src.services.job_service import JobService, QueueFullError
+from src.services.live_pricing_service import LivePricingSession
 from src.services.pricing_service import PricingService
+from src.utility.metrics import registry, request_stages, server_timing_header
+from src.utility.profiling import (
+    PROFILING_HEADER,
+    format_profile,
+    profiling_enabled_by_default,
+    profiling_session,
+)
 from src.utility.schema import (
+    AutocallableBaseModel,
     BarrierOptionBaseModel,
     BinaryOptionBaseModel,
     BondBaseModel,
+    BondPortfolioBaseModel,
+    BondPortfolioResultBaseModel,
     ButterflyStrategyBaseModel,
     CallSpreadStrategyBaseModel,
+    CapitalProtectedNoteBaseModel,
+    DiscountCertificateBaseModel,
+    HestonOptionBaseModel,
+    JobResultBaseModel,
+    JobSubmissionBaseModel,
     OptionBaseModel,
     OutperformerCertificateBaseModel,
     PricingResultBaseModel,
     PutSpreadStrategyBaseModel,
     ReverseConvertibleBaseModel,
+    ScenarioBaseModel,
+    ScenarioResultBaseModel,
+    SolverBaseModel,
+    SolverResultBaseModel,
     StraddleStrategyBaseModel,
     StrangleStrategyBaseModel,
     StrapStrategyBaseModel,
@@ -27,9 +63,21 @@ from src.utility.types import (
     OptionKindType,
     OptionStrategyType,
     ProductKindType,
+    ScenarioProductKindType,
+    SolverProductKindType,
 )
 
+job_service = JobService()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    job_service.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="StructurerAPI",
     description=" This app is a structurer aimed app. The goal is to provide an programming interface (API) flexible that could be used to price different type of products quickly.<br><br>You will be able to:<br><ul><li>Price Bonds</li><li>Price Options</li><li>Price Options strategies</li><li>Price Structured products</li></ul>",
     summary="API for structured products and derivatives pricing.",
@@ -56,214 +104,349 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", PROFILING_HEADER],
 )
 
+profile_logger = logging.getLogger("pricing.profile")
+
+PRODUCT_KIND_PATH_PARAMETERS = ("product_kind", "option_kind", "option_strategy", "bond_type")
+
+
+@app.middleware("http")
+async def pricing_metrics_middleware(request: Request, call_next):
+    """Observe the latency of every request per endpoint and product kind and add the
+    `Server-Timing` header with the duration of each pricing stage."""
+    start = time.perf_counter()
+    with request_stages() as stages:
+        response = await call_next(request)
+    duration = time.perf_counter() - start
+    route = request.scope.get("route")
+    registry.observe(
+        "pricing_request_duration_seconds",
+        duration,
+        endpoint=getattr(route, "path", "unmatched"),
+        method=request.method,
+        product_kind=next(
+            (
+                request.path_params[parameter]
+                for parameter in PRODUCT_KIND_PATH_PARAMETERS
+                if parameter in request.path_params
+            ),
+            "",
+        ),
+        status=response.status_code,
+    )
+    response.headers["Server-Timing"] = server_timing_header(stages, duration)
+    return response
+
+
+@app.middleware("http")
+async def pricing_profile_middleware(request: Request, call_next):
+    """Profile the pricing hot paths (calls and cumulative time of compute_price, compute_greeks,
+    get_volatility, get_rate...) when `PRICING_PROFILE=1` or when the request carries the
+    `X-Pricing-Profile` header. The statistics are logged and returned in the same header."""
+    if not (profiling_enabled_by_default() or PROFILING_HEADER in request.headers):
+        return await call_next(request)
+    with profiling_session() as stats:
+        response = await call_next(request)
+    profile = format_profile(stats)
+    profile_logger.info("%s %s %s", request.method, request.url.path, profile)
+    response.headers[PROFILING_HEADER] = profile
+    return response
+
+
+STRUCTURED_PRODUCT_OPENAPI_EXAMPLES = {
+    "reverse_convertible": {
+        "summary": "Reverse convertible",
+        "description": "Reverse convertible example without neither vol surface nor rate curve",
+        "value": {
+            "spot_price": 100,
+            "maturity": 1,
+            "rate": 0.03,
+            "coupon": 0.05,
+            "dividend": 0.0,
+            "volatility": 0.20,
+        },
+    },
+    "reverse_convertible_vol_surf": {
+        "summary": "Reverse convertible with volatility surface",
+        "description": "Reverse convertible example without rate curve",
+        "value": {
+            "spot_price": 100,
+            "maturity": 1,
+            "rate": 0.03,
+            "coupon": 0.05,
+            "dividend": 0.0,
+            "volatility_surface": {
+                "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
+                "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
+                "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
+            },
+        },
+    },
+    "reverse_convertible_vol_surf_rate_curve": {
+        "summary": "Reverse convertible with volatility surface and rate curve",
+        "description": "Reverse convertible example",
+        "value": {
+            "spot_price": 100,
+            "maturity": 1,
+            "rate_curve": {"0.5": 0.02, "1": 0.06},
+            "coupon": 0.05,
+            "dividend": 0.0,
+            "volatility_surface": {
+                "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
+                "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
+                "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
+            },
+        },
+    },
+    "outperformer": {
+        "summary": "Outperformer Certificate",
+        "description": "Outperformer Certificate example without neither vol surface nor rate curve. Note that the volatility surface or the rate curve could be specified in the same manner than the reverse convertible.",
+        "value": {
+            "spot_price": 100,
+            "maturity": 1,
+            "rate": 0.03,
+            "dividend": 0.0,
+            "volatility": 0.20,
+            "participation": 1.2,
+            "foreign_rate": 0.02,
+        },
+    },
+    "autocallable": {
+        "summary": "Autocallable (Phoenix) note",
+        "description": "Phoenix note with memory coupons observed quarterly, priced by Monte Carlo. The observation dates could also be given explicitly with `observation_dates`.",
+        "value": {
+            "spot_price": 100,
+            "maturity": 2,
+            "rate": 0.03,
+            "dividend": 0.0,
+            "volatility": 0.20,
+            "coupon": 0.02,
+            "autocall_barrier": 1.0,
+            "coupon_barrier": 0.8,
+            "ki_barrier": 0.6,
+            "memory": True,
+            "nb_observations": 8,
+        },
+    },
+    "capital_protected_note": {
+        "summary": "Capital protected note",
+        "description": "Note protecting 90% of the nominal with a 120% participation in the rise of the underlying capped at +30%, priced as a zero-coupon bond and a call spread.",
+        "value": {
+            "spot_price": 100,
+            "maturity": 3,
+            "rate": 0.03,
+            "dividend": 0.0,
+            "volatility": 0.20,
+            "protection": 0.9,
+            "participation": 1.2,
+            "cap": 1.3,
+        },
+    },
+    "discount_certificate": {
+        "summary": "Discount certificate",
+        "description": "Certificate on one unit of the underlying capped at 110% of the spot price, priced as a zero-coupon bond and a short put.",
+        "value": {
+            "spot_price": 100,
+            "maturity": 1,
+            "rate": 0.03,
+            "dividend": 0.02,
+            "volatility": 0.20,
+            "cap": 1.1,
+        },
+    },
+}
+
+
+async def validate_structured_product(
+    product_kind: ProductKindType, request: Request
+) -> BaseModel:
+    """Validate the JSON body against the schema of the product kind of the URL, the `Union` of the
+    body otherwise falls back to another product when it is invalid, dropping the fields it lacks."""
+    return PricingService.STRUCTURED_PRODUCT_SCHEMAS[product_kind](**await request.json())
+
 
 @app.post(
     "/api/v1/price/structured-product/{product_kind}",
     response_model=PricingResultBaseModel,
 )
-def structured_product_pricing(
+async def structured_product_pricing(
     product_kind: ProductKindType,
+    request: Request,
     product: Annotated[
-        Union[ReverseConvertibleBaseModel, OutperformerCertificateBaseModel],
-        Body(
-            openapi_examples={
-                "reverse_convertible": {
-                    "summary": "Reverse convertible",
-                    "description": "Reverse convertible example without neither vol surface nor rate curve",
-                    "value": {
-                        "spot_price": 100,
-                        "maturity": 1,
-                        "rate": 0.03,
-                        "coupon": 0.05,
-                        "dividend": 0.0,
-                        "volatility": 0.20,
-                    },
-                },
-                "reverse_convertible_vol_surf": {
-                    "summary": "Reverse convertible with volatility surface",
-                    "description": "Reverse convertible example without rate curve",
-                    "value": {
-                        "spot_price": 100,
-                        "maturity": 1,
-                        "rate": 0.03,
-                        "coupon": 0.05,
-                        "dividend": 0.0,
-                        "volatility_surface": {
-                            "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
-                            "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
-                            "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
-                        },
-                    },
-                },
-                "reverse_convertible_vol_surf_rate_curve": {
-                    "summary": "Reverse convertible with volatility surface and rate curve",
-                    "description": "Reverse convertible example",
-                    "value": {
-                        "spot_price": 100,
-                        "maturity": 1,
-                        "rate_curve": {"0.5": 0.02, "1": 0.06},
-                        "coupon": 0.05,
-                        "dividend": 0.0,
-                        "volatility_surface": {
-                            "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
-                            "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
-                            "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
-                        },
-                    },
-                },
-                "outperformer": {
-                    "summary": "Outperformer Certificate",
-                    "description": "Outperformer Certificate example without neither vol surface nor rate curve. Note that the volatility surface or the rate curve could be specified in the same manner than the reverse convertible.",
-                    "value": {
-                        "spot_price": 100,
-                        "maturity": 1,
-                        "rate": 0.03,
-                        "dividend": 0.0,
-                        "volatility": 0.20,
-                        "participation": 1.2,
-                        "foreign_rate": 0.02,
-                    },
-                },
-            },
-        ),
+        Union[
+            ReverseConvertibleBaseModel,
+            OutperformerCertificateBaseModel,
+            AutocallableBaseModel,
+            CapitalProtectedNoteBaseModel,
+            DiscountCertificateBaseModel,
+        ],
+        Body(openapi_examples=STRUCTURED_PRODUCT_OPENAPI_EXAMPLES),
     ],
     pricing_service: PricingService = Depends(PricingService),
 ) -> Dict[str, float]:
-    """This API `HTTP POST` method can be used to price structured products.The 2 structured products that could be priced are outperformer certificate and reverse convertible.
+    """This API `HTTP POST` method can be used to price structured products.The 5 structured products that could be priced are outperformer certificate, reverse convertible, autocallable (Phoenix) note, capital protected note and discount certificate.
     The parameters that has to be in the JSON body are specified in the example section below.
     The structured product to price needs to be specified in the URL.
+    Monte Carlo priced products (autocallable) are computed in a dedicated process pool, use the `/api/v1/jobs` endpoints for long runs.
 
     Args:
     ----
-        product_kind (ProductKindType): The type of structured product to price among 'reverse-convertible', 'outperformer-certificate'.
-        product (Union[OutperformerCertificateBaseModel,ReverseConvertibleBaseModel]): The schema corresponding to the JSON body sent by the user. The details are available in the section below (example).
+        product_kind (ProductKindType): The type of structured product to price among 'reverse-convertible', 'outperformer-certificate', 'autocallable', 'capital-protected-note', 'discount-certificate'.
+        product (Union[OutperformerCertificateBaseModel,ReverseConvertibleBaseModel,AutocallableBaseModel,CapitalProtectedNoteBaseModel,DiscountCertificateBaseModel]): The schema corresponding to the JSON body sent by the user. The details are available in the section below (example).
         pricing_service (PricingService, optional): PricingService is a static class providing services to converge JSON schema to actual class while processing the input and returning the price and the associated greek. Defaults to Depends(PricingService).
 
     Raises:
     ----
         ValueError: Whether the user provides wrong arguments to the function.
-        HTTPException: The details of any other error occurring during the pricing.
+        HTTPException: The details of any other error occurring during the pricing, 429 whether the pricing pool is full.
 
     Returns:
     ----
         Dict[str, float]: A dict representing with keys as price and greek names and values as computed values.
     """
     try:
-        if product_kind == "reverse-convertible":
-            return pricing_service.process_reverse_convertible_structured_product(
-                ReverseConvertibleBaseModel(**product.model_dump(exclude_unset=True))
-            )
-        if product_kind == "outperformer-certificate":
-            return pricing_service.process_outperformer_certificate_structured_product(
-                OutperformerCertificateBaseModel(
-                    **product.model_dump(exclude_unset=True)
-                )
+        product = await validate_structured_product(product_kind, request)
+        if product_kind in pricing_service.MONTE_CARLO_PRODUCT_KINDS:
+            return await job_service.run(
+                pricing_service.process_structured_product, product_kind, product
             )
-        raise ValueError("Provide valid input.")
+        return await run_in_threadpool(
+            pricing_service.process_structured_product, product_kind, product
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=f"{e}") from e
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"{e}") from e
 
 
+OPTION_OPENAPI_EXAMPLES = {
+    "vanilla_binary_options": {
+        "summary": "Vanilla or Binary option",
+        "description": "Normal example without neither vol surface nor rate curve",
+        "value": {
+            "spot_price": 100,
+            "strike_price": 100,
+            "maturity": 1,
+            "rate": 0.05,
+            "dividend": 0.0,
+            "volatility": 0.2,
+            "option_type": "call",
+        },
+    },
+    "vanilla_binary_options_rates": {
+        "summary": "Vanilla or Binary option with Rate curve",
+        "description": "Normal example without vol surface",
+        "value": {
+            "spot_price": 100,
+            "strike_price": 100,
+            "maturity": 1,
+            "dividend": 0.0,
+            "rate_curve": {"0.5": 0.02, "1": 0.06},
+            "volatility": 0.2,
+            "option_type": "call",
+        },
+    },
+    "vanilla_binary_options_volsurface": {
+        "summary": "Vanilla or Binary option with volatility surface",
+        "description": "Normal example without rate curve",
+        "value": {
+            "spot_price": 100,
+            "strike_price": 110,
+            "maturity": 1,
+            "rate": 0.03,
+            "dividend": 0.0,
+            "volatility_surface": {
+                "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
+                "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
+                "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
+            },
+            "option_type": "call",
+        },
+    },
+    "barrier_option": {
+        "summary": "Barrier options",
+        "description": "Normal example without neither rate curve or volatility surface however it can be used the same way.",
+        "value": {
+            "spot_price": 80,
+            "strike_price": 100,
+            "maturity": 0.5,
+            "rate": 0.03,
+            "dividend": 0.0,
+            "volatility": 0.20,
+            "option_type": "put",
+            "barrier_level": 80,
+            "barrier_type": "ki",
+            "barrier_direction": "down",
+        },
+    },
+    "heston_option": {
+        "summary": "Heston option",
+        "description": "Vanilla option under the Heston model, without the 5 parameters the model is calibrated to the volatility (surface).",
+        "value": {
+            "spot_price": 100,
+            "strike_price": 110,
+            "maturity": 1,
+            "rate": 0.03,
+            "dividend": 0.0,
+            "volatility": 0.2,
+            "option_type": "call",
+            "initial_variance": 0.04,
+            "mean_reversion": 1.5,
+            "long_term_variance": 0.05,
+            "volatility_of_variance": 0.6,
+            "correlation": -0.7,
+        },
+    },
+}
+
+
 @app.post("/api/v1/price/option/{option_kind}", response_model=PricingResultBaseModel)
-def option_pricing(
+async def option_pricing(
     option_kind: OptionKindType,
     product: Annotated[
-        Union[BarrierOptionBaseModel, BinaryOptionBaseModel, OptionBaseModel],
-        Body(
-            openapi_examples={
-                "vanilla_binary_options": {
-                    "summary": "Vanilla or Binary option",
-                    "description": "Normal example without neither vol surface nor rate curve",
-                    "value": {
-                        "spot_price": 100,
-                        "strike_price": 100,
-                        "maturity": 1,
-                        "rate": 0.05,
-                        "dividend": 0.0,
-                        "volatility": 0.2,
-                        "option_type": "call",
-                    },
-                },
-                "vanilla_binary_options_rates": {
-                    "summary": "Vanilla or Binary option with Rate curve",
-                    "description": "Normal example without vol surface",
-                    "value": {
-                        "spot_price": 100,
-                        "strike_price": 100,
-                        "maturity": 1,
-                        "dividend": 0.0,
-                        "rate_curve": {"0.5": 0.02, "1": 0.06},
-                        "volatility": 0.2,
-                        "option_type": "call",
-                    },
-                },
-                "vanilla_binary_options_volsurface": {
-                    "summary": "Vanilla or Binary option with volatility surface",
-                    "description": "Normal example without rate curve",
-                    "value": {
-                        "spot_price": 100,
-                        "strike_price": 110,
-                        "maturity": 1,
-                        "rate": 0.03,
-                        "dividend": 0.0,
-                        "volatility_surface": {
-                            "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
-                            "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
-                            "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
-                        },
-                        "option_type": "call",
-                    },
-                },
-                "barrier_option": {
-                    "summary": "Barrier options",
-                    "description": "Normal example without neither rate curve or volatility surface however it can be used the same way.",
-                    "value": {
-                        "spot_price": 80,
-                        "strike_price": 100,
-                        "maturity": 0.5,
-                        "rate": 0.03,
-                        "dividend": 0.0,
-                        "volatility": 0.20,
-                        "option_type": "put",
-                        "barrier_level": 80,
-                        "barrier_type": "ki",
-                        "barrier_direction": "down",
-                    },
-                },
-            },
-        ),
+        Union[
+            BarrierOptionBaseModel,
+            HestonOptionBaseModel,
+            BinaryOptionBaseModel,
+            OptionBaseModel,
+        ],
+        Body(openapi_examples=OPTION_OPENAPI_EXAMPLES),
     ],
     pricing_service: PricingService = Depends(PricingService),
 ) -> Dict[str, float]:
-    """This API `HTTP POST` method can be used to price options.The 3 options that could be priced are vanilla, barrier and binary options.
+    """This API `HTTP POST` method can be used to price options.The 4 options that could be priced are vanilla, barrier, binary and Heston (vanilla under the Heston model) options.
     The parameters that has to be in the JSON body are specified in the example section below.
     The options to price needs to be specified in the URL.
+    Monte Carlo priced options (barrier) are computed in a dedicated process pool, use the `/api/v1/jobs` endpoints for long runs.
 
     Args:
     ----
-        option_kind (OptionKindType): The type of option to price among 'vanilla', 'binary', 'barrier'.
-        product (Union[BinaryOptionBaseModel, OptionBaseModel, BarrierOptionBaseModel]): The schema corresponding to the JSON body sent by the user. The details are available in the section below (example)
+        option_kind (OptionKindType): The type of option to price among 'vanilla', 'binary', 'barrier', 'heston'.
+        product (Union[BinaryOptionBaseModel, OptionBaseModel, BarrierOptionBaseModel, HestonOptionBaseModel]): The schema corresponding to the JSON body sent by the user. The details are available in the section below (example)
         pricing_service (PricingService, optional): PricingService is a static class providing services to converge JSON schema to actual class while processing the input and returning the price and the associated greek. Defaults to Depends(PricingService).
 
     Raises:
     ----
         ValueError: Whether the user provides wrong arguments to the function.
-        HTTPException: The details of any other error occurring during the pricing.
+        HTTPException: The details of any other error occurring during the pricing, 429 whether the pricing pool is full.
 
     Returns:
     ----
         Dict[str, float]: A dict representing with keys as price and greek names and values as computed values.
     """
     try:
-        if option_kind == "binary" and isinstance(product, BinaryOptionBaseModel):
-            return pricing_service.process_binary_options(product)
-        if option_kind == "vanilla" and isinstance(product, OptionBaseModel):
-            return pricing_service.process_vanilla_options(product)
-        if option_kind == "barrier" and isinstance(product, BarrierOptionBaseModel):
-            return pricing_service.process_barrier_options(product)
-        raise ValueError("Provide valid input.")
+        if option_kind in pricing_service.MONTE_CARLO_OPTION_KINDS:
+            return await job_service.run(
+                pricing_service.process_option, option_kind, product
+            )
+        # The closed form and FFT pricings run in the threadpool, off the event loop.
+        return await run_in_threadpool(
+            pricing_service.process_option, option_kind, product
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=f"{e}") from e
     except Exception as e:
         exc_type, _, exc_tb = sys.exc_info()
         raise HTTPException(
@@ -272,6 +455,120 @@ def option_pricing(
         ) from e
 
 
+@app.post(
+    "/api/v1/jobs/option/{option_kind}",
+    response_model=JobSubmissionBaseModel,
+    status_code=202,
+)
+def option_pricing_job_submission(
+    option_kind: OptionKindType,
+    product: Annotated[
+        Union[
+            BarrierOptionBaseModel,
+            HestonOptionBaseModel,
+            BinaryOptionBaseModel,
+            OptionBaseModel,
+        ],
+        Body(openapi_examples=OPTION_OPENAPI_EXAMPLES),
+    ],
+    pricing_service: PricingService = Depends(PricingService),
+) -> Dict[str, str]:
+    """This API `HTTP POST` method submits an option pricing job to the process pool and returns immediately.
+    The body is the same as `/api/v1/price/option/{option_kind}`, the result is fetched with `GET /api/v1/jobs/{job_id}`.
+
+    Args:
+    ----
+        option_kind (OptionKindType): The type of option to price among 'vanilla', 'binary', 'barrier', 'heston'.
+        product (Union[BinaryOptionBaseModel, OptionBaseModel, BarrierOptionBaseModel, HestonOptionBaseModel]): The schema corresponding to the JSON body sent by the user.
+        pricing_service (PricingService, optional): PricingService is a static class providing services to converge JSON schema to actual class while processing the input and returning the price and the associated greek. Defaults to Depends(PricingService).
+
+    Raises:
+    ----
+        HTTPException: 429 whether the pricing pool is full.
+
+    Returns:
+    ----
+        Dict[str, str]: The job identifier and its status.
+    """
+    try:
+        job_id = job_service.submit(pricing_service.process_option, option_kind, product)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=f"{e}") from e
+    return {"job_id": job_id, "status": job_service.get(job_id)["status"]}
+
+
+@app.post(
+    "/api/v1/jobs/structured-product/{product_kind}",
+    response_model=JobSubmissionBaseModel,
+    status_code=202,
+)
+async def structured_product_pricing_job_submission(
+    product_kind: ProductKindType,
+    request: Request,
+    product: Annotated[
+        Union[
+            ReverseConvertibleBaseModel,
+            OutperformerCertificateBaseModel,
+            AutocallableBaseModel,
+            CapitalProtectedNoteBaseModel,
+            DiscountCertificateBaseModel,
+        ],
+        Body(openapi_examples=STRUCTURED_PRODUCT_OPENAPI_EXAMPLES),
+    ],
+    pricing_service: PricingService = Depends(PricingService),
+) -> Dict[str, str]:
+    """This API `HTTP POST` method submits a structured product pricing job to the process pool and returns immediately.
+    The body is the same as `/api/v1/price/structured-product/{product_kind}`, the result is fetched with `GET /api/v1/jobs/{job_id}`.
+
+    Args:
+    ----
+        product_kind (ProductKindType): The type of structured product to price among 'reverse-convertible', 'outperformer-certificate', 'autocallable', 'capital-protected-note', 'discount-certificate'.
+        product (Union[OutperformerCertificateBaseModel,ReverseConvertibleBaseModel,AutocallableBaseModel,CapitalProtectedNoteBaseModel,DiscountCertificateBaseModel]): The schema corresponding to the JSON body sent by the user.
+        pricing_service (PricingService, optional): PricingService is a static class providing services to converge JSON schema to actual class while processing the input and returning the price and the associated greek. Defaults to Depends(PricingService).
+
+    Raises:
+    ----
+        HTTPException: 404 whether the body does not match the product kind, 429 whether the pricing pool is full.
+
+    Returns:
+    ----
+        Dict[str, str]: The job identifier and its status.
+    """
+    try:
+        product = await validate_structured_product(product_kind, request)
+    except ValidationError as e:
+        raise HTTPException(status_code=404, detail=f"{e}") from e
+    try:
+        job_id = job_service.submit(
+            pricing_service.process_structured_product, product_kind, product
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=f"{e}") from e
+    return {"job_id": job_id, "status": job_service.get(job_id)["status"]}
+
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobResultBaseModel)
+def pricing_job_result(job_id: str) -> Dict[str, Any]:
+    """This API `HTTP GET` method returns the status of a pricing job and its result once done.
+
+    Args:
+    ----
+        job_id (str): The identifier returned when submitting the job.
+
+    Raises:
+    ----
+        HTTPException: 404 whether the job is unknown or has been evicted.
+
+    Returns:
+    ----
+        Dict[str, Any]: The job identifier, its status, its result and error if any.
+    """
+    try:
+        return job_service.get(job_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}") from e
+
+
 @app.post(
     "/api/v1/price/option-strategy/{option_strategy}",
     response_model=PricingResultBaseModel,
@@ -556,6 +853,272 @@ def bond_pricing(
         ) from e
 
 
+@app.post("/api/v1/price/bond-portfolio", response_model=BondPortfolioResultBaseModel)
+def bond_portfolio_pricing(
+    portfolio: Annotated[
+        BondPortfolioBaseModel,
+        Body(
+            openapi_examples={
+                "bond_portfolio": {
+                    "summary": "Bond portfolio",
+                    "description": "Three bonds priced at once on a rate curve, a zero coupon is a null coupon rate.",
+                    "value": {
+                        "rate_curve": {"0.5": 0.02, "2": 0.03, "10": 0.035},
+                        "nominals": [1000, 1000, 500],
+                        "coupon_rates": [0.04, 0.0, 0.05],
+                        "frequencies": [2, 1, 4],
+                        "maturities": [5, 2, 10],
+                    },
+                },
+            },
+        ),
+    ],
+    pricing_service: PricingService = Depends(PricingService),
+) -> Dict[str, Any]:
+    """This API `HTTP POST` method prices a whole portfolio of bonds in one vectorized pass.
+    The bonds are given as arrays of nominals, coupon rates, frequencies (coupons a year) and maturities (in years), on a rate or a rate curve.
+
+    Args:
+    ----
+        portfolio (BondPortfolioBaseModel): The schema corresponding to the JSON body sent by the user.
+        pricing_service (PricingService, optional): PricingService is a static class providing services to converge JSON schema to actual class while processing the input and returning the price and the associated greek. Defaults to Depends(PricingService).
+
+    Raises:
+    ----
+        HTTPException: The details of any error occurring during the pricing.
+
+    Returns:
+    ----
+        Dict[str, Any]: The price, yield to maturity, duration and convexity of every bond, in the order of the arrays.
+    """
+    try:
+        return pricing_service.process_bond_portfolio(portfolio)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"{e}") from e
+
+
+@app.post("/api/v1/scenario/{product_kind}", response_model=ScenarioResultBaseModel)
+def scenario_grid(
+    product_kind: ScenarioProductKindType,
+    scenario: Annotated[
+        ScenarioBaseModel,
+        Body(
+            openapi_examples={
+                "vanilla_option": {
+                    "summary": "Vanilla option",
+                    "description": "Vanilla option revalued on the default grid (spot -10% to +10%, volatility -5 to +5 points).",
+                    "value": {
+                        "product": {
+                            "spot_price": 100,
+                            "strike_price": 100,
+                            "maturity": 1,
+                            "rate": 0.05,
+                            "dividend": 0.0,
+                            "volatility": 0.2,
+                            "option_type": "call",
+                        }
+                    },
+                },
+                "reverse_convertible": {
+                    "summary": "Reverse convertible",
+                    "description": "Reverse convertible with volatility surface revalued on a custom grid.",
+                    "value": {
+                        "product": {
+                            "spot_price": 100,
+                            "maturity": 1,
+                            "rate": 0.03,
+                            "coupon": 0.05,
+                            "dividend": 0.0,
+                            "volatility_surface": {
+                                "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
+                                "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
+                                "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
+                            },
+                        },
+                        "spot_shifts": [-0.2, -0.1, 0.0, 0.1, 0.2],
+                        "volatility_shifts": [-0.02, 0.0, 0.02],
+                    },
+                },
+            },
+        ),
+    ],
+    pricing_service: PricingService = Depends(PricingService),
+) -> Dict[str, Any]:
+    """This API `HTTP POST` method revalues a product on a spot shift x volatility shift grid (risk limits heatmaps).
+    The products that could be revalued are: `vanilla, binary, straddle, strangle, butterfly, call-spread, put-spread, strip, strap, reverse-convertible, outperformer-certificate`.
+    The `product` field of the body is the same as the body of the product pricing endpoint.
+
+    Args:
+    ----
+        product_kind (ScenarioProductKindType): The kind of product to revalue.
+        scenario (ScenarioBaseModel): The product, the relative spot shifts and the absolute volatility shifts.
+        pricing_service (PricingService, optional): PricingService is a static class providing services to converge JSON schema to actual class while processing the input and returning the price and the associated greek. Defaults to Depends(PricingService).
+
+    Raises:
+    ----
+        HTTPException: The details of any error occurring during the revaluation.
+
+    Returns:
+    ----
+        Dict[str, Any]: The shifts and the price, pnl and greeks matrices (one row per spot shift, one column per volatility shift).
+    """
+    try:
+        return pricing_service.process_scenario(product_kind, scenario)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"{e}") from e
+
+
+@app.post(
+    "/api/v1/solve/structured-product/{product_kind}",
+    response_model=SolverResultBaseModel,
+)
+def structured_product_solver(
+    product_kind: SolverProductKindType,
+    solver: Annotated[
+        SolverBaseModel,
+        Body(
+            openapi_examples={
+                "reverse_convertible": {
+                    "summary": "Reverse convertible coupon",
+                    "description": "Coupon of a reverse convertible issued at 98%.",
+                    "value": {
+                        "product": {
+                            "spot_price": 100,
+                            "maturity": 1,
+                            "rate": 0.03,
+                            "dividend": 0.0,
+                            "volatility": 0.20,
+                        },
+                        "target_price": 98,
+                    },
+                },
+                "reverse_convertible_term_sheets": {
+                    "summary": "Reverse convertible term-sheet grid",
+                    "description": "Coupons of reverse convertibles issued at 98% on a maturity x strike grid.",
+                    "value": {
+                        "product": {
+                            "spot_price": 100,
+                            "maturity": 1,
+                            "rate_curve": {"0.5": 0.02, "1": 0.03, "2": 0.035},
+                            "dividend": 0.0,
+                            "volatility_surface": {
+                                "1.0": {"0.9": 0.14, "1.0": 0.10, "1.1": 0.12},
+                                "1.5": {"0.9": 0.13, "1.0": 0.09, "1.1": 0.13},
+                                "2.0": {"0.9": 0.10, "1.0": 0.1, "1.1": 0.08},
+                            },
+                        },
+                        "target_price": 98,
+                        "maturities": [0.5, 1, 1.5, 2],
+                        "strike_prices": [90, 95, 100, 105],
+                    },
+                },
+                "outperformer": {
+                    "summary": "Outperformer certificate participation",
+                    "description": "Participation of an outperformer certificate issued at 102% of the spot price.",
+                    "value": {
+                        "product": {
+                            "spot_price": 100,
+                            "maturity": 1,
+                            "rate": 0.03,
+                            "dividend": 0.02,
+                            "volatility": 0.20,
+                        },
+                        "target_price": 102,
+                    },
+                },
+            },
+        ),
+    ],
+    pricing_service: PricingService = Depends(PricingService),
+) -> Dict[str, Any]:
+    """This API `HTTP POST` method solves the coupon of a reverse convertible or the participation of an outperformer certificate
+    giving a target price (e.g. the issue price). The price being linear in these parameters, they are solved in closed form.
+    The `product` field of the body is the same as the body of the product pricing endpoint, the optional `maturities` and `strike_prices` give a term-sheet grid.
+
+    Args:
+    ----
+        product_kind (SolverProductKindType): The kind of structured product among 'reverse-convertible', 'outperformer-certificate'.
+        solver (SolverBaseModel): The product, the target price and the grid.
+        pricing_service (PricingService, optional): PricingService is a static class providing services to converge JSON schema to actual class while processing the input and returning the price and the associated greek. Defaults to Depends(PricingService).
+
+    Raises:
+    ----
+        HTTPException: The details of any error occurring during the solving.
+
+    Returns:
+    ----
+        Dict[str, Any]: The solved parameter, the grid and the solved values (one row per maturity, one column per strike), null with an `infeasible_reason` where the target price needs a value the product rejects.
+    """
+    try:
+        return pricing_service.process_solver(product_kind, solver)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"{e}") from e
+
+
+@app.websocket("/api/v1/ws/pricing")
+async def live_pricing(websocket: WebSocket) -> None:
+    """WebSocket streaming the repriced values and greeks of the subscribed products.
+
+    The client sends JSON messages:
+    - `{"action": "subscribe", "subscription_id": "...", "product_kind": "vanilla", "underlying": "SX5E", "product": {...}}`, `product` being the body of the pricing endpoint (options and option strategies).
+    - `{"action": "unsubscribe", "subscription_id": "..."}`
+    - `{"action": "update", "underlying": "SX5E", "spot_price": 101.2, "volatility": 0.21, "rate": 0.03}`, every market field being optional.
+
+    The server answers with `subscribed`, `unsubscribed`, `pricing` (price and greeks of a subscription) and `error` messages.
+    The pricing runs in a worker thread while the messages keep being received, the ticks received in the
+    meantime are coalesced so that only the latest tick of each underlying is priced.
+
+    Args:
+    ----
+        websocket (WebSocket): The client connection.
+    """
+    await websocket.accept()
+    session = LivePricingSession()
+    wake_up = asyncio.Event()
+
+    async def receive_messages() -> None:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except ValueError as e:
+                session.report_error(f"Error provide a JSON message: {e}")
+            else:
+                session.handle_message(message)
+            wake_up.set()
+
+    receiver = asyncio.create_task(receive_messages())
+    try:
+        while True:
+            waiter = asyncio.create_task(wake_up.wait())
+            await asyncio.wait({receiver, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():
+                waiter.cancel()
+                receiver.result()
+            wake_up.clear()
+            while session.has_pending():
+                for message in await run_in_threadpool(session.process_pending):
+                    await websocket.send_json(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Expose the pricing metrics with the Prometheus text format.
+
+    Returns:
+    ----
+        PlainTextResponse: The metrics page.
+    """
+    registry.set_gauge("pricing_pending_jobs", job_service.pending_jobs)
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/")
 def base_url():
     """Base URL that redirect to `/docs`.
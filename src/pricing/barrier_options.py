@@ -1,12 +1,15 @@
 from typing import Optional
 import numpy as np
 from scipy.stats import norm
-from tqdm import tqdm
+from src.pricing.base.heston import HestonParameters
+from src.pricing.base.local_volatility import LocalVolatility
 from src.pricing.base.option_base import OptionBase
-from src.pricing.base.rate import Rate
-from src.pricing.base.volatility import Volatility
+from src.pricing.base.rate import Rate, ShiftedRate
+from src.pricing.base.volatility import ShiftedVolatility, Volatility
 from src.utility.types import BarrierDirection, Maturity, OptionType, BarrierType
 from src.utility.constants import EPSILON
+from src.utility.profiling import profiled
+from src.utility.progress import ProgressCallback
 
 
 class BarrierOption(OptionBase):
@@ -23,37 +26,94 @@ class BarrierOption(OptionBase):
         barrier_direction: BarrierDirection,
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
-
+        progress_callback: Optional[ProgressCallback] = None,
+        local_volatility: bool = False,
+        heston_parameters: Optional[HestonParameters] = None,
     ) -> None:
+        """Barrier option priced by Monte Carlo.
+
+        With `local_volatility`, the paths are simulated with the Dupire local volatility of the volatility surface
+        (skew consistent) instead of the constant volatility of the strike. With `heston_parameters`, they are
+        simulated under the Heston stochastic volatility model.
+        """
+        assert not (
+            local_volatility and heston_parameters is not None
+        ), "Error provide either local_volatility or heston_parameters."
         super().__init__(
             spot_price, strike_price, maturity, rate, volatility, option_type, dividend, foreign_rate
         )
         self._barrier_level = barrier_level
         self._barrier_type = barrier_type
         self._barrier_direction = barrier_direction
-
-    def compute_price(self, num_paths=20000, num_steps=500) -> float:
-        paths = self.monte_carlo_simulation(num_paths=num_paths, num_steps=num_steps)
-        payoffs = []
-
-        for path in tqdm(paths, desc="Computing paths...", leave=False):
-            barrier_crossed = (
-                np.any(path >= self._barrier_level)
-                if self._barrier_direction == "up"
-                else np.any(path <= self._barrier_level)
+        self._progress_callback = progress_callback
+        self._local_volatility = local_volatility
+        self._heston_parameters = heston_parameters
+        self.__local_volatility_grid = None
+
+    def __get_local_volatility(self) -> Optional[LocalVolatility]:
+        """Local volatility grid of the current market, built once per volatility and maturity."""
+        if not self._local_volatility:
+            return None
+        key = (self._volatility, self._domestic_rate, self._maturity.maturity_in_years)
+        if self.__local_volatility_grid is None or self.__local_volatility_grid[0] != key:
+            self.__local_volatility_grid = (
+                key,
+                LocalVolatility(
+                    self._volatility,
+                    self._domestic_rate,
+                    self._maturity.maturity_in_years,
+                    self._dividend,
+                ),
             )
+        return self.__local_volatility_grid[1]
 
-            if self._option_type == "call":
-                intrinsic_value = max(path[-1] - self._strike_price, 0)
-            elif self._option_type == "put":
-                intrinsic_value = max(self._strike_price - path[-1], 0)
+    @profiled
+    def compute_price(
+        self,
+        num_paths: int = 20000,
+        num_steps: int = 500,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> float:
+        """Price the barrier option by Monte Carlo, the payoffs of all the paths are evaluated at once.
+
+        Args:
+            num_paths (int, optional): The number of paths. Defaults to 20000.
+            num_steps (int, optional): The number of time steps. Defaults to 500.
+            progress_callback (Optional[ProgressCallback], optional): Called once per simulated chunk, defaults to the callback given to the constructor. Defaults to None.
+
+        Returns:
+            float: The price of the option.
+        """
+        paths = self.monte_carlo_simulation(
+            num_paths=num_paths,
+            num_steps=num_steps,
+            progress_callback=(
+                progress_callback
+                if progress_callback is not None
+                else self._progress_callback
+            ),
+            local_volatility=self.__get_local_volatility(),
+            heston_parameters=self._heston_parameters,
+        )
+        barrier_crossed = (
+            np.any(paths >= self._barrier_level, axis=1)
+            if self._barrier_direction == "up"
+            else np.any(paths <= self._barrier_level, axis=1)
+        )
 
-            if self._barrier_type == "ko":
-                payoff = 0 if barrier_crossed else intrinsic_value
-            elif self._barrier_type == "ki":
-                payoff = intrinsic_value if barrier_crossed else 0
+        if self._option_type == "call":
+            intrinsic_values = np.maximum(paths[:, -1] - self._strike_price, 0)
+        elif self._option_type == "put":
+            intrinsic_values = np.maximum(self._strike_price - paths[:, -1], 0)
+        else:
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
 
-            payoffs.append(payoff)
+        if self._barrier_type == "ko":
+            payoffs = np.where(barrier_crossed, 0.0, intrinsic_values)
+        elif self._barrier_type == "ki":
+            payoffs = np.where(barrier_crossed, intrinsic_values, 0.0)
+        else:
+            raise ValueError("Barrier type not supported. Use 'ko' or 'ki'.")
 
         average_payoff = np.mean(payoffs)
         effective_rate = self._domestic_rate.get_rate(self._maturity) - (self._foreign_rate.get_rate(self._maturity) if self._foreign_rate else self._dividend)
@@ -61,39 +121,31 @@ class BarrierOption(OptionBase):
 
         return discounted_price
 
-
     def compute_price_variation(
-        self, spot_price=None, volatility=None, rate=None, maturity=None
+        self, spot_price=None, volatility_shift=None, rate_shift=None, maturity=None
     ):
-        original_spot = self._spot_price
-        original_volatility = self._volatility.get_volatility()
-        original_rate = self._domestic_rate.get_rate(self._maturity) - self._dividend
-        original_maturity = self._maturity.maturity_in_years
+        """Price with bumped market data. The volatility (flat or surface) and the rate (flat or curve) are shifted
+        in parallel, so that the bumps keep the surface of the local volatility mode."""
+        original = (self._spot_price, self._volatility, self._domestic_rate, self._maturity)
 
         if spot_price is not None:
             self._spot_price = spot_price
-        if volatility is not None:
-            self._volatility = Volatility(volatility)
-        if rate is not None:
-            self._rate = Rate(rate)
+        if volatility_shift is not None:
+            self._volatility = ShiftedVolatility(self._volatility, volatility_shift)
+        if rate_shift is not None:
+            self._domestic_rate = ShiftedRate(self._domestic_rate, rate_shift)
         if maturity is not None:
             self._maturity = Maturity(maturity_in_years=maturity)
 
-        price = self.compute_price()
-
-        self._spot_price = original_spot
-        self._volatility = Volatility(original_volatility)
-        self._rate = Rate(original_rate)
-        self._maturity = Maturity(maturity_in_years=original_maturity)
-
-        return price
+        try:
+            return self.compute_price()
+        finally:
+            self._spot_price, self._volatility, self._domestic_rate, self._maturity = original
 
     def compute_delta(self):
         price_up = self.compute_price_variation(spot_price=self._spot_price + EPSILON)
         
         price_down = self.compute_price_variation(spot_price=self._spot_price - EPSILON)
-        print(price_up)
-        print(price_down)
         delta = (price_up - price_down) / 2*EPSILON
         return delta
 
@@ -105,22 +157,14 @@ class BarrierOption(OptionBase):
         return gamma
 
     def compute_vega(self):
-        price_up = self.compute_price_variation(
-            volatility=self._volatility.get_volatility() + EPSILON
-        )
-        price_down = self.compute_price_variation(
-            volatility=self._volatility.get_volatility() - EPSILON
-        )
+        price_up = self.compute_price_variation(volatility_shift=EPSILON)
+        price_down = self.compute_price_variation(volatility_shift=-EPSILON)
         vega = (price_up - price_down) / 2* EPSILON
         return vega
 
     def compute_rho(self):
-        price_up = self.compute_price_variation(
-            rate=(self._rate.get_rate(self._maturity) - self._dividend) + EPSILON
-        )
-        price_down = self.compute_price_variation(
-            rate=(self._rate.get_rate(self._maturity) - self._dividend) - EPSILON
-        )
+        price_up = self.compute_price_variation(rate_shift=EPSILON)
+        price_down = self.compute_price_variation(rate_shift=-EPSILON)
         rho = (price_up - price_down) / 2* EPSILON
         return rho
 
@@ -133,6 +177,7 @@ class BarrierOption(OptionBase):
         theta = (price_tomorrow - price_today) / day_in_years
         return theta
 
+    @profiled
     def compute_greeks(self):
         return {
             "delta": self.compute_delta(),
@@ -0,0 +1,250 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+from scipy.special import ndtr
+
+from src.pricing.base.rate import Rate
+from src.pricing.base.volatility import Volatility
+
+ArrayLike = Union[float, np.ndarray]
+
+GREEKS = ("delta", "gamma", "theta", "vega", "rho")
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def lookup_volatilities(
+    volatility: Volatility,
+    moneyness: ArrayLike,
+    maturity_in_years: ArrayLike,
+    volatility_shift: ArrayLike = 0.0,
+) -> np.ndarray:
+    """Look up the volatility of many (moneyness, maturity) points.
+
+    Args:
+        volatility (Volatility): The volatility object (flat or surface).
+        moneyness (ArrayLike): The strike over spot ratios.
+        maturity_in_years (ArrayLike): The maturities, broadcastable with `moneyness`.
+        volatility_shift (ArrayLike, optional): Absolute shifts added to the volatilities (scenarios). Defaults to 0.0.
+
+    Returns:
+        np.ndarray: The volatilities with the broadcast shape of the inputs.
+    """
+    volatilities = volatility.get_volatilities(moneyness, maturity_in_years)
+    if np.ndim(volatility_shift) or volatility_shift:
+        volatilities = volatilities + np.asarray(volatility_shift, dtype=float)
+        assert np.all(volatilities > 0), "Error the shifted volatilities must be positive."
+    return volatilities
+
+
+def lookup_product_volatilities(
+    volatilities: Sequence[Volatility],
+    moneyness: Sequence[float],
+    maturity_in_years: Sequence[float],
+) -> np.ndarray:
+    """Look up the volatility of many products, each with its own volatility object. The products sharing a
+    volatility object (e.g. a book on one surface) are looked up in one vectorized evaluation.
+
+    Args:
+        volatilities (Sequence[Volatility]): The volatility object of each product.
+        moneyness (Sequence[float]): The strike over spot ratio of each product.
+        maturity_in_years (Sequence[float]): The maturity of each product.
+
+    Returns:
+        np.ndarray: The volatilities, shape (len(volatilities),).
+    """
+    moneyness = np.asarray(moneyness, dtype=float)
+    maturity_in_years = np.asarray(maturity_in_years, dtype=float)
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for index, volatility in enumerate(volatilities):
+        groups[id(volatility)].append(index)
+    looked_up = np.empty(len(volatilities))
+    for indices in groups.values():
+        looked_up[indices] = volatilities[indices[0]].get_volatilities(
+            moneyness[indices], maturity_in_years[indices]
+        )
+    return looked_up
+
+
+def lookup_rates(rate: Rate, maturity_in_years: ArrayLike) -> np.ndarray:
+    """Look up the rates of many maturities.
+
+    Args:
+        rate (Rate): The rate object (flat or curve).
+        maturity_in_years (ArrayLike): The maturities in years.
+
+    Returns:
+        np.ndarray: The rates with the shape of `maturity_in_years`.
+    """
+    return rate.get_rates(maturity_in_years)
+
+
+def black_scholes_price(
+    spot_price: ArrayLike,
+    strike_price: ArrayLike,
+    maturity_in_years: ArrayLike,
+    rate: ArrayLike,
+    dividend: ArrayLike,
+    volatility: ArrayLike,
+    is_call: Union[bool, np.ndarray],
+) -> np.ndarray:
+    """Vectorized price of vanilla options (same conventions as `black_scholes_price_and_greeks`), used
+    when only the price is needed, e.g. full revaluations on large scenario sets.
+
+    Returns:
+        np.ndarray: The prices with the broadcast shape of the inputs.
+    """
+    sign = np.where(is_call, 1.0, -1.0)
+    maturity_in_years = np.asarray(maturity_in_years, dtype=float)
+    vol_sqrt_maturity = volatility * np.sqrt(maturity_in_years)
+    d1 = (
+        np.log(spot_price / strike_price)
+        + (rate - dividend + 0.5 * volatility**2) * maturity_in_years
+    ) / vol_sqrt_maturity
+    return sign * (
+        spot_price * np.exp(-dividend * maturity_in_years) * ndtr(sign * d1)
+        - strike_price
+        * np.exp(-rate * maturity_in_years)
+        * ndtr(sign * (d1 - vol_sqrt_maturity))
+    )
+
+
+def black_scholes_price_and_greeks(
+    spot_price: ArrayLike,
+    strike_price: ArrayLike,
+    maturity_in_years: ArrayLike,
+    rate: ArrayLike,
+    dividend: ArrayLike,
+    volatility: ArrayLike,
+    is_call: Union[bool, np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """Vectorized price and greeks of vanilla options, every argument is broadcast against the others.
+
+    The conventions are the ones of `VanillaOption` (delta is not discounted by the dividend, vega and rho
+    are expressed for a 1% move) so that a batch evaluation gives exactly the same figures as
+    pricing each contract with its own `VanillaOption`. Expired contracts (null maturity) are worth
+    their payoff, their delta is the one of the payoff and their other greeks are null.
+
+    Args:
+        spot_price (ArrayLike): Spot prices of the underlying.
+        strike_price (ArrayLike): Strike prices.
+        maturity_in_years (ArrayLike): Maturities in years.
+        rate (ArrayLike): Domestic (continuous) rates.
+        dividend (ArrayLike): Dividend yields.
+        volatility (ArrayLike): Volatilities.
+        is_call (Union[bool, np.ndarray]): True for calls, False for puts.
+
+    Returns:
+        Dict[str, np.ndarray]: The price, delta, gamma, theta, vega and rho arrays.
+    """
+    spot_price = np.asarray(spot_price, dtype=float)
+    strike_price = np.asarray(strike_price, dtype=float)
+    maturity_in_years = np.asarray(maturity_in_years, dtype=float)
+    rate = np.asarray(rate, dtype=float)
+    dividend = np.asarray(dividend, dtype=float)
+    volatility = np.asarray(volatility, dtype=float)
+    sign = np.where(is_call, 1.0, -1.0)
+    expired = maturity_in_years <= 0
+    if np.any(expired):
+        maturity_in_years = np.where(expired, 1.0, maturity_in_years)
+
+    sqrt_maturity = np.sqrt(maturity_in_years)
+    vol_sqrt_maturity = volatility * sqrt_maturity
+    d1 = (
+        np.log(spot_price / strike_price)
+        + (rate - dividend + 0.5 * volatility**2) * maturity_in_years
+    ) / vol_sqrt_maturity
+    d2 = d1 - vol_sqrt_maturity
+    cdf_d1 = ndtr(sign * d1)
+    cdf_d2 = ndtr(sign * d2)
+    pdf_d1 = _norm_pdf(d1)
+    dividend_discount = np.exp(-dividend * maturity_in_years)
+    rate_discount = np.exp(-rate * maturity_in_years)
+    carry_discount = np.exp(-(rate - dividend) * maturity_in_years)
+
+    values = {
+        "price": sign
+        * (
+            spot_price * dividend_discount * cdf_d1
+            - strike_price * rate_discount * cdf_d2
+        ),
+        "delta": ndtr(d1) - (sign < 0),
+        "gamma": pdf_d1 / (spot_price * vol_sqrt_maturity),
+        "theta": -spot_price * pdf_d1 * volatility / (2 * sqrt_maturity)
+        - sign * rate * strike_price * carry_discount * cdf_d2,
+        "vega": spot_price * sqrt_maturity * pdf_d1 / 100,
+        "rho": sign * strike_price * maturity_in_years * carry_discount * cdf_d2 / 100,
+    }
+    if np.any(expired):
+        in_the_money = sign * (spot_price - strike_price) > 0
+        values = {name: np.where(expired, 0.0, value) for name, value in values.items()}
+        values["price"] = np.where(
+            expired, np.maximum(sign * (spot_price - strike_price), 0.0), values["price"]
+        )
+        values["delta"] = np.where(expired & in_the_money, sign, values["delta"])
+    return values
+
+
+class SpotRepricer:
+    def __init__(
+        self,
+        strike_price: ArrayLike,
+        maturity_in_years: ArrayLike,
+        rate: ArrayLike,
+        dividend: ArrayLike,
+        volatility: ArrayLike,
+        is_call: Union[bool, np.ndarray],
+    ) -> None:
+        """Incremental pricer of vanilla contracts when only the spot moves (intraday streaming).
+
+        The spot independent pieces (sigma x sqrt(T), log-strike, forward drift and discount factors) are
+        computed once, a spot update only recomputes d1, d2 and the cdfs. The volatility is the one given
+        here (sticky strike), the conventions are the ones of `VanillaOption`.
+
+        Args:
+            strike_price (ArrayLike): Strike prices.
+            maturity_in_years (ArrayLike): Maturities in years.
+            rate (ArrayLike): Domestic (continuous) rates.
+            dividend (ArrayLike): Dividend yields.
+            volatility (ArrayLike): Volatilities.
+            is_call (Union[bool, np.ndarray]): True for calls, False for puts.
+        """
+        maturity_in_years = np.asarray(maturity_in_years, dtype=float)
+        volatility = np.asarray(volatility, dtype=float)
+        self.__sign = np.where(is_call, 1.0, -1.0)
+        self.__put_offset = (self.__sign < 0).astype(float)
+        self.__log_strike = np.log(strike_price)
+        self.__vol_sqrt_maturity = volatility * np.sqrt(maturity_in_years)
+        self.__drift = (rate - dividend + 0.5 * volatility**2) * maturity_in_years
+        self.__dividend_discount = np.exp(-dividend * maturity_in_years)
+        self.__discounted_strike = strike_price * np.exp(-rate * maturity_in_years)
+
+    def price_and_delta(self, spot_price: ArrayLike) -> Dict[str, np.ndarray]:
+        """Price and delta of the contracts for new spot prices.
+
+        Args:
+            spot_price (ArrayLike): The spot prices, broadcastable with the contracts.
+
+        Returns:
+            Dict[str, np.ndarray]: The price and delta arrays.
+        """
+        d1 = (
+            np.log(spot_price) - self.__log_strike + self.__drift
+        ) / self.__vol_sqrt_maturity
+        cdf_d1 = ndtr(d1)
+        sign = self.__sign
+        return {
+            "price": sign
+            * (
+                spot_price
+                * self.__dividend_discount
+                * (self.__put_offset + sign * cdf_d1)
+                - self.__discounted_strike * ndtr(sign * (d1 - self.__vol_sqrt_maturity))
+            ),
+            "delta": cdf_d1 - self.__put_offset,
+        }
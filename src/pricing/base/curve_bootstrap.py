@@ -0,0 +1,254 @@
+from typing import Dict, Literal, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.pricing.base.rate import Rate
+from src.utility.constants import BOOTSTRAP_MAX_ITERATIONS, BOOTSTRAP_TOLERANCE
+from src.utility.types import Maturity
+
+
+class Deposit(NamedTuple):
+    """Deposit from today to its maturity, quoted as a simple rate."""
+
+    maturity_in_years: float
+    rate: float
+
+
+class ForwardRateAgreement(NamedTuple):
+    """Forward rate agreement between two dates, quoted as a simple forward rate."""
+
+    start_in_years: float
+    end_in_years: float
+    rate: float
+
+
+class Swap(NamedTuple):
+    """Spot starting par swap, quoted as its fixed rate paid `frequency` times a year (floating leg at par)."""
+
+    maturity_in_years: float
+    rate: float
+    frequency: int = 1
+
+
+Instrument = Union[Deposit, ForwardRateAgreement, Swap]
+
+
+def _cash_flows(instrument: Instrument) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Dates, amounts and constant of the pricing equation sum(amounts x DF(dates)) + constant = 0 of an instrument."""
+    if isinstance(instrument, Deposit):
+        assert instrument.maturity_in_years > 0, "Error provide a positive maturity."
+        return (
+            np.array([instrument.maturity_in_years]),
+            np.array([1 + instrument.rate * instrument.maturity_in_years]),
+            -1.0,
+        )
+    if isinstance(instrument, ForwardRateAgreement):
+        assert (
+            0 <= instrument.start_in_years < instrument.end_in_years
+        ), "Error provide a start date before the end date."
+        period = instrument.end_in_years - instrument.start_in_years
+        return (
+            np.array([instrument.start_in_years, instrument.end_in_years]),
+            np.array([-1.0, 1 + instrument.rate * period]),
+            0.0,
+        )
+    if isinstance(instrument, Swap):
+        assert instrument.maturity_in_years > 0 and instrument.frequency > 0, "Error provide a positive maturity and frequency."
+        # Coupon dates back from the maturity, with a short first period.
+        dates = instrument.maturity_in_years - np.arange(
+            int(np.ceil(instrument.maturity_in_years * instrument.frequency - 1e-9))
+        )[::-1] / instrument.frequency
+        amounts = instrument.rate * np.diff(dates, prepend=0.0)
+        amounts[-1] += 1.0
+        return dates, amounts, -1.0
+    raise ValueError("Instrument not supported. Use 'Deposit', 'ForwardRateAgreement' or 'Swap'.")
+
+
+def _interpolation_weights(
+    times: np.ndarray, pillars: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Linear interpolation (and extrapolation) of the zero rates on the pillars, as `Rate` does: the zero rate
+    at `times` is (1 - weight) x zero[lower] + weight x zero[lower + 1].
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The lower and upper pillar indices and the weights, shape of `times`.
+    """
+    if pillars.size == 1:
+        lower = np.zeros(times.shape, dtype=np.intp)
+        return lower, lower, np.zeros(times.shape)
+    lower = np.clip(np.searchsorted(pillars, times) - 1, 0, pillars.size - 2)
+    weights = (times - pillars[lower]) / (pillars[lower + 1] - pillars[lower])
+    return lower, lower + 1, weights
+
+
+class CurveBootstrapper:
+    def __init__(
+        self,
+        instruments: Sequence[Instrument],
+        method: Literal["sequential", "global"] = "sequential",
+    ) -> None:
+        """Zero rate curve bootstrapped from deposits, forward rate agreements and par swaps (single curve).
+
+        Each instrument gives a pillar at its last date, the zero rates (continuous) of the pillars are solved so that
+        every instrument is priced at par, the curve being the linear interpolation of the zero rates of `Rate`.
+        The instruments are laid out as padded matrices of dates and amounts, so that the pricing equations of all
+        the instruments and their jacobian are evaluated at once. With the "sequential" method, the pillars are solved
+        one after the other by Newton; with the "global" method, all the pillars are solved together by a
+        multidimensional Newton.
+
+        After a quote tick, `update_quotes` only re-solves the pillars the tick affects: the pillar of the instrument
+        and the pillars of the instruments whose dates are interpolated on an affected pillar.
+
+        Args:
+            instruments (Sequence[Instrument]): The instruments, their last dates must be distinct.
+            method (Literal["sequential", "global"], optional): The solving method. Defaults to "sequential".
+        """
+        if method not in ("sequential", "global"):
+            raise ValueError("Method not supported. Use 'sequential' or 'global'.")
+        assert len(instruments) > 0, "Error provide at least one instrument."
+        flows = [_cash_flows(instrument) for instrument in instruments]
+        order = np.argsort([dates[-1] for dates, _, _ in flows])
+        self.__instruments = [instruments[i] for i in order]
+        self.__pillars = np.array([flows[i][0][-1] for i in order])
+        assert np.all(np.diff(self.__pillars) > 0), "Error provide instruments with distinct last dates."
+        self.__method = method
+
+        # Padded layout: the padding dates are the pillar of the instrument with a null amount.
+        width = max(dates.size for dates, _, _ in flows)
+        self.__dates = np.repeat(self.__pillars[:, None], width, axis=1)
+        self.__amounts = np.zeros((len(flows), width))
+        self.__constants = np.empty(len(flows))
+        for row, i in enumerate(order):
+            self.__set_cash_flows(row, flows[i])
+        self.__lower, self.__upper, self.__weights = _interpolation_weights(
+            self.__dates, self.__pillars
+        )
+        # dependencies[k, j]: whether the pricing equation of the instrument k depends on the zero rate of the pillar j.
+        self.__dependencies = np.zeros((len(flows), len(flows)), dtype=bool)
+        rows = np.repeat(np.arange(len(flows))[:, None], width, axis=1)
+        significant = self.__amounts != 0
+        # Unbuffered, several cash flows of an instrument may fall on the same pillar.
+        np.logical_or.at(
+            self.__dependencies,
+            (rows[significant], self.__lower[significant]),
+            self.__weights[significant] != 1,
+        )
+        np.logical_or.at(
+            self.__dependencies,
+            (rows[significant], self.__upper[significant]),
+            self.__weights[significant] != 0,
+        )
+
+        self.__zero_rates = np.array(
+            [instrument.rate for instrument in self.__instruments], dtype=float
+        )
+        self.__resolved_pillars = np.arange(len(flows))
+        self.__solve(self.__resolved_pillars)
+
+    def __set_cash_flows(
+        self, row: int, flows: Tuple[np.ndarray, np.ndarray, float]
+    ) -> None:
+        dates, amounts, constant = flows
+        self.__dates[row, : dates.size] = dates
+        self.__amounts[row, :] = 0.0
+        self.__amounts[row, : amounts.size] = amounts
+        self.__constants[row] = constant
+
+    def __residuals_and_jacobian(
+        self, rows: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Pricing errors of the instruments `rows` and their derivatives with respect to the zero rates of the
+        pillars `rows`, for all the instruments at once."""
+        lower, upper, weights = (
+            self.__lower[rows],
+            self.__upper[rows],
+            self.__weights[rows],
+        )
+        dates = self.__dates[rows]
+        zero_rates = (1 - weights) * self.__zero_rates[lower] + weights * self.__zero_rates[upper]
+        values = self.__amounts[rows] * np.exp(-zero_rates * dates)
+        residuals = values.sum(axis=1) + self.__constants[rows]
+        sensitivities = -values * dates
+        jacobian = (
+            (sensitivities * (1 - weights))[:, :, None] * (lower[:, :, None] == rows)
+            + (sensitivities * weights)[:, :, None] * (upper[:, :, None] == rows)
+        ).sum(axis=1)
+        return residuals, jacobian
+
+    def __newton(self, rows: np.ndarray) -> None:
+        for _ in range(BOOTSTRAP_MAX_ITERATIONS):
+            residuals, jacobian = self.__residuals_and_jacobian(rows)
+            if np.max(np.abs(residuals)) < BOOTSTRAP_TOLERANCE:
+                return
+            self.__zero_rates[rows] -= np.linalg.solve(jacobian, residuals)
+        raise ValueError("Error the bootstrap did not converge, check the quotes of the instruments.")
+
+    def __solve(self, rows: np.ndarray) -> None:
+        if self.__method == "global":
+            self.__newton(rows)
+            return
+        # A date before the first pillar is extrapolated with a later pillar, so the sequential passes are repeated
+        # until every instrument of `rows` is priced at par (one pass without such dates).
+        for _ in range(BOOTSTRAP_MAX_ITERATIONS):
+            for row in rows:
+                self.__newton(np.array([row]))
+            if np.max(np.abs(self.__residuals_and_jacobian(rows)[0])) < BOOTSTRAP_TOLERANCE:
+                return
+        raise ValueError("Error the bootstrap did not converge, check the quotes of the instruments.")
+
+    def update_quotes(self, quotes: Dict[int, float]) -> Rate:
+        """Update the quotes of some instruments and re-solve only the pillars they affect.
+
+        Args:
+            quotes (Dict[int, float]): The new quotes by index in `instruments` (sorted by last date).
+
+        Returns:
+            Rate: The updated curve.
+        """
+        affected = np.zeros(self.__pillars.size, dtype=bool)
+        for index, quote in quotes.items():
+            self.__instruments[index] = self.__instruments[index]._replace(rate=quote)
+            self.__set_cash_flows(index, _cash_flows(self.__instruments[index]))
+            affected[index] = True
+        # An instrument is affected whether its equation depends on an affected pillar (transitive closure).
+        while True:
+            propagated = affected | self.__dependencies[:, affected].any(axis=1)
+            if np.array_equal(propagated, affected):
+                break
+            affected = propagated
+        self.__resolved_pillars = np.flatnonzero(affected)
+        self.__solve(self.__resolved_pillars)
+        return self.curve
+
+    @property
+    def instruments(self) -> Tuple[Instrument, ...]:
+        """The instruments sorted by last date (their index is the one of `update_quotes`)."""
+        return tuple(self.__instruments)
+
+    @property
+    def pillars(self) -> np.ndarray:
+        return self.__pillars.copy()
+
+    @property
+    def zero_rates(self) -> np.ndarray:
+        """The continuous zero rates of the pillars."""
+        return self.__zero_rates.copy()
+
+    @property
+    def discount_factors(self) -> np.ndarray:
+        return np.exp(-self.__zero_rates * self.__pillars)
+
+    @property
+    def resolved_pillars(self) -> np.ndarray:
+        """The indices of the pillars solved by the last bootstrap (all of them at construction)."""
+        return self.__resolved_pillars.copy()
+
+    @property
+    def curve(self) -> Rate:
+        """The bootstrapped curve, linear interpolation of the continuous zero rates of the pillars."""
+        return Rate(
+            rate_curve={
+                Maturity(maturity_in_years=float(pillar)): float(zero_rate)
+                for pillar, zero_rate in zip(self.__pillars, self.__zero_rates)
+            }
+        )
@@ -0,0 +1,191 @@
+import bisect
+from typing import List, Literal, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.utility.constants import CURVE_LOOKUP_BUCKETS
+
+
+def _log_linear_pieces(
+    times: np.ndarray, integrated_rates: np.ndarray
+) -> Tuple[List[float], List[Tuple[float, float, float, float]]]:
+    """Pieces of the log-linear interpolation of the discount factors: the forward is flat between the pillars."""
+    knots = np.concatenate(([0.0], times))
+    values = np.concatenate(([0.0], integrated_rates))
+    forwards = np.diff(values) / np.diff(knots)
+    pieces = [(values[i], forwards[i], 0.0, 0.0) for i in range(times.size)]
+    return list(knots[:-1]), pieces
+
+
+def _monotone_convex_pieces(
+    times: np.ndarray, integrated_rates: np.ndarray
+) -> Tuple[List[float], List[Tuple[float, float, float, float]]]:
+    """Pieces of the monotone convex interpolation of Hagan and West (2006), without the positivity collar
+    since rates may be negative.
+
+    On the pillar interval i of length D, the instantaneous forward is f(x) = fd + g(x) with fd the discrete
+    forward of the interval and x in [0, 1], g being one of the four quadratic shapes of the paper chosen from
+    g(0) and g(1). Every shape is quadratic on at most two sub-intervals (split at eta), so the integrated rate is a
+    cubic of the time from the start of each sub-interval.
+    """
+    knots = np.concatenate(([0.0], times))
+    lengths = np.diff(knots)
+    discrete_forwards = np.diff(np.concatenate(([0.0], integrated_rates))) / lengths
+    # Instantaneous forwards at the pillars: interior ones weighted by the lengths, the ends keep the slope.
+    node_forwards = np.empty(knots.size)
+    if times.size > 1:
+        node_forwards[1:-1] = (
+            lengths[:-1] * discrete_forwards[1:] + lengths[1:] * discrete_forwards[:-1]
+        ) / (lengths[:-1] + lengths[1:])
+        node_forwards[0] = discrete_forwards[0] - 0.5 * (node_forwards[1] - discrete_forwards[0])
+        node_forwards[-1] = discrete_forwards[-1] - 0.5 * (node_forwards[-2] - discrete_forwards[-1])
+    else:
+        node_forwards[:] = discrete_forwards[0]
+
+    starts: List[float] = []
+    pieces: List[Tuple[float, float, float, float]] = []
+    value = 0.0
+    for i in range(times.size):
+        length, forward = lengths[i], discrete_forwards[i]
+        g0, g1 = node_forwards[i] - forward, node_forwards[i + 1] - forward
+        # Sub-intervals [x start, x end) with g = p0 + p1 v + p2 v^2, v = x - x start.
+        if g0 == 0 and g1 == 0:
+            shapes = [(0.0, 1.0, 0.0, 0.0, 0.0)]
+        elif (g0 < 0 and -0.5 * g0 <= g1 <= -2 * g0) or (g0 > 0 and -0.5 * g0 >= g1 >= -2 * g0):
+            shapes = [(0.0, 1.0, g0, -4 * g0 - 2 * g1, 3 * g0 + 3 * g1)]
+        elif (g0 < 0 and g1 > -2 * g0) or (g0 > 0 and g1 < -2 * g0):
+            eta = (g1 + 2 * g0) / (g1 - g0)
+            shapes = [(0.0, eta, g0, 0.0, 0.0), (eta, 1.0, g0, 0.0, (g1 - g0) / (1 - eta) ** 2)]
+        elif (g0 > 0 and 0 > g1 > -0.5 * g0) or (g0 < 0 and 0 < g1 < -0.5 * g0):
+            eta = 3 * g1 / (g1 - g0)
+            shapes = [
+                (0.0, eta, g0, -2 * (g0 - g1) / eta, (g0 - g1) / eta**2),
+                (eta, 1.0, g1, 0.0, 0.0),
+            ]
+        else:
+            eta = g1 / (g1 + g0)
+            level = -g0 * g1 / (g0 + g1)
+            shapes = [
+                (0.0, eta, g0, -2 * (g0 - level) / eta, (g0 - level) / eta**2)
+                if eta > 0
+                else (0.0, 0.0, 0.0, 0.0, 0.0),
+                (eta, 1.0, level, 0.0, (g1 - level) / (1 - eta) ** 2)
+                if eta < 1
+                else (1.0, 1.0, 0.0, 0.0, 0.0),
+            ]
+        for start, end, p0, p1, p2 in shapes:
+            if end <= start:
+                continue
+            width = (end - start) * length
+            # Integrated rate of the sub-interval in the time u from its start.
+            coefficients = (value, forward + p0, p1 / (2 * length), p2 / (3 * length**2))
+            starts.append(knots[i] + start * length)
+            pieces.append(coefficients)
+            value = ((coefficients[3] * width + coefficients[2]) * width + coefficients[1]) * width + value
+        # The pillar is matched exactly whatever the rounding of the sub-intervals.
+        value = integrated_rates[i]
+    return starts, pieces
+
+
+class CurveInterpolation:
+    def __init__(
+        self,
+        times: ArrayLike,
+        integrated_rates: ArrayLike,
+        method: Literal["log-linear", "monotone-convex"] = "log-linear",
+    ) -> None:
+        """Interpolation of a curve on its integrated rates y(t) = -log(DF(t)), with flat forward extrapolation after
+        the last pillar (and from the origin to the first pillar for the log-linear method).
+
+        The integrated rate is a piecewise cubic of the time: the coefficients of every piece are computed once
+        here, a lookup finds the piece and makes a Horner evaluation. One maturity is searched by `bisect` on
+        floats. For arrays, the piece of every cell of a uniform grid of the pillar range is searched once here
+        (`np.searchsorted`), so that a lookup is index arithmetic in this table and a few comparisons with the
+        next starts (as many as the maximum number of pieces starting in a cell).
+
+        Args:
+            times (ArrayLike): The positive and distinct times of the pillars in years.
+            integrated_rates (ArrayLike): The integrated rates of the pillars, zero rate x time for continuous rates.
+            method (Literal["log-linear", "monotone-convex"], optional): The interpolation: log-linear discount
+                factors (flat forwards between the pillars) or the monotone convex method of Hagan and West,
+                with continuous forwards. Defaults to "log-linear".
+        """
+        times = np.asarray(times, dtype=float)
+        integrated_rates = np.asarray(integrated_rates, dtype=float)
+        assert times.ndim == 1 and times.size > 0, "Error provide at least one pillar."
+        assert times.shape == integrated_rates.shape, "Error provide as many integrated rates as times."
+        order = np.argsort(times)
+        times, integrated_rates = times[order], integrated_rates[order]
+        assert times[0] > 0 and np.all(np.diff(times) > 0), "Error provide positive and distinct times."
+        if method == "log-linear":
+            starts, pieces = _log_linear_pieces(times, integrated_rates)
+            last_forward = pieces[-1][1]
+        elif method == "monotone-convex":
+            starts, pieces = _monotone_convex_pieces(times, integrated_rates)
+            last_value, forward, slope, curvature = pieces[-1]
+            width = times[-1] - starts[-1]
+            last_forward = forward + (2 * slope + 3 * curvature * width) * width
+        else:
+            raise ValueError("Method not supported. Use 'log-linear' or 'monotone-convex'.")
+        # Flat forward extrapolation piece after the last pillar.
+        starts.append(float(times[-1]))
+        pieces.append((float(integrated_rates[-1]), float(last_forward), 0.0, 0.0))
+
+        self.__starts = [float(start) for start in starts]
+        self.__pieces = [tuple(float(c) for c in piece) for piece in pieces]
+        self.__start_array = np.array(self.__starts)
+        # One row per power of the cubics, so that a lookup gathers contiguous rows.
+        self.__coefficients = np.ascontiguousarray(np.array(self.__pieces).T)
+        self.__bucket_scale = CURVE_LOOKUP_BUCKETS / self.__starts[-1]
+        self.__buckets = np.searchsorted(
+            self.__start_array,
+            np.arange(CURVE_LOOKUP_BUCKETS + 1) / self.__bucket_scale,
+            side="right",
+        ) - 1
+        self.__corrections = int(np.max(np.diff(self.__buckets)))
+        self.__next_starts = np.append(self.__start_array[1:], np.inf)
+
+    @property
+    def pieces(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The starts of the pieces and the coefficients of their cubics in the time from the start, shape (pieces, 4)."""
+        return self.__start_array.copy(), self.__coefficients.T.copy()
+
+    def integrated_rate(self, time: float) -> float:
+        time = max(time, 0.0)
+        i = max(bisect.bisect_right(self.__starts, time) - 1, 0)
+        value, forward, slope, curvature = self.__pieces[i]
+        u = time - self.__starts[i]
+        return ((curvature * u + slope) * u + forward) * u + value
+
+    def integrated_rates(self, times: ArrayLike) -> np.ndarray:
+        times = np.maximum(np.asarray(times, dtype=float), 0.0)
+        cells = times * self.__bucket_scale
+        np.minimum(cells, CURVE_LOOKUP_BUCKETS, out=cells)
+        i = self.__buckets.take(cells.astype(np.intp))
+        for _ in range(self.__corrections):
+            i += times >= self.__next_starts.take(i)
+        value, forward, slope, curvature = self.__coefficients.take(i, axis=1)
+        u = times - self.__start_array.take(i)
+        curvature *= u
+        curvature += slope
+        curvature *= u
+        curvature += forward
+        curvature *= u
+        curvature += value
+        return curvature
+
+    def zero_rate(self, time: float) -> float:
+        """Continuous zero rate of a date, the instantaneous forward of the origin at 0."""
+        if time <= 0:
+            return self.__pieces[0][1]
+        return self.integrated_rate(time) / time
+
+    def zero_rates(self, times: ArrayLike) -> np.ndarray:
+        times = np.asarray(times, dtype=float)
+        rates = self.integrated_rates(times)
+        positive = times > 0
+        if positive.all():
+            rates /= times
+            return rates
+        return np.where(positive, rates / np.where(positive, times, 1.0), self.__pieces[0][1])
@@ -0,0 +1,186 @@
+from typing import Callable, Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.pricing.base.rate import Rate
+from src.utility.constants import KEY_RATE_BUMP
+
+
+class CashFlowSchedule(NamedTuple):
+    """Cash flows of many instruments padded to the same width: one row per instrument, null amounts as padding."""
+
+    times: np.ndarray
+    amounts: np.ndarray
+
+
+def pad_cash_flows(cash_flows: Sequence[Tuple[ArrayLike, ArrayLike]]) -> CashFlowSchedule:
+    """Stack the (times, amounts) cash flows of many instruments into padded matrices.
+
+    Args:
+        cash_flows (Sequence[Tuple[ArrayLike, ArrayLike]]): The times in years and the amounts of every instrument
+            (one dimensional).
+
+    Returns:
+        CashFlowSchedule: The times and amounts, shape (len(cash_flows), max number of cash flows).
+    """
+    assert len(cash_flows) > 0, "Error provide at least one instrument."
+    flow_times, flow_amounts = zip(*cash_flows)
+    counts = np.array([len(times) for times in flow_times])
+    times = np.zeros((counts.size, max(int(counts.max()), 1)))
+    amounts = np.zeros(times.shape)
+    mask = np.arange(times.shape[1]) < counts[:, None]
+    times[mask] = np.concatenate(flow_times)
+    amounts[mask] = np.concatenate(flow_amounts)
+    return CashFlowSchedule(times, amounts)
+
+
+class CurveRisk:
+    def __init__(self, pillars: Sequence[float], bump: float = KEY_RATE_BUMP) -> None:
+        """Key rate and parallel DV01 of many instruments against every bumped curve at once.
+
+        The bump of a key rate is a tent on the continuous zero rates: `bump` at its pillar, decreasing linearly to 0
+        at the neighbouring pillars, flat before the first and after the last pillar, so that the key rate bumps add
+        up to the parallel bump. Every bumped curve is the base curve with a shift of its zero rates, the stacked
+        shifts of `shifts` (the up and down bumps of every pillar, then the parallel up and down bumps).
+
+        The DV01 are central differences for a 1 bp decrease of the rates, (price(-bump) - price(+bump)) / 2,
+        positive for a long bond.
+
+        Args:
+            pillars (Sequence[float]): The positive and increasing key rate maturities in years.
+            bump (float, optional): The bump of the rates. Defaults to KEY_RATE_BUMP (1 bp).
+        """
+        self.__pillars = np.asarray(pillars, dtype=float)
+        assert self.__pillars.ndim == 1 and self.__pillars.size > 0, "Error provide at least one pillar."
+        assert np.all(np.diff(self.__pillars) > 0), "Error provide increasing pillars."
+        self.__bump = bump
+        n = self.__pillars.size
+        # Rows are the bumped curves, columns the key rates.
+        self.__shift_matrix = bump * np.vstack(
+            (np.eye(n), -np.eye(n), np.ones((1, n)), -np.ones((1, n)))
+        )
+
+    @property
+    def pillars(self) -> np.ndarray:
+        return self.__pillars.copy()
+
+    def __tents(self, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Lower pillar index and weight of the upper pillar of every date (the weight of the lower one is
+        1 - weight)."""
+        pillars = self.__pillars
+        if pillars.size == 1:
+            return np.zeros(times.shape, dtype=np.intp), np.zeros(times.shape)
+        lower = np.clip(np.searchsorted(pillars, times, side="right") - 1, 0, pillars.size - 2)
+        weights = np.clip(
+            (times - pillars[lower]) / (pillars[lower + 1] - pillars[lower]), 0.0, 1.0
+        )
+        return lower, weights
+
+    def key_rate_weights(self, times: ArrayLike) -> np.ndarray:
+        """Share of every key rate bump in the zero rate shift of dates.
+
+        Args:
+            times (ArrayLike): The dates in years.
+
+        Returns:
+            np.ndarray: The weights, shape (len(pillars),) + times.shape, adding up to 1 over the pillars.
+        """
+        times = np.asarray(times, dtype=float)
+        lower, weights = self.__tents(times)
+        indices = np.arange(self.__pillars.size).reshape((-1,) + (1,) * times.ndim)
+        return np.where(indices == lower, 1 - weights, 0.0) + np.where(
+            indices == lower + 1, weights, 0.0
+        )
+
+    def shifts(self, times: ArrayLike) -> np.ndarray:
+        """Zero rate shifts of the stacked bumped curves at dates.
+
+        Args:
+            times (ArrayLike): The dates in years.
+
+        Returns:
+            np.ndarray: The shifts, shape (2 x len(pillars) + 2,) + times.shape: the up bumps of the pillars, their
+            down bumps, the parallel up and down bumps.
+        """
+        times = np.asarray(times, dtype=float)
+        weights = self.key_rate_weights(times)
+        return np.tensordot(self.__shift_matrix, weights, axes=1)
+
+    def bumped_discount_factors(self, rate: Rate, times: ArrayLike) -> np.ndarray:
+        """Discount factors of dates on the base curve (first row) and on every bumped curve (as in `shifts`).
+
+        Returns:
+            np.ndarray: The discount factors, shape (2 x len(pillars) + 3,) + times.shape.
+        """
+        times = np.asarray(times, dtype=float)
+        discount_factors = rate.discount_factors(times)
+        return discount_factors * np.exp(
+            -np.concatenate((np.zeros((1,) + times.shape), self.shifts(times))) * times
+        )
+
+    def compute(self, rate: Rate, schedule: CashFlowSchedule) -> Dict[str, np.ndarray]:
+        """Prices, key rate DV01 and parallel DV01 of cash flow schedules against all the bumped curves in one pass.
+
+        A cash flow only moves on the curves of its two neighbouring pillars, so the revaluations on the stacked
+        curves reduce to the (cash flows x 2) central differences a x DF x sinh(bump x weight x t), computed
+        without cancellation and summed per instrument and pillar by a single scatter.
+
+        Args:
+            rate (Rate): The base curve.
+            schedule (CashFlowSchedule): The padded cash flows (see `pad_cash_flows`).
+
+        Returns:
+            Dict[str, np.ndarray]: The "price" (n,), the "key_rate_dv01" (n, len(pillars)) and the "dv01" (n,) of the
+            n instruments.
+        """
+        times, amounts = schedule
+        assert times.shape == amounts.shape, "Error provide times and amounts of the same shape."
+        significant = amounts != 0
+        rows = np.nonzero(significant)[0]
+        times, amounts = times[significant], amounts[significant]
+        values = amounts * rate.discount_factors(times)
+        num_rows, num_pillars = schedule.times.shape[0], self.__pillars.size
+
+        lower, weights = self.__tents(times)
+        upper = np.minimum(lower + 1, num_pillars - 1)
+        scaled = self.__bump * times
+        key_rate_dv01 = np.bincount(
+            np.concatenate((rows * num_pillars + lower, rows * num_pillars + upper)),
+            np.concatenate((values * np.sinh(scaled * (1 - weights)), values * np.sinh(scaled * weights))),
+            minlength=num_rows * num_pillars,
+        ).reshape(num_rows, num_pillars)
+        return {
+            "price": np.bincount(rows, values, minlength=num_rows),
+            "key_rate_dv01": key_rate_dv01,
+            "dv01": np.bincount(rows, values * np.sinh(scaled), minlength=num_rows),
+        }
+
+    def compute_revaluation(
+        self,
+        revalue: Callable[..., np.ndarray],
+        products: Sequence,
+        maturities: ArrayLike,
+    ) -> Dict[str, np.ndarray]:
+        """Key rate and parallel DV01 of products whose rate risk is the zero rate at one date, e.g. reverse
+        convertibles, from their vectorized `revalue` on the rate shifts of all the bumped curves at once.
+
+        Args:
+            revalue (Callable[..., np.ndarray]): The `revalue` class method of the products
+                (products, spot returns, volatility changes, rate shifts).
+            products (Sequence): The products.
+            maturities (ArrayLike): The date of the rate of every product in years.
+
+        Returns:
+            Dict[str, np.ndarray]: The "price" (n,), the "key_rate_dv01" (n, len(pillars)) and the "dv01" (n,).
+        """
+        shifts = np.concatenate(
+            (np.zeros((1, len(products))), self.shifts(maturities).reshape(-1, len(products)))
+        ).T
+        prices = revalue(products, np.zeros(shifts.shape), np.zeros(shifts.shape), shifts)
+        n = self.__pillars.size
+        return {
+            "price": prices[:, 0],
+            "key_rate_dv01": (prices[:, n + 1 : 2 * n + 1] - prices[:, 1 : n + 1]) / 2,
+            "dv01": (prices[:, -1] - prices[:, -2]) / 2,
+        }
@@ -0,0 +1,345 @@
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+from scipy.optimize import least_squares
+from scipy.special import ndtr
+
+from src.pricing.base.black_scholes import (
+    ArrayLike,
+    black_scholes_price_and_greeks,
+    lookup_rates,
+    lookup_volatilities,
+)
+from src.pricing.base.rate import Rate
+from src.pricing.base.volatility import Volatility
+from src.utility.constants import (
+    DEFAULT_HESTON_CALIBRATION_MONEYNESS,
+    HESTON_FFT_DAMPING,
+    HESTON_FFT_POINTS,
+    HESTON_FFT_STEP,
+    HESTON_QE_SWITCH,
+)
+
+
+class HestonParameters(NamedTuple):
+    """Parameters of the Heston model, dv = mean_reversion x (long_term_variance - v) dt + volatility_of_variance x sqrt(v) dW."""
+
+    initial_variance: float
+    mean_reversion: float
+    long_term_variance: float
+    volatility_of_variance: float
+    correlation: float
+
+    @property
+    def feller_condition(self) -> bool:
+        """Whether 2 x mean_reversion x long_term_variance > volatility_of_variance^2 (the variance stays positive)."""
+        return (
+            2 * self.mean_reversion * self.long_term_variance
+            > self.volatility_of_variance**2
+        )
+
+
+def shift_heston_volatility(parameters: HestonParameters, shift: float) -> HestonParameters:
+    """Parameters with the initial and the long term volatilities shifted (absolute shift, floored), for the vegas."""
+    return parameters._replace(
+        initial_variance=max(np.sqrt(parameters.initial_variance) + shift, 1e-4) ** 2,
+        long_term_variance=max(np.sqrt(parameters.long_term_variance) + shift, 1e-4) ** 2,
+    )
+
+
+# Bounds of the calibration, in the order of the fields of HestonParameters.
+_CALIBRATION_BOUNDS = (
+    np.array([1e-4, 1e-2, 1e-4, 1e-2, -0.999]),
+    np.array([1.0, 20.0, 1.0, 5.0, 0.999]),
+)
+
+
+def heston_characteristic_function(
+    u: np.ndarray, maturity_in_years: ArrayLike, parameters: HestonParameters
+) -> np.ndarray:
+    """Characteristic function E[exp(i u log(S(T) / F(T)))] of the Heston model (the "little trap"
+    formulation of Albrecher et al., continuous in u), vectorized: `u` and `maturity_in_years` are broadcast.
+
+    Args:
+        u (np.ndarray): The (complex) arguments.
+        maturity_in_years (ArrayLike): The maturities.
+        parameters (HestonParameters): The parameters of the model.
+
+    Returns:
+        np.ndarray: The values of the characteristic function.
+    """
+    v0, kappa, theta, sigma, rho = parameters
+    maturity_in_years = np.asarray(maturity_in_years, dtype=float)
+    beta = kappa - 1j * rho * sigma * u
+    d = np.sqrt(beta**2 + sigma**2 * (1j * u + u**2))
+    g = (beta - d) / (beta + d)
+    decay = np.exp(-d * maturity_in_years)
+    c = (
+        kappa
+        * theta
+        / sigma**2
+        * ((beta - d) * maturity_in_years - 2 * np.log((1 - g * decay) / (1 - g)))
+    )
+    d_term = (beta - d) / sigma**2 * (1 - decay) / (1 - g * decay)
+    return np.exp(c + d_term * v0)
+
+
+def heston_fft_call_prices(
+    maturities_in_years: ArrayLike,
+    parameters: HestonParameters,
+    num_points: int = HESTON_FFT_POINTS,
+    step: float = HESTON_FFT_STEP,
+    damping: float = HESTON_FFT_DAMPING,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Undiscounted call prices in units of the forward, E[(S(T) / F(T) - exp(k))+], on the whole log forward
+    moneyness grid of the Carr-Madan FFT, all the maturities being priced by one batched FFT.
+
+    Args:
+        maturities_in_years (ArrayLike): The maturities, shape (n,).
+        parameters (HestonParameters): The parameters of the model.
+        num_points (int, optional): The number of points of the FFT. Defaults to HESTON_FFT_POINTS.
+        step (float, optional): The step of the integration grid. Defaults to HESTON_FFT_STEP.
+        damping (float, optional): The damping factor alpha of the call price. Defaults to HESTON_FFT_DAMPING.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The log forward moneyness grid, shape (num_points,), and the prices, shape (n, num_points).
+    """
+    maturities = np.asarray(maturities_in_years, dtype=float).reshape(-1, 1)
+    v = step * np.arange(num_points)
+    log_moneyness_step = 2 * np.pi / (num_points * step)
+    lower_bound = 0.5 * num_points * log_moneyness_step
+    log_moneyness = -lower_bound + log_moneyness_step * np.arange(num_points)
+    psi = heston_characteristic_function(
+        v - (damping + 1) * 1j, maturities, parameters
+    ) / (damping**2 + damping - v**2 + 1j * (2 * damping + 1) * v)
+    # Simpson weights of the integral.
+    weights = step / 3 * (3 + (-1) ** (np.arange(num_points) + 1))
+    weights[0] = step / 3
+    transform = np.fft.fft(np.exp(1j * lower_bound * v) * psi * weights, axis=1)
+    return log_moneyness, np.exp(-damping * log_moneyness) / np.pi * transform.real
+
+
+def heston_prices(
+    spot_price: float,
+    strike_prices: ArrayLike,
+    maturities_in_years: ArrayLike,
+    rates: ArrayLike,
+    dividend: float,
+    parameters: HestonParameters,
+    is_call: bool = True,
+) -> np.ndarray:
+    """Prices of option chains under the Heston model, each maturity being priced by one FFT for all its strikes
+    (and all the maturities by one batched FFT), the strikes being interpolated on the FFT grid by cubic splines.
+
+    Args:
+        spot_price (float): The spot price of the underlying.
+        strike_prices (ArrayLike): The strikes, shape (n_strikes,) for the same chain on every maturity or (n_maturities, n_strikes).
+        maturities_in_years (ArrayLike): The maturities, shape (n_maturities,).
+        rates (ArrayLike): The continuous rates of the maturities, shape (n_maturities,).
+        dividend (float): The dividend yield.
+        parameters (HestonParameters): The parameters of the model.
+        is_call (bool, optional): True for calls, False for puts (by the call-put parity). Defaults to True.
+
+    Returns:
+        np.ndarray: The prices, shape (n_maturities, n_strikes).
+    """
+    maturities = np.asarray(maturities_in_years, dtype=float).reshape(-1, 1)
+    rates = np.asarray(rates, dtype=float).reshape(-1, 1)
+    strikes = np.broadcast_to(
+        np.asarray(strike_prices, dtype=float), (maturities.shape[0], np.shape(strike_prices)[-1])
+    )
+    forwards = spot_price * np.exp((rates - dividend) * maturities)
+    discount_factors = np.exp(-rates * maturities)
+    grid, calls = heston_fft_call_prices(maturities, parameters)
+    log_moneyness = np.log(strikes / forwards)
+    prices = np.array(
+        [CubicSpline(grid, row)(k) for row, k in zip(calls, log_moneyness)]
+    ) * (discount_factors * forwards)
+    if not is_call:
+        prices -= discount_factors * (forwards - strikes)
+    return prices
+
+
+def calibrate_heston(
+    volatility: Volatility,
+    spot_price: float,
+    rate: Rate,
+    maturities_in_years: Sequence[float],
+    moneyness: Sequence[float] = DEFAULT_HESTON_CALIBRATION_MONEYNESS,
+    dividend: Optional[float] = None,
+    initial_parameters: Optional[HestonParameters] = None,
+) -> Tuple[HestonParameters, float]:
+    """Fit the Heston parameters to a volatility surface on a moneyness x maturity grid.
+
+    The residuals are the price errors of the out of the money options divided by their Black-Scholes vega (about
+    the implied volatility errors), all evaluated by one batched FFT per iteration of the least-squares.
+
+    Args:
+        volatility (Volatility): The volatility object (flat, spline or parametric surface) to fit.
+        spot_price (float): The spot price of the underlying.
+        rate (Rate): The rate object (flat or curve).
+        maturities_in_years (Sequence[float]): The maturities of the grid.
+        moneyness (Sequence[float], optional): The moneyness (K / S) of the grid. Defaults to DEFAULT_HESTON_CALIBRATION_MONEYNESS.
+        dividend (Optional[float], optional): The dividend yield. Defaults to None.
+        initial_parameters (Optional[HestonParameters], optional): The starting point, defaults to the at the money variance with a mild skew. Defaults to None.
+
+    Returns:
+        Tuple[HestonParameters, float]: The parameters and the root mean square of the implied volatility errors.
+    """
+    dividend = dividend if dividend is not None else 0.0
+    maturities = np.asarray(maturities_in_years, dtype=float).reshape(-1, 1)
+    moneyness = np.asarray(moneyness, dtype=float).reshape(1, -1)
+    assert np.all(maturities > 0), "Error provide positive maturities."
+    rates = lookup_rates(rate, maturities)
+    strikes = spot_price * moneyness
+    is_call = strikes >= spot_price * np.exp((rates - dividend) * maturities)
+    market = black_scholes_price_and_greeks(
+        spot_price,
+        strikes,
+        maturities,
+        rates,
+        dividend,
+        lookup_volatilities(volatility, moneyness, maturities),
+        is_call,
+    )
+    # The vega of the repo is for a 1% move, floored so that the far wings do not dominate.
+    vegas = np.maximum(100 * market["vega"], 1e-4 * spot_price)
+
+    def residuals(x: np.ndarray) -> np.ndarray:
+        calls = heston_prices(
+            spot_price, strikes, maturities, rates, dividend, HestonParameters(*x)
+        )
+        puts = calls - np.exp(-rates * maturities) * (
+            spot_price * np.exp((rates - dividend) * maturities) - strikes
+        )
+        return (np.where(is_call, calls, puts) - market["price"]).ravel() / vegas.ravel()
+
+    if initial_parameters is None:
+        at_the_money_variance = volatility.get_volatility(1.0, float(maturities[-1, 0])) ** 2
+        initial_parameters = HestonParameters(
+            at_the_money_variance, 2.0, at_the_money_variance, 0.5, -0.5
+        )
+    x0 = np.clip(np.asarray(initial_parameters, dtype=float), *_CALIBRATION_BOUNDS)
+    result = least_squares(residuals, x0, bounds=_CALIBRATION_BOUNDS, x_scale="jac")
+    return HestonParameters(*map(float, result.x)), float(
+        np.sqrt(np.mean(result.fun**2))
+    )
+
+
+def heston_steps(
+    log_spots: np.ndarray,
+    variances: np.ndarray,
+    parameters: np.ndarray,
+    periods: np.ndarray,
+    log_drifts: np.ndarray,
+    normals: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> None:
+    """Advance Heston paths by the Quadratic Exponential scheme of Andersen (2008), the log spots and the variances
+    being updated in place step by step, every step being vectorized over the markets and the paths.
+
+    The variance is drawn from the moment matched quadratic or exponential distribution, the log spot with the
+    correlation integrated over the step (central discretization of the integrated variance), so the scheme stays
+    accurate with coarse steps and never gives a negative variance.
+
+    Args:
+        log_spots (np.ndarray): The log spots, shape (n_markets, n_paths), updated in place.
+        variances (np.ndarray): The variances, same shape, updated in place.
+        parameters (np.ndarray): The Heston parameters of each market, shape (n_markets, 5) (the initial variance is unused).
+        periods (np.ndarray): The length of each step per market, shape (n_markets, n_steps).
+        log_drifts (np.ndarray): The log forward growth of each step per market (rate minus dividend), same shape.
+        normals (np.ndarray): The independent standard normal draws of the variance and of the spot, shape (n_paths, 2, n_steps).
+        out (Optional[np.ndarray], optional): Whether given, the spots after each step are written in it, shape (n_markets, n_paths, n_steps). Defaults to None.
+    """
+    _, kappa, theta, sigma, rho = np.asarray(parameters, dtype=float).reshape(-1, 5).T[:, :, None]
+    # Coefficients of every step, shape (n_markets, n_steps), computed once for all the paths.
+    decay = np.exp(-kappa * periods)
+    variance_coefficient = sigma**2 * decay * (1 - decay) / kappa
+    long_term_coefficient = theta * sigma**2 * (1 - decay) ** 2 / (2 * kappa)
+    log_spot_constant = log_drifts - rho * kappa * theta * periods / sigma
+    average_coefficient = (kappa * rho / sigma - 0.5) * 0.5 * periods
+    diffusion_coefficient = 0.5 * periods * (1 - rho**2)
+    correlation_coefficient = rho / sigma
+    means = np.empty_like(variances)
+    psi = np.empty_like(variances)
+    next_variances = np.empty_like(variances)
+    for step in range(normals.shape[-1]):
+        variance_normals = normals[:, 0, step]
+        np.multiply(variances - theta, decay[:, step, None], out=means)
+        means += theta
+        np.multiply(variances, variance_coefficient[:, step, None], out=psi)
+        psi += long_term_coefficient[:, step, None]
+        psi /= means**2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Quadratic law: a x (b + Z)^2 where psi is small (most of the paths).
+            b2 = 2 / psi
+            np.sqrt(b2 * np.maximum(b2 - 1, 0.0), out=next_variances)
+            b2 += next_variances - 1
+            np.add(np.sqrt(b2), variance_normals, out=next_variances)
+            next_variances **= 2
+            next_variances *= means / (1 + b2)
+            exponential = psi > HESTON_QE_SWITCH
+            if np.any(exponential):
+                # Exponential law with a mass at 0, the uniform is the cdf of the normal draw
+                # (1 - U = ndtr(-Z) keeps the upper tail accurate).
+                p = (psi[exponential] - 1) / (psi[exponential] + 1)
+                tail = ndtr(-np.broadcast_to(variance_normals, psi.shape)[exponential])
+                next_variances[exponential] = np.where(
+                    tail >= 1 - p,
+                    0.0,
+                    np.log((1 - p) / tail) * means[exponential] / (1 - p),
+                )
+        log_spots += log_spot_constant[:, step, None]
+        log_spots += correlation_coefficient * (next_variances - variances)
+        variances += next_variances
+        log_spots += average_coefficient[:, step, None] * variances
+        variances *= diffusion_coefficient[:, step, None]
+        np.sqrt(variances, out=variances)
+        variances *= normals[:, 1, step]
+        log_spots += variances
+        variances[...] = next_variances
+        if out is not None:
+            np.exp(log_spots, out=out[..., step])
+
+
+def simulate_heston_observations(
+    spot_prices: np.ndarray,
+    parameters: np.ndarray,
+    periods: np.ndarray,
+    log_drifts: np.ndarray,
+    normals: np.ndarray,
+    observation_steps: np.ndarray,
+) -> np.ndarray:
+    """Spot prices at the observation dates of Heston paths, for several markets sharing the same draws (common
+    random numbers), the paths being simulated on a finer grid of steps than the observations.
+
+    Args:
+        spot_prices (np.ndarray): The initial spot prices, shape (n_markets,).
+        parameters (np.ndarray): The Heston parameters of each market, shape (n_markets, 5).
+        periods (np.ndarray): The length of each step per market, shape (n_markets, n_steps).
+        log_drifts (np.ndarray): The log forward growth of each step per market, same shape.
+        normals (np.ndarray): The standard normal draws, shape (n_paths, 2, n_steps).
+        observation_steps (np.ndarray): The number of steps done at each observation date (increasing, the last one is n_steps).
+
+    Returns:
+        np.ndarray: The spot prices, shape (n_markets, n_paths, len(observation_steps)).
+    """
+    parameters = np.asarray(parameters, dtype=float)
+    num_paths = normals.shape[0]
+    log_spots = np.repeat(np.log(np.asarray(spot_prices, dtype=float))[:, None], num_paths, axis=1)
+    variances = np.repeat(parameters[:, :1], num_paths, axis=1)
+    observations = np.empty(log_spots.shape + (len(observation_steps),))
+    start = 0
+    for i, end in enumerate(observation_steps):
+        heston_steps(
+            log_spots,
+            variances,
+            parameters,
+            periods[:, start:end],
+            log_drifts[:, start:end],
+            normals[:, :, start:end],
+        )
+        np.exp(log_spots, out=observations[..., i])
+        start = end
+    return observations
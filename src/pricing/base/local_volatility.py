@@ -0,0 +1,112 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.pricing.base.rate import Rate
+from src.pricing.base.volatility import Volatility
+from src.utility.constants import LOCAL_VOLATILITY_CAP, VOLATILITY_FLOOR
+
+
+class LocalVolatility:
+    def __init__(
+        self,
+        volatility: Volatility,
+        rate: Rate,
+        maturity_in_years: float,
+        dividend: Optional[float] = None,
+        log_moneyness_points: int = 201,
+        time_points: int = 100,
+        width: float = 5.0,
+    ) -> None:
+        """Dupire local volatility derived from an implied volatility surface, precomputed on a
+        (log forward moneyness, time) grid so that the path engines look it up by index arithmetic.
+
+        With w(y, T) = sigma_implied^2 x T the total implied variance at the log forward moneyness y = log(K / F(T)),
+        the local variance at the spot level K and the date T is
+        dw/dT / (1 - y / w x dw/dy + 1/4 x (-1/4 - 1/w + y^2 / w^2) x (dw/dy)^2 + 1/2 x d2w/dy2).
+        The derivatives are finite differences on the grid. Where the surface is not free of arbitrage the local
+        variance is floored, and the local volatility is capped at `LOCAL_VOLATILITY_CAP`.
+
+        Args:
+            volatility (Volatility): The implied volatility object (flat, spline or parametric surface).
+            rate (Rate): The rate object (flat or curve), for the forwards.
+            maturity_in_years (float): The last date of the grid.
+            dividend (Optional[float], optional): The dividend yield. Defaults to None.
+            log_moneyness_points (int, optional): The number of log forward moneyness points. Defaults to 201.
+            time_points (int, optional): The number of dates of the grid, evenly spaced up to the maturity. Defaults to 100.
+            width (float, optional): The half width of the log forward moneyness range, in at the money standard deviations at maturity. Defaults to 5.0.
+        """
+        assert maturity_in_years > 0, "Error provide a positive maturity."
+        assert log_moneyness_points >= 3 and time_points >= 2, "Error provide at least 3 x 2 grid points."
+        self.__rate = rate
+        self.__dividend = dividend if dividend is not None else 0.0
+        self.__time_step = maturity_in_years / time_points
+        times = self.__time_step * np.arange(1, time_points + 1)
+        half_width = width * volatility.get_volatility(1.0, maturity_in_years) * np.sqrt(maturity_in_years)
+        log_moneyness = np.linspace(-half_width, half_width, log_moneyness_points)
+        self.__first_log_moneyness = log_moneyness[0]
+        self.__log_moneyness_step = log_moneyness[1] - log_moneyness[0]
+
+        # Total implied variances of the grid, one vectorized lookup (the surface is quoted in K / S).
+        maturities = np.broadcast_to(times[:, None], (time_points, log_moneyness_points))
+        total_variances = (
+            volatility.get_volatilities(
+                np.exp(log_moneyness[None, :] + self.log_forwards(times)[:, None]), maturities
+            )
+            ** 2
+            * maturities
+        )
+        dw_dt = np.gradient(total_variances, times, axis=0)
+        dw_dy = np.gradient(total_variances, log_moneyness, axis=1)
+        d2w_dy2 = np.gradient(dw_dy, log_moneyness, axis=1)
+        y = log_moneyness[None, :]
+        denominator = (
+            1
+            - y / total_variances * dw_dy
+            + 0.25 * (-0.25 - 1 / total_variances + y**2 / total_variances**2) * dw_dy**2
+            + 0.5 * d2w_dy2
+        )
+        local_variances = np.where(
+            denominator > 0, dw_dt / np.where(denominator > 0, denominator, 1.0), 0.0
+        )
+        # Rows are the dates, columns the log forward moneyness.
+        self.__grid = np.sqrt(
+            np.clip(local_variances, VOLATILITY_FLOOR**2, LOCAL_VOLATILITY_CAP**2)
+        )
+        self.__times = times
+        self.__log_moneyness = log_moneyness
+
+    @property
+    def grid(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The dates, the log forward moneyness and the local volatilities, shape (len(dates), len(log moneyness))."""
+        return self.__times.copy(), self.__log_moneyness.copy(), self.__grid.copy()
+
+    def log_forwards(self, times: np.ndarray) -> np.ndarray:
+        """Log forwards over spot, log(F(t) / S), of dates in years."""
+        times = np.asarray(times, dtype=float)
+        return -np.log(self.__rate.discount_factors(times)) - self.__dividend * times
+
+    def get_local_volatilities(self, log_moneyness: np.ndarray, time: float) -> np.ndarray:
+        """Local volatilities of many paths at one date, by index arithmetic and linear interpolation in the grid
+        (flat extrapolation outside of it).
+
+        Args:
+            log_moneyness (np.ndarray): The log forward moneyness of the paths, log(S(t) / F(t)).
+            time (float): The date in years.
+
+        Returns:
+            np.ndarray: The local volatilities, with the shape of `log_moneyness`.
+        """
+        grid = self.__grid
+        row = min(max(time / self.__time_step - 1, 0.0), grid.shape[0] - 1)
+        j = min(int(row), grid.shape[0] - 2)
+        weight = row - j
+        volatilities = grid[j] * (1 - weight) + grid[j + 1] * weight
+        x = np.clip(
+            (log_moneyness - self.__first_log_moneyness) / self.__log_moneyness_step,
+            0,
+            grid.shape[1] - 1,
+        )
+        i = np.minimum(x.astype(np.intp), grid.shape[1] - 2)
+        x -= i
+        return volatilities[i] * (1 - x) + volatilities[i + 1] * x
@@ -0,0 +1,385 @@
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.pricing.base.black_scholes import ArrayLike, lookup_volatilities
+from src.pricing.base.heston import (
+    HestonParameters,
+    shift_heston_volatility,
+    simulate_heston_observations,
+)
+from src.pricing.base.rate import Rate
+from src.pricing.base.volatility import Volatility
+from src.utility.constants import (
+    HESTON_STEPS_PER_YEAR,
+    MONTE_CARLO_CHUNK_SIZE,
+    MONTE_CARLO_SPOT_BUMP,
+)
+from src.utility.metrics import registry
+from src.utility.types import BasketType
+
+# Function computing the discounted payoffs of the paths from the performances of the basket at the
+# observation dates, shape (n_markets, n_paths, n_observations), and the discount factors of the dates,
+# shape (n_markets, 1, n_observations). It returns the payoffs, shape (n_markets, n_paths).
+PathPayoff = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+# Absolute volatility and rate shifts of the vega and rho, the spot is bumped by `MONTE_CARLO_SPOT_BUMP`.
+_GREEK_SHIFT = 0.01
+
+_BASKET_REDUCTIONS: Dict[BasketType, Callable[..., np.ndarray]] = {
+    "worst-of": np.min,
+    "best-of": np.max,
+}
+
+
+def observation_market(
+    rate: Rate,
+    volatility: Volatility,
+    observation_times: np.ndarray,
+    dividend: float,
+    rate_shift: ArrayLike = 0.0,
+    volatility_shift: ArrayLike = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Market parameters of a geometric Brownian motion observed on a schedule of dates.
+
+    The drift of each period is the forward rate implied by the discount factors, the variance of each period
+    is the forward variance of the at the money volatility term structure.
+
+    Args:
+        rate (Rate): The rate object (flat or curve).
+        volatility (Volatility): The volatility object (flat or surface), looked up at the money.
+        observation_times (np.ndarray): The increasing observation dates in years.
+        dividend (float): The dividend yield.
+        rate_shift (ArrayLike, optional): Absolute rate shifts, shape (n_markets, 1) to build several bumped markets at once. Defaults to 0.0.
+        volatility_shift (ArrayLike, optional): Absolute volatility shifts, same shape as `rate_shift`. Defaults to 0.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The drifts of the log spot and the variances over each period
+        and the discount factors at each date, shape (n_markets, len(observation_times)).
+    """
+    observation_times = np.asarray(observation_times, dtype=float)
+    discount_factors = rate.discount_factors(observation_times) * np.exp(-np.asarray(rate_shift, dtype=float) * observation_times)
+    discount_factors = np.atleast_2d(discount_factors)
+    total_variances = (
+        lookup_volatilities(volatility, 1.0, observation_times, volatility_shift) ** 2
+        * observation_times
+    )
+    # A decreasing total variance (calendar arbitrage of the surface) gives a zero forward variance.
+    variances = np.atleast_2d(
+        np.maximum(np.diff(total_variances, axis=-1, prepend=0.0), 0.0)
+    )
+    periods = np.diff(observation_times, prepend=0.0)
+    drifts = (
+        -np.diff(np.log(discount_factors), axis=-1, prepend=0.0)
+        - dividend * periods
+        - 0.5 * variances
+    )
+    return drifts, variances, discount_factors
+
+
+def basket_observation_market(
+    rate: Rate,
+    volatilities: Sequence[Volatility],
+    observation_times: np.ndarray,
+    dividends: Sequence[float],
+    rate_shift: ArrayLike = 0.0,
+    volatility_shift: ArrayLike = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Market parameters of several underlyings observed on a schedule of dates, see `observation_market`.
+
+    Args:
+        rate (Rate): The rate object (flat or curve), shared by the underlyings.
+        volatilities (Sequence[Volatility]): The volatility of each underlying.
+        observation_times (np.ndarray): The increasing observation dates in years.
+        dividends (Sequence[float]): The dividend yield of each underlying.
+        rate_shift (ArrayLike, optional): Absolute rate shifts, shape (n_markets, 1). Defaults to 0.0.
+        volatility_shift (ArrayLike, optional): Absolute volatility shifts of all the underlyings, same shape as `rate_shift`. Defaults to 0.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The drifts and the variances, shape (n_markets, n_underlyings, len(observation_times)),
+        and the discount factors, shape (n_markets, len(observation_times)).
+    """
+    markets = [
+        np.broadcast_arrays(
+            *observation_market(
+                rate, volatility, observation_times, dividend, rate_shift, volatility_shift
+            )
+        )
+        for volatility, dividend in zip(volatilities, dividends)
+    ]
+    drifts, variances, discount_factors = zip(*markets)
+    return np.stack(drifts, axis=-2), np.stack(variances, axis=-2), discount_factors[0]
+
+
+def heston_observation_market(
+    rate: Rate,
+    observation_times: np.ndarray,
+    dividend: float,
+    steps_per_period: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Steps of Heston paths observed on a schedule of dates, each period between two dates being split in evenly
+    spaced steps.
+
+    Args:
+        rate (Rate): The rate object (flat or curve).
+        observation_times (np.ndarray): The increasing observation dates in years.
+        dividend (float): The dividend yield.
+        steps_per_period (np.ndarray): The number of steps of each period.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The length and the log forward growth (forward rate minus dividend) of each step.
+    """
+    starts = np.concatenate(([0.0], np.asarray(observation_times, dtype=float)[:-1]))
+    step_times = np.concatenate(
+        [[0.0]]
+        + [
+            np.linspace(start, end, count + 1)[1:]
+            for start, end, count in zip(starts, observation_times, steps_per_period)
+        ]
+    )
+    periods = np.diff(step_times)
+    log_discount_factors = np.log(rate.discount_factors(step_times))
+    return periods, -np.diff(log_discount_factors) - dividend * periods
+
+
+def normal_chunks(
+    num_paths: int,
+    num_observations: int,
+    values_per_path: int = 1,
+    seed: Optional[int] = None,
+) -> Iterator[np.ndarray]:
+    """Draw the standard normal increments of the paths by chunks of about `MONTE_CARLO_CHUNK_SIZE` values.
+
+    Args:
+        num_paths (int): The total number of paths.
+        num_observations (int): The number of observation dates per path.
+        values_per_path (int, optional): The number of values computed per path and per date from the draws (e.g. the number of bumped markets), used to size the chunks. Defaults to 1.
+        seed (Optional[int], optional): The seed of the generator. Defaults to None.
+
+    Yields:
+        Iterator[np.ndarray]: The draws of a chunk, shape (chunk_paths, num_observations).
+    """
+    assert num_paths > 0, "Error provide a positive number of paths."
+    generator = np.random.default_rng(seed)
+    chunk_paths = max(1, MONTE_CARLO_CHUNK_SIZE // (num_observations * values_per_path))
+    for start in range(0, num_paths, chunk_paths):
+        yield generator.standard_normal((min(chunk_paths, num_paths - start), num_observations))
+    registry.increment("pricing_monte_carlo_paths_total", num_paths)
+
+
+def correlated_normal_chunks(
+    num_paths: int,
+    num_observations: int,
+    correlation: np.ndarray,
+    values_per_path: int = 1,
+    seed: Optional[int] = None,
+) -> Iterator[np.ndarray]:
+    """Draw correlated standard normal increments of several underlyings by chunks of about `MONTE_CARLO_CHUNK_SIZE` values,
+    the draws of a chunk are correlated by one batched product with the Cholesky factor of the correlation.
+
+    Args:
+        num_paths (int): The total number of paths.
+        num_observations (int): The number of observation dates per path.
+        correlation (np.ndarray): The correlation matrix of the underlyings.
+        values_per_path (int, optional): The number of values computed per path, underlying and date from the draws. Defaults to 1.
+        seed (Optional[int], optional): The seed of the generator. Defaults to None.
+
+    Raises:
+        ValueError: Whether the correlation matrix is not positive definite.
+
+    Yields:
+        Iterator[np.ndarray]: The draws of a chunk, shape (chunk_paths, n_underlyings, num_observations).
+    """
+    try:
+        cholesky = np.linalg.cholesky(np.asarray(correlation, dtype=float))
+    except np.linalg.LinAlgError as e:
+        raise ValueError("Error provide a positive definite correlation matrix.") from e
+    for normals in normal_chunks(
+        num_paths,
+        num_observations * cholesky.shape[0],
+        values_per_path,
+        seed,
+    ):
+        yield cholesky @ normals.reshape(-1, cholesky.shape[0], num_observations)
+
+
+def simulate_observations(
+    spot_prices: np.ndarray,
+    drifts: np.ndarray,
+    variances: np.ndarray,
+    normals: np.ndarray,
+) -> np.ndarray:
+    """Spot prices at the observation dates of all the paths of a chunk, for several markets sharing the same draws
+    (common random numbers, so that the bumped prices of the greeks are not blurred by the Monte Carlo noise).
+
+    Args:
+        spot_prices (np.ndarray): The initial spot prices, shape (n_markets,) or (n_markets, n_underlyings).
+        drifts (np.ndarray): The drifts of the log spot over each period, shape (n_markets, n_observations) or (n_markets, n_underlyings, n_observations).
+        variances (np.ndarray): The variances over each period, same shape as `drifts`.
+        normals (np.ndarray): The standard normal draws, shape (n_paths, n_observations) or (n_paths, n_underlyings, n_observations).
+
+    Returns:
+        np.ndarray: The spot prices, shape (n_markets, n_paths, n_observations) or (n_markets, n_paths, n_underlyings, n_observations).
+    """
+    paths = drifts[:, None] + np.sqrt(variances)[:, None] * normals
+    np.cumsum(paths, axis=-1, out=paths)
+    np.exp(paths, out=paths)
+    paths *= np.expand_dims(np.asarray(spot_prices, dtype=float), (1, -1))
+    return paths
+
+
+def monte_carlo_valuation(
+    payoff: PathPayoff,
+    rate: Rate,
+    volatilities: Sequence[Volatility],
+    dividends: Sequence[float],
+    correlation: np.ndarray,
+    spot_prices: np.ndarray,
+    initial_spots: np.ndarray,
+    observation_times: np.ndarray,
+    basket_type: BasketType = "worst-of",
+    num_paths: int = 100_000,
+    seed: Optional[int] = None,
+    monitoring_grid: bool = False,
+    heston_parameters: Optional[HestonParameters] = None,
+) -> Dict[str, float]:
+    """Price and greeks of a product paying on the performance of a basket (worst-of or best-of) observed on a schedule.
+
+    The bumped markets of the greeks and the market of the next day (theta) are simulated from the same draws
+    as the price, chunk by chunk, so the greeks are computed in the same pass.
+
+    Args:
+        payoff (PathPayoff): The discounted payoffs of the paths given the performances of the basket.
+        rate (Rate): The rate object (flat or curve).
+        volatilities (Sequence[Volatility]): The volatility of each underlying.
+        dividends (Sequence[float]): The dividend yield of each underlying.
+        correlation (np.ndarray): The correlation matrix of the underlyings.
+        spot_prices (np.ndarray): The spot price of each underlying.
+        initial_spots (np.ndarray): The strike level of each underlying, the performances are the spots over these levels.
+        observation_times (np.ndarray): The increasing observation dates in years.
+        basket_type (BasketType, optional): The performance of the basket, the worst or the best performance of the underlyings. Defaults to "worst-of".
+        num_paths (int, optional): The number of paths. Defaults to 100_000.
+        seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+        monitoring_grid (bool, optional): Whether the dates discretize a continuous monitoring (barriers), the market of the next day then rescales the grid to the remaining life instead of shifting the dates, which keeps the theta smooth in the draws. Defaults to False.
+        heston_parameters (Optional[HestonParameters], optional): Simulate the underlying (one underlying only) under the Heston model with these parameters instead of the volatility, with at least `HESTON_STEPS_PER_YEAR` steps per year between the dates; the vega then shifts the initial and the long term volatilities. Defaults to None.
+
+    Returns:
+        Dict[str, float]: The price, the delta and gamma with respect to a parallel relative move of the spots (1.0 is +100%),
+        the theta (per year), the vega and the rho (for a parallel 1% move).
+    """
+    if basket_type not in _BASKET_REDUCTIONS:
+        raise ValueError("Basket type not supported. Use 'worst-of' or 'best-of'.")
+    observation_times = np.asarray(observation_times, dtype=float)
+    if monitoring_grid:
+        day = min(1 / 365, 0.5 * observation_times[-1])
+        next_day_times = observation_times * (1 - day / observation_times[-1])
+    else:
+        day = min(1 / 365, 0.5 * observation_times[0])
+        next_day_times = observation_times - day
+    # Only the volatility bumps and the next day need their own paths: a spot bump or a parallel rate shift
+    # scales the performances of all the underlyings of a date by the same factor, which commutes with the
+    # worst-of / best-of, so their basket performances are rescaled from the ones of the current market.
+    drifts, variances, discount_factors = (
+        np.concatenate((values, next_day_values))
+        for values, next_day_values in zip(
+            basket_observation_market(
+                rate,
+                volatilities,
+                observation_times,
+                dividends,
+                volatility_shift=np.array([[0.0], [_GREEK_SHIFT], [-_GREEK_SHIFT]]),
+            ),
+            basket_observation_market(
+                rate, volatilities, next_day_times, dividends
+            ),
+        )
+    )
+    rate_scales = np.exp(np.array([[_GREEK_SHIFT], [-_GREEK_SHIFT]]) * observation_times)
+    discount_factors = np.vstack(
+        (
+            discount_factors,
+            discount_factors[0] / rate_scales,
+            discount_factors[[0, 0]],
+        )
+    )[:, None, :]
+    spot_scales = np.array([1 + MONTE_CARLO_SPOT_BUMP, 1 - MONTE_CARLO_SPOT_BUMP])[:, None, None]
+    spot_prices = np.broadcast_to(np.asarray(spot_prices, dtype=float), (4, len(volatilities)))
+    initial_spots = np.asarray(initial_spots, dtype=float)[:, None]
+    reduce = _BASKET_REDUCTIONS[basket_type]
+
+    if heston_parameters is None:
+        chunks = correlated_normal_chunks(
+            num_paths, observation_times.size, correlation, 4, seed
+        )
+    else:
+        assert len(volatilities) == 1, "Error the Heston model is supported on one underlying."
+        steps_per_period = np.maximum(
+            np.ceil(np.diff(observation_times, prepend=0.0) * HESTON_STEPS_PER_YEAR), 1
+        ).astype(int)
+        periods, log_drifts = (
+            np.stack(values)
+            for values in zip(
+                *(
+                    heston_observation_market(rate, times, dividends[0], steps_per_period)
+                    for times in (observation_times,) * 3 + (next_day_times,)
+                )
+            )
+        )
+        heston_markets = np.array(
+            [
+                heston_parameters,
+                shift_heston_volatility(heston_parameters, _GREEK_SHIFT),
+                shift_heston_volatility(heston_parameters, -_GREEK_SHIFT),
+                heston_parameters,
+            ]
+        )
+        observation_steps = np.cumsum(steps_per_period)
+        # The draws of the steps outweigh the simulated values, they size the chunks. The draws of a step are
+        # made contiguous over the paths, as the steps are simulated one by one for all the paths.
+        chunks = (
+            np.ascontiguousarray(
+                normals.reshape(normals.shape[0], 2, -1).transpose(2, 1, 0)
+            ).transpose(2, 1, 0)
+            for normals in normal_chunks(num_paths, 2 * observation_steps[-1], seed=seed)
+        )
+
+    payoff_sums = np.zeros(8)
+    for normals in chunks:
+        if heston_parameters is None:
+            paths = simulate_observations(spot_prices, drifts, variances, normals)
+        else:
+            paths = simulate_heston_observations(
+                spot_prices[:, 0], heston_markets, periods, log_drifts, normals, observation_steps
+            )[:, :, None, :]
+        paths /= initial_spots
+        # Simulated markets: current, volatility up, volatility down, next day.
+        performances = reduce(paths, axis=-2)
+        performances = np.concatenate(
+            (
+                performances,
+                performances[0] * rate_scales[:, None, :],
+                performances[0] * spot_scales,
+            )
+        )
+        payoff_sums += payoff(performances, discount_factors).sum(axis=1)
+    (
+        price,
+        price_vol_up,
+        price_vol_down,
+        price_next_day,
+        price_rate_up,
+        price_rate_down,
+        price_spot_up,
+        price_spot_down,
+    ) = payoff_sums / num_paths
+
+    return {
+        "price": float(price),
+        "delta": float((price_spot_up - price_spot_down) / (2 * MONTE_CARLO_SPOT_BUMP)),
+        "gamma": float(
+            (price_spot_up - 2 * price + price_spot_down) / MONTE_CARLO_SPOT_BUMP**2
+        ),
+        "theta": float((price_next_day - price) / day),
+        "vega": float((price_vol_up - price_vol_down) / 2),
+        "rho": float((price_rate_up - price_rate_down) / 2),
+    }
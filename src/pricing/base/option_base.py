@@ -2,11 +2,16 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 import numpy as np
-from tqdm import tqdm
 
+from src.pricing.base.heston import HestonParameters, heston_steps
+from src.pricing.base.local_volatility import LocalVolatility
 from src.pricing.base.volatility import Volatility
 from src.pricing.base.rate import Rate
+from src.utility.constants import MONTE_CARLO_CHUNK_SIZE
+from src.utility.metrics import registry
+from src.utility.progress import ProgressCallback, ProgressEvent
 from src.utility.types import OptionType, Maturity
+from src.utility.profiling import profiled
 
 
 class OptionBase(ABC):
@@ -144,7 +149,41 @@ class OptionBase(ABC):
         """
         return f"Option<Spot Price={self._spot_price:.2f}, Strike Price={self._strike_price:.2f}, Maturity={self._maturity}, Option Type={self._option_type}, Volatility={self._volatility}>"
 
-    def monte_carlo_simulation(self, num_paths, num_steps):
+    @profiled
+    def monte_carlo_simulation(
+        self,
+        num_paths: int,
+        num_steps: int,
+        progress_callback: Optional[ProgressCallback] = None,
+        local_volatility: Optional[LocalVolatility] = None,
+        heston_parameters: Optional[HestonParameters] = None,
+    ) -> np.ndarray:
+        """Simulate paths of the underlying following a geometric Brownian motion.
+
+        The time steps are simulated by chunks of about `MONTE_CARLO_CHUNK_SIZE` draws, each chunk
+        being a single vectorized cumulative sum of the log increments (no Python loop per step).
+
+        Args:
+            num_paths (int): The number of paths.
+            num_steps (int): The number of time steps.
+            progress_callback (Optional[ProgressCallback], optional): Called once per chunk with the number of steps simulated. Defaults to None.
+            local_volatility (Optional[LocalVolatility], optional): Simulate the paths with this local volatility instead of the constant volatility of the strike. Defaults to None.
+            heston_parameters (Optional[HestonParameters], optional): Simulate the paths under the Heston model with these parameters instead (QE scheme). Defaults to None.
+
+        Returns:
+            np.ndarray: The simulated paths, shape (num_paths, num_steps + 1).
+        """
+        assert (
+            local_volatility is None or heston_parameters is None
+        ), "Error provide either a local volatility or Heston parameters."
+        if heston_parameters is not None:
+            return self.__heston_simulation(
+                num_paths, num_steps, progress_callback, heston_parameters
+            )
+        if local_volatility is not None:
+            return self.__local_volatility_simulation(
+                num_paths, num_steps, progress_callback, local_volatility
+            )
         dt = self._maturity.maturity_in_years / num_steps
         nudt = (
             (self._domestic_rate.get_rate(self._maturity) - self._dividend)
@@ -157,12 +196,101 @@ class OptionBase(ABC):
         volsdt = self._volatility.get_volatility(
             self._strike_price / self._spot_price, self._maturity.maturity_in_years
         ) * np.sqrt(dt)
-        paths = np.zeros((num_paths, num_steps + 1))
+        paths = np.empty((num_paths, num_steps + 1))
         paths[:, 0] = self._spot_price
 
-        for step in tqdm(
-            range(1, num_steps + 1), desc="Computing steps...", leave=False
-        ):
-            random_shocks = np.random.normal(0, 1, num_paths)
-            paths[:, step] = paths[:, step - 1] * np.exp(nudt + volsdt * random_shocks)
+        chunk_steps = max(1, MONTE_CARLO_CHUNK_SIZE // num_paths)
+        for start in range(1, num_steps + 1, chunk_steps):
+            end = min(start + chunk_steps, num_steps + 1)
+            growth = nudt + volsdt * np.random.normal(0, 1, (num_paths, end - start))
+            np.cumsum(growth, axis=1, out=growth)
+            np.exp(growth, out=growth)
+            np.multiply(paths[:, start - 1 : start], growth, out=paths[:, start:end])
+            if progress_callback is not None:
+                progress_callback(
+                    ProgressEvent("monte-carlo-simulation", end - 1, num_steps)
+                )
+        registry.increment("pricing_monte_carlo_paths_total", num_paths)
+        return paths
+
+    def __local_volatility_simulation(
+        self,
+        num_paths: int,
+        num_steps: int,
+        progress_callback: Optional[ProgressCallback],
+        local_volatility: LocalVolatility,
+    ) -> np.ndarray:
+        """Simulate paths of the underlying with a local volatility (Euler steps of the log forward moneyness).
+
+        The local volatility depends on the state, so the steps are a Python loop, each step being vectorized over
+        the paths: the local volatilities are looked up by index in the precomputed grid.
+        """
+        maturity = self._maturity.maturity_in_years
+        dt = maturity / num_steps
+        sqrt_dt = np.sqrt(dt)
+        times = dt * np.arange(num_steps + 1)
+        forwards = self._spot_price * np.exp(local_volatility.log_forwards(times))
+        paths = np.empty((num_paths, num_steps + 1))
+        paths[:, 0] = self._spot_price
+        log_moneyness = np.zeros(num_paths)
+
+        chunk_steps = max(1, MONTE_CARLO_CHUNK_SIZE // num_paths)
+        for start in range(1, num_steps + 1, chunk_steps):
+            end = min(start + chunk_steps, num_steps + 1)
+            shocks = np.random.normal(0, 1, (num_paths, end - start))
+            for step in range(start, end):
+                volatilities = local_volatility.get_local_volatilities(
+                    log_moneyness, times[step - 1]
+                )
+                log_moneyness += volatilities * (
+                    sqrt_dt * shocks[:, step - start] - 0.5 * volatilities * dt
+                )
+                np.exp(log_moneyness, out=paths[:, step])
+                paths[:, step] *= forwards[step]
+            if progress_callback is not None:
+                progress_callback(
+                    ProgressEvent("monte-carlo-simulation", end - 1, num_steps)
+                )
+        registry.increment("pricing_monte_carlo_paths_total", num_paths)
+        return paths
+
+    def __heston_simulation(
+        self,
+        num_paths: int,
+        num_steps: int,
+        progress_callback: Optional[ProgressCallback],
+        heston_parameters: HestonParameters,
+    ) -> np.ndarray:
+        """Simulate paths of the underlying under the Heston model, the log spots and the variances of the paths
+        being updated in place step by step (see `heston_steps`), the draws by chunks of steps.
+        """
+        maturity = self._maturity.maturity_in_years
+        dt = maturity / num_steps
+        times = dt * np.arange(num_steps + 1)
+        log_discount_factors = np.log(self._domestic_rate.discount_factors(times))
+        log_drifts = (-np.diff(log_discount_factors) - self._dividend * dt)[None, :]
+        periods = np.full((1, num_steps), dt)
+        paths = np.empty((num_paths, num_steps + 1))
+        paths[:, 0] = self._spot_price
+        log_spots = np.full((1, num_paths), np.log(self._spot_price))
+        variances = np.full((1, num_paths), heston_parameters.initial_variance)
+
+        chunk_steps = max(1, MONTE_CARLO_CHUNK_SIZE // (2 * num_paths))
+        for start in range(1, num_steps + 1, chunk_steps):
+            end = min(start + chunk_steps, num_steps + 1)
+            heston_steps(
+                log_spots,
+                variances,
+                np.asarray(heston_parameters)[None, :],
+                periods[:, start - 1 : end - 1],
+                log_drifts[:, start - 1 : end - 1],
+                # Drawn step by step so that the draws of a step are contiguous over the paths.
+                np.random.normal(0, 1, (end - start, 2, num_paths)).transpose(2, 1, 0),
+                out=paths[None, :, start:end],
+            )
+            if progress_callback is not None:
+                progress_callback(
+                    ProgressEvent("monte-carlo-simulation", end - 1, num_steps)
+                )
+        registry.increment("pricing_monte_carlo_paths_total", num_paths)
         return paths
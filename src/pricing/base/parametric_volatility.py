@@ -0,0 +1,310 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from scipy.optimize import least_squares
+from scipy.sparse import csr_matrix
+
+from src.pricing.base.volatility import Volatility
+from src.utility.constants import VOLATILITY_FLOOR
+from src.utility.profiling import profiled
+
+
+class ParametricVolatility(Volatility, ABC):
+    def __init__(self, volatility_surface: Dict[Tuple[float, float], float]) -> None:
+        """Volatility surface given by a parametric model of the total implied variance w(k, T) = sigma^2 x T in
+        the log-moneyness k = log(K / S), calibrated to the quotes. The surface is evaluated in closed form.
+
+        The quotes do not need to fill a grid, every maturity is a slice of the surface.
+
+        Args:
+            volatility_surface (Dict[Tuple[float, float], float]): The quoted implied volatilities with (moneyness, maturity) keys, the moneyness being the strike over spot ratio.
+        """
+        super().__init__()
+        assert len(volatility_surface) > 0, "Error provide volatility quotes."
+        quotes = np.array(
+            [(moneyness, maturity, vol) for (moneyness, maturity), vol in volatility_surface.items()],
+            dtype=float,
+        )
+        assert np.all(quotes > 0), "Error provide positive moneyness, maturities and volatilities."
+        self._slice_maturities, self._quote_slices = np.unique(quotes[:, 1], return_inverse=True)
+        self._log_moneyness = np.log(quotes[:, 0])
+        self._quote_maturities = quotes[:, 1]
+        self._quote_volatilities = quotes[:, 2]
+        self._total_variances = quotes[:, 2] ** 2 * quotes[:, 1]
+        self._calibration = self._calibrate()
+
+    @abstractmethod
+    def _calibrate(self) -> np.ndarray:
+        """Fit the parameters of the model to the quotes, all the quotes are priced in one vectorized residual."""
+
+    @abstractmethod
+    def _total_variance(self, log_moneyness: np.ndarray, maturities: np.ndarray) -> np.ndarray:
+        """Total implied variance of the model for arrays of points."""
+
+    @property
+    def calibration_error(self) -> float:
+        """Root mean square error of the calibrated volatilities against the quotes."""
+        fitted = self.get_volatilities(np.exp(self._log_moneyness), self._quote_maturities)
+        return float(np.sqrt(np.mean((fitted - self._quote_volatilities) ** 2)))
+
+    @property
+    def lookup_error_bound(self) -> Optional[float]:
+        return 0.0
+
+    def compile_lookup(self, moneyness_points: int = 0, maturity_points: int = 0) -> float:
+        """The surface is already evaluated in closed form, there is nothing to compile."""
+        return 0.0
+
+    def _volatilities(self, moneyness: np.ndarray, maturities: np.ndarray) -> np.ndarray:
+        assert np.all(moneyness > 0) and np.all(maturities > 0), "Error provide positive moneyness and maturities."
+        total_variances = np.maximum(
+            self._total_variance(np.log(moneyness), maturities),
+            VOLATILITY_FLOOR**2 * maturities,
+        )
+        return np.sqrt(total_variances / maturities)
+
+    @profiled
+    def get_volatility(
+        self, strike_price: Optional[float] = None, maturity: Optional[float] = None
+    ) -> float:
+        if strike_price is None or maturity is None:
+            raise ValueError(
+                "Both strike_price and maturity must be provided for interpolation."
+            )
+        return float(
+            self._volatilities(
+                np.array([strike_price], dtype=float), np.array([maturity], dtype=float)
+            )[0]
+        )
+
+    @profiled
+    def get_volatilities(
+        self,
+        moneyness: Union[float, np.ndarray],
+        maturities: Union[float, np.ndarray],
+        grid: bool = False,
+    ) -> np.ndarray:
+        moneyness = np.asarray(moneyness, dtype=float)
+        maturities = np.asarray(maturities, dtype=float)
+        if grid:
+            assert moneyness.ndim == 1 and maturities.ndim == 1, "Error provide 1-D moneyness and maturities for a grid."
+            moneyness, maturities = moneyness[:, None], maturities[None, :]
+        moneyness, maturities = np.broadcast_arrays(moneyness, maturities)
+        return self._volatilities(moneyness.ravel(), maturities.ravel()).reshape(moneyness.shape)
+
+    def _slice_weights(
+        self, maturities: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Neighbouring slices of the maturities: the quantities of the model (total variances) are linear in the
+        maturity between two slices, and proportional to the maturity before the first slice and after the last one.
+
+        Args:
+            maturities (np.ndarray): The maturities of the points.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The lower and upper slices, the weights of the
+            upper slices and the scale factors of the points, the quantity of a point being
+            scale x ((1 - weight) x lower value + weight x upper value).
+        """
+        slice_maturities = self._slice_maturities
+        last = slice_maturities.size - 1
+        upper = np.clip(np.searchsorted(slice_maturities, maturities), 0, last)
+        lower = np.maximum(upper - 1, 0)
+        span = slice_maturities[upper] - slice_maturities[lower]
+        weights = np.where(
+            span > 0, (maturities - slice_maturities[lower]) / np.where(span > 0, span, 1.0), 0.0
+        )
+        scales = np.ones_like(maturities)
+        before = maturities < slice_maturities[0]
+        after = maturities > slice_maturities[-1]
+        scales[before] = maturities[before] / slice_maturities[0]
+        scales[after] = maturities[after] / slice_maturities[-1]
+        lower[after] = last
+        weights[before | after] = 0.0
+        return lower, upper, weights, scales
+
+
+def svi_total_variance(
+    log_moneyness: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray,
+    rho: np.ndarray,
+    m: np.ndarray,
+    sigma: np.ndarray,
+) -> np.ndarray:
+    """Raw SVI total variance w(k) = a + b x (rho x (k - m) + sqrt((k - m)^2 + sigma^2)), broadcast over the arguments."""
+    shifted = log_moneyness - m
+    return a + b * (rho * shifted + np.sqrt(shifted**2 + sigma**2))
+
+
+class SVIVolatility(ParametricVolatility):
+    """Raw SVI smile per maturity slice, the total variance is linear in the maturity between the slices (the
+    slices are fitted independently, the model does not prevent calendar arbitrage between them).
+
+    Every slice needs at least 3 quotes. The slices are calibrated together in one bounded least-squares on the
+    volatility residuals of all the quotes (the Jacobian is block sparse, one block per slice).
+    """
+
+    # a, b, rho, m, sigma
+    _LOWER_BOUNDS = (-np.inf, 0.0, -0.999, -np.inf, 1e-4)
+    _UPPER_BOUNDS = (np.inf, np.inf, 0.999, np.inf, np.inf)
+
+    @property
+    def parameters(self) -> np.ndarray:
+        """The (a, b, rho, m, sigma) parameters of every slice, shape (n_slices, 5)."""
+        return self._calibration.copy()
+
+    def _calibrate(self) -> np.ndarray:
+        n_slices = self._slice_maturities.size
+        counts = np.bincount(self._quote_slices, minlength=n_slices)
+        assert np.all(counts >= 3), "Error provide at least 3 quotes per maturity for the SVI model."
+        slices = self._quote_slices
+
+        log_moneyness = self._log_moneyness
+        rows = np.repeat(np.arange(slices.size), 5)
+        columns = (slices[:, None] * 5 + np.arange(5)).ravel()
+
+        def total_variances(parameters: np.ndarray) -> Tuple[np.ndarray, ...]:
+            a, b, rho, m, sigma = parameters.reshape(n_slices, 5)[slices].T
+            shifted = log_moneyness - m
+            root = np.sqrt(shifted**2 + sigma**2)
+            return a + b * (rho * shifted + root), b, rho, shifted, sigma, root
+
+        def residuals(parameters: np.ndarray) -> np.ndarray:
+            variances = total_variances(parameters)[0]
+            return (
+                np.sqrt(np.maximum(variances, 0.0) / self._quote_maturities)
+                - self._quote_volatilities
+            )
+
+        def jacobian(parameters: np.ndarray) -> csr_matrix:
+            # Each quote only depends on the 5 parameters of its slice.
+            variances, b, rho, shifted, sigma, root = total_variances(parameters)
+            scale = 0.5 / np.sqrt(np.maximum(variances, 1e-12) * self._quote_maturities)
+            derivatives = np.column_stack(
+                (
+                    np.ones_like(b),
+                    rho * shifted + root,
+                    b * shifted,
+                    -b * (rho + shifted / root),
+                    b * sigma / root,
+                )
+            )
+            return csr_matrix(
+                ((scale[:, None] * derivatives).ravel(), (rows, columns)),
+                shape=(slices.size, 5 * n_slices),
+            )
+
+        minimum_variances = np.array(
+            [self._total_variances[slices == i].min() for i in range(n_slices)]
+        )
+        initial = np.column_stack(
+            (
+                0.5 * minimum_variances,
+                np.full(n_slices, 0.1),
+                np.zeros(n_slices),
+                np.zeros(n_slices),
+                np.full(n_slices, 0.1),
+            )
+        )
+        result = least_squares(
+            residuals,
+            initial.ravel(),
+            jac=jacobian,
+            bounds=(np.tile(self._LOWER_BOUNDS, n_slices), np.tile(self._UPPER_BOUNDS, n_slices)),
+            method="trf",
+            x_scale="jac",
+        )
+        return result.x.reshape(n_slices, 5)
+
+    def _total_variance(self, log_moneyness: np.ndarray, maturities: np.ndarray) -> np.ndarray:
+        lower, upper, weights, scales = self._slice_weights(maturities)
+        return scales * (
+            (1 - weights) * svi_total_variance(log_moneyness, *self._calibration[lower].T)
+            + weights * svi_total_variance(log_moneyness, *self._calibration[upper].T)
+        )
+
+
+def ssvi_total_variance(
+    log_moneyness: np.ndarray,
+    theta: np.ndarray,
+    rho: float,
+    eta: float,
+    gamma: float,
+) -> np.ndarray:
+    """SSVI total variance w(k, theta) = theta / 2 x (1 + rho x phi x k + sqrt((phi x k + rho)^2 + 1 - rho^2)) with the
+    power-law phi(theta) = eta / (theta^gamma x (1 + theta)^(1 - gamma)), theta being the at the money total variance."""
+    phi = eta / (theta**gamma * (1 + theta) ** (1 - gamma))
+    return (
+        theta
+        / 2
+        * (
+            1
+            + rho * phi * log_moneyness
+            + np.sqrt((phi * log_moneyness + rho) ** 2 + 1 - rho**2)
+        )
+    )
+
+
+class SSVIVolatility(ParametricVolatility):
+    """Surface SVI (Gatheral and Jacquier) with a power-law curvature, free of static arbitrage.
+
+    The at the money total variances of the slices are non decreasing (no calendar arbitrage) and
+    eta x (1 + |rho|) <= 2 with 0 < gamma <= 1/2 (no butterfly arbitrage), both are enforced by the
+    parametrization. The whole surface has 3 parameters besides the at the money term structure, so it stays
+    stable with few quotes. The at the money total variance is linear in the maturity between the slices.
+    """
+
+    @property
+    def parameters(self) -> Dict[str, Union[float, np.ndarray]]:
+        """The rho, eta, gamma parameters and the at the money total variances (theta) of the slices."""
+        thetas, rho, eta, gamma = self.__unpack(self._calibration)
+        return {"rho": rho, "eta": eta, "gamma": gamma, "theta": thetas}
+
+    @staticmethod
+    def __unpack(parameters: np.ndarray) -> Tuple[np.ndarray, float, float, float]:
+        """The parameters are the increments of theta, rho, eta x (1 + |rho|) / 2 and gamma."""
+        rho, eta_ratio, gamma = parameters[-3:]
+        return np.cumsum(parameters[:-3]), rho, 2 * eta_ratio / (1 + abs(rho)), gamma
+
+    def _calibrate(self) -> np.ndarray:
+        n_slices = self._slice_maturities.size
+        slices = self._quote_slices
+
+        def residuals(parameters: np.ndarray) -> np.ndarray:
+            thetas, rho, eta, gamma = self.__unpack(parameters)
+            total_variances = ssvi_total_variance(
+                self._log_moneyness, thetas[slices], rho, eta, gamma
+            )
+            return (
+                np.sqrt(np.maximum(total_variances, 0.0) / self._quote_maturities)
+                - self._quote_volatilities
+            )
+
+        # At the money total variances of the slices, interpolated in the log-moneyness of the quotes.
+        at_the_money = np.empty(n_slices)
+        for i in range(n_slices):
+            order = np.argsort(self._log_moneyness[slices == i])
+            at_the_money[i] = np.interp(
+                0.0,
+                self._log_moneyness[slices == i][order],
+                self._total_variances[slices == i][order],
+            )
+        increments = np.maximum(np.diff(np.maximum.accumulate(at_the_money), prepend=0.0), 1e-8)
+        result = least_squares(
+            residuals,
+            np.concatenate((increments, [0.0, 0.5, 0.25])),
+            bounds=(
+                np.concatenate((np.full(n_slices, 1e-8), [-0.999, 0.0, 1e-3])),
+                np.concatenate((np.full(n_slices, np.inf), [0.999, 1.0, 0.5])),
+            ),
+            method="trf",
+        )
+        return result.x
+
+    def _total_variance(self, log_moneyness: np.ndarray, maturities: np.ndarray) -> np.ndarray:
+        slice_thetas, rho, eta, gamma = self.__unpack(self._calibration)
+        lower, upper, weights, scales = self._slice_weights(maturities)
+        thetas = scales * ((1 - weights) * slice_thetas[lower] + weights * slice_thetas[upper])
+        return ssvi_total_variance(log_moneyness, thetas, rho, eta, gamma)
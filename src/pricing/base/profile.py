@@ -0,0 +1,50 @@
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+# Function evaluating a product on broadcastable arrays of spot prices, remaining maturities (in years)
+# and, optionally, absolute volatility shifts. It returns the price and greeks arrays.
+ProductEvaluator = Callable[..., Dict[str, np.ndarray]]
+
+
+def build_profile(
+    evaluate: ProductEvaluator,
+    spot_price: float,
+    spot_prices: Union[Sequence[float], np.ndarray],
+    maturity_in_years: float,
+    horizons: Optional[Union[Sequence[float], np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """Evaluate a product on a grid of spot prices and horizons in a single vectorized call.
+
+    Args:
+        evaluate (ProductEvaluator): The vectorized evaluation of the product.
+        spot_price (float): The current spot price, the P&L is computed against the current price.
+        spot_prices (Union[Sequence[float], np.ndarray]): The spot grid.
+        maturity_in_years (float): The maturity of the product.
+        horizons (Optional[Union[Sequence[float], np.ndarray]], optional): The horizons in years from today (0 is today, the maturity gives the payoff). Defaults to None (today only).
+
+    Returns:
+        Dict[str, np.ndarray]: The spot prices, the horizons and the price, pnl and greeks arrays. Their shape is (len(horizons), len(spot_prices)), or (len(spot_prices),) when no horizon is given.
+    """
+    spot_grid = np.asarray(spot_prices, dtype=float).reshape(1, -1)
+    horizon_grid = np.asarray(
+        [0.0] if horizons is None else horizons, dtype=float
+    ).reshape(-1, 1)
+    assert np.all(spot_grid > 0), "Error provide positive spot prices."
+    assert np.all(
+        (horizon_grid >= 0) & (horizon_grid <= maturity_in_years)
+    ), "Error provide horizons between 0 and the maturity."
+
+    current_price = evaluate(
+        np.array([[spot_price]], dtype=float), np.array([[maturity_in_years]])
+    )["price"]
+    profile = {
+        name: np.broadcast_to(values, (horizon_grid.size, spot_grid.size))
+        for name, values in evaluate(spot_grid, maturity_in_years - horizon_grid).items()
+    }
+    profile["pnl"] = profile["price"] - current_price
+    if horizons is None:
+        profile = {name: values[0] for name, values in profile.items()}
+    profile["horizon"] = horizon_grid.ravel()
+    profile["spot_price"] = spot_grid.ravel()
+    return profile
@@ -1,8 +1,13 @@
 import math
 from typing import Dict, List, Literal, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
 from scipy import interpolate
 
+from src.pricing.base.curve_interpolation import CurveInterpolation
 from src.utility.types import Maturity
+from src.utility.profiling import profiled
 
 
 class Rate:
@@ -11,30 +16,97 @@ class Rate:
         rate: Optional[float] = None,
         rate_type: Literal["continuous", "compounded"] = "continuous",
         rate_curve: Optional[Dict[Maturity, float]] = None,
-        interpolation_type: Literal["linear", "quadratic", "cubic"] = "linear",
+        interpolation_type: Literal[
+            "linear", "quadratic", "cubic", "log-linear", "monotone-convex"
+        ] = "linear",
     ) -> None:
+        """Flat rate or rate curve.
+
+        The "linear", "quadratic" and "cubic" interpolations are the ones of `interp1d` on the rates (extrapolated
+        with the same polynomial). The "log-linear" (discount factors) and "monotone-convex" (Hagan and West)
+        interpolations are made on the integrated rates -log(DF), with flat forward extrapolation, and are
+        precomputed on the pillars so that lookups are cheap (see `CurveInterpolation`).
+        """
         assert interpolation_type in [
             "linear",
             "quadratic",
             "cubic",
-        ], 'Error provide either interpolation_type "linear", "quadratic", "cubic" '
+            "log-linear",
+            "monotone-convex",
+        ], 'Error provide either interpolation_type "linear", "quadratic", "cubic", "log-linear", "monotone-convex" '
         self.__rate = rate
         self.__rate_type = rate_type
+        self.__interpol = None
+        self.__curve: Optional[CurveInterpolation] = None
         if rate_curve is not None:
-            self.__interpol = interpolate.interp1d(
-                [mat.maturity_in_years for mat in rate_curve.keys()],
-                list(rate_curve.values()),
-                fill_value="extrapolate",
-                kind=interpolation_type,
-            )
+            times = np.array([mat.maturity_in_years for mat in rate_curve.keys()])
+            rates = np.array(list(rate_curve.values()), dtype=float)
+            if interpolation_type in ("log-linear", "monotone-convex"):
+                self.__curve = CurveInterpolation(
+                    times,
+                    times * (rates if rate_type == "continuous" else np.log1p(rates)),
+                    interpolation_type,
+                )
+            else:
+                self.__interpol = interpolate.interp1d(
+                    times,
+                    rates,
+                    fill_value="extrapolate",
+                    kind=interpolation_type,
+                )
+
+    @property
+    def rate_type(self) -> Literal["continuous", "compounded"]:
+        return self.__rate_type
 
+    @profiled
     def get_rate(self, maturity: Optional[Maturity] = None) -> float:
         if self.__rate is not None:
             return self.__rate
         if maturity is not None:
+            if self.__curve is not None:
+                rate = self.__curve.zero_rate(maturity.maturity_in_years)
+                return rate if self.__rate_type == "continuous" else math.expm1(rate)
             return float(self.__interpol(maturity.maturity_in_years))
         raise ValueError("Error, provide a valid maturity or a rate attribute.")
 
+    @profiled
+    def get_rates(self, maturities_in_years: ArrayLike) -> np.ndarray:
+        """Rates of many maturities at once.
+
+        Args:
+            maturities_in_years (ArrayLike): The maturities in years.
+
+        Returns:
+            np.ndarray: The rates with the shape of `maturities_in_years`.
+        """
+        maturities_in_years = np.asarray(maturities_in_years, dtype=float)
+        if self.__rate is not None:
+            return np.full(maturities_in_years.shape, float(self.__rate))
+        if self.__curve is not None:
+            rates = self.__curve.zero_rates(maturities_in_years)
+            return rates if self.__rate_type == "continuous" else np.expm1(rates)
+        return np.asarray(self.__interpol(maturities_in_years), dtype=float)
+
+    @profiled
+    def discount_factors(self, maturities_in_years: ArrayLike) -> np.ndarray:
+        """Discount factors of many maturities at once (same conventions as `discount_factor`).
+
+        Args:
+            maturities_in_years (ArrayLike): The maturities in years.
+
+        Returns:
+            np.ndarray: The discount factors with the shape of `maturities_in_years`.
+        """
+        maturities_in_years = np.asarray(maturities_in_years, dtype=float)
+        rates = self.get_rates(maturities_in_years)
+        if self.__rate_type == "continuous":
+            return np.exp(-rates * maturities_in_years)
+        elif self.__rate_type == "compounded":
+            return (1 + rates) ** -maturities_in_years
+        else:
+            raise ValueError("Error provide a valid rate type")
+
     def discount_factor(
         self, maturity: Maturity, force_rate: Optional[float] = None
     ) -> float:
@@ -73,3 +145,22 @@ class Rate:
             )
         else:
             raise ValueError("Error provide a valid rate type")
+
+
+class ShiftedRate(Rate):
+    def __init__(self, rate: Rate, shift: float) -> None:
+        """Rate (flat or curve) shifted in parallel in its convention, e.g. for the rho of the Monte Carlo products.
+
+        Args:
+            rate (Rate): The rate to shift.
+            shift (float): The absolute shift of the rates.
+        """
+        super().__init__(rate_type=rate.rate_type)
+        self.__rate = rate
+        self.__shift = shift
+
+    def get_rate(self, maturity: Optional[Maturity] = None) -> float:
+        return self.__rate.get_rate(maturity) + self.__shift
+
+    def get_rates(self, maturities_in_years: ArrayLike) -> np.ndarray:
+        return self.__rate.get_rates(maturities_in_years) + self.__shift
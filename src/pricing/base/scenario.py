@@ -0,0 +1,44 @@
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+from src.pricing.base.profile import ProductEvaluator
+
+
+def build_scenario_grid(
+    evaluate: ProductEvaluator,
+    spot_price: float,
+    spot_shifts: Union[Sequence[float], np.ndarray],
+    volatility_shifts: Union[Sequence[float], np.ndarray],
+    maturity_in_years: float,
+) -> Dict[str, np.ndarray]:
+    """Revalue a product on a spot shift x volatility shift grid in a single vectorized call.
+
+    Args:
+        evaluate (ProductEvaluator): The vectorized evaluation of the product.
+        spot_price (float): The current spot price.
+        spot_shifts (Union[Sequence[float], np.ndarray]): The relative spot shifts (0.05 is +5%).
+        volatility_shifts (Union[Sequence[float], np.ndarray]): The absolute volatility shifts (0.01 is +1 volatility point).
+        maturity_in_years (float): The maturity of the product.
+
+    Returns:
+        Dict[str, np.ndarray]: The shifts and the price, pnl and greeks matrices of shape (len(spot_shifts), len(volatility_shifts)).
+    """
+    spot_shifts = np.asarray(spot_shifts, dtype=float).reshape(-1, 1)
+    volatility_shifts = np.asarray(volatility_shifts, dtype=float).reshape(1, -1)
+    assert np.all(spot_shifts > -1), "Error provide spot shifts greater than -100%."
+
+    maturity_grid = np.array([[maturity_in_years]], dtype=float)
+    current_price = evaluate(
+        np.array([[spot_price]], dtype=float), maturity_grid, 0.0
+    )["price"]
+    scenarios = {
+        name: np.broadcast_to(values, (spot_shifts.size, volatility_shifts.size))
+        for name, values in evaluate(
+            spot_price * (1 + spot_shifts), maturity_grid, volatility_shifts
+        ).items()
+    }
+    scenarios["pnl"] = scenarios["price"] - current_price
+    scenarios["spot_shift"] = spot_shifts.ravel()
+    scenarios["volatility_shift"] = volatility_shifts.ravel()
+    return scenarios
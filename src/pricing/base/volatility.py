@@ -1,7 +1,10 @@
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 import matplotlib.pyplot as plt
 from scipy.interpolate import RectBivariateSpline
 import numpy as np
+from src.utility.constants import DEFAULT_VOLATILITY_LOOKUP_POINTS
+from src.utility.metrics import record_cache_lookup
+from src.utility.profiling import profiled
 
 
 class Volatility:
@@ -9,9 +12,13 @@ class Volatility:
         self,
         volatility: Optional[float] = None,
         volatility_surface: Optional[Dict[Tuple[float, float], float]] = None,
+        lookup_resolution: Optional[Tuple[int, int]] = None,
     ) -> None:
         self.__volatility = volatility
         self.__volatility_surface = volatility_surface
+        # Dense table of the surface (see `compile_lookup`): first moneyness, first maturity, steps and values.
+        self.__lookup: Optional[Tuple[float, float, float, float, np.ndarray]] = None
+        self.__lookup_error_bound: Optional[float] = None
 
         if self.__volatility_surface is not None:
             stpr = sorted(set([k[0] for k in self.__volatility_surface.keys()]))
@@ -31,7 +38,111 @@ class Volatility:
                 ]
             )
             self.__interpol = RectBivariateSpline(stpr, mat, VS.T, kx=2, ky=2)
+            self.__moneyness_bounds = (stpr[0], stpr[-1])
+            self.__maturity_bounds = (mat[0], mat[-1])
+            if lookup_resolution is not None:
+                self.compile_lookup(*lookup_resolution)
 
+    @property
+    def lookup_error_bound(self) -> Optional[float]:
+        """Bound of the absolute error of the compiled lookup against the spline, None when not compiled."""
+        return self.__lookup_error_bound
+
+    def compile_lookup(
+        self,
+        moneyness_points: int = DEFAULT_VOLATILITY_LOOKUP_POINTS[0],
+        maturity_points: int = DEFAULT_VOLATILITY_LOOKUP_POINTS[1],
+    ) -> float:
+        """Pre-evaluate the spline of the surface on a dense moneyness x maturity grid, the lookups inside the
+        quoted range are then served by index arithmetic and bilinear interpolation of the table (the points
+        outside the quoted range are still evaluated by the spline).
+
+        The error of the bilinear interpolation is bounded by h_m^2 / 8 x max|d2v/dm2| + h_t^2 / 8 x max|d2v/dt2|,
+        with h_m and h_t the steps of the table and the second derivatives of the spline on the quoted range.
+        It decreases as the square of the resolution.
+
+        Args:
+            moneyness_points (int, optional): The number of moneyness points of the table. Defaults to 1024.
+            maturity_points (int, optional): The number of maturity points of the table. Defaults to 256.
+
+        Returns:
+            float: The bound of the absolute error against the spline (0.01 is one volatility point).
+        """
+        if self.__volatility is not None:
+            self.__lookup_error_bound = 0.0
+            return self.__lookup_error_bound
+        assert moneyness_points >= 2 and maturity_points >= 2, "Error provide at least 2 points per axis."
+        moneyness = np.linspace(*self.__moneyness_bounds, moneyness_points)
+        maturities = np.linspace(*self.__maturity_bounds, maturity_points)
+        moneyness_step = moneyness[1] - moneyness[0]
+        maturity_step = maturities[1] - maturities[0]
+        self.__lookup = (
+            moneyness[0],
+            maturities[0],
+            moneyness_step,
+            maturity_step,
+            self.__interpol(moneyness, maturities),
+        )
+        # The spline is quadratic by pieces: its first derivatives are linear between the knots, so their
+        # slopes on the cells of the table (finer than the knots) give the maxima of the second derivatives.
+        moneyness_curvature = np.abs(
+            np.diff(self.__interpol(moneyness, maturities, dx=1), axis=0)
+        ).max() / moneyness_step
+        maturity_curvature = np.abs(
+            np.diff(self.__interpol(moneyness, maturities, dy=1), axis=1)
+        ).max() / maturity_step
+        self.__lookup_error_bound = float(
+            moneyness_step**2 / 8 * moneyness_curvature
+            + maturity_step**2 / 8 * maturity_curvature
+        )
+        return self.__lookup_error_bound
+
+    def __spline_lookup(self, moneyness: np.ndarray, maturities: np.ndarray) -> np.ndarray:
+        """Evaluate the surface on 1-D arrays of points, with the compiled table when available."""
+        if self.__lookup is None:
+            return self.__interpol.ev(moneyness, maturities)
+        first_moneyness, first_maturity, moneyness_step, maturity_step, table = self.__lookup
+        x = (moneyness - first_moneyness) * (1 / moneyness_step)
+        y = (maturities - first_maturity) * (1 / maturity_step)
+        n_moneyness, n_maturities = table.shape
+        i = np.clip(x, 0, n_moneyness - 2).astype(np.intp)
+        j = np.clip(y, 0, n_maturities - 2).astype(np.intp)
+        x -= i
+        y -= j
+        flat_table = table.ravel()
+        corner = i * n_maturities + j
+        lower = flat_table[corner]
+        lower += (flat_table[corner + n_maturities] - lower) * x
+        upper = flat_table[corner + 1]
+        upper += (flat_table[corner + n_maturities + 1] - upper) * x
+        volatilities = lower + (upper - lower) * y
+        outside = (x < 0) | (x > 1) | (y < 0) | (y > 1)
+        misses = int(np.count_nonzero(outside))
+        record_cache_lookup("volatility-compiled-lookup", True, outside.size - misses)
+        if misses:
+            record_cache_lookup("volatility-compiled-lookup", False, misses)
+            volatilities[outside] = self.__interpol.ev(moneyness[outside], maturities[outside])
+        return volatilities
+
+    def __scalar_lookup(self, moneyness: float, maturity: float) -> float:
+        """Scalar version of `__spline_lookup`, without the overhead of numpy for a single point."""
+        if self.__lookup is not None:
+            first_moneyness, first_maturity, moneyness_step, maturity_step, table = self.__lookup
+            x = (moneyness - first_moneyness) / moneyness_step
+            y = (maturity - first_maturity) / maturity_step
+            inside = 0 <= x <= table.shape[0] - 1 and 0 <= y <= table.shape[1] - 1
+            record_cache_lookup("volatility-compiled-lookup", inside)
+            if inside:
+                i = min(int(x), table.shape[0] - 2)
+                j = min(int(y), table.shape[1] - 2)
+                x -= i
+                y -= j
+                v00, v01 = table[i, j : j + 2].tolist()
+                v10, v11 = table[i + 1, j : j + 2].tolist()
+                return (v00 + (v10 - v00) * x) * (1 - y) + (v01 + (v11 - v01) * x) * y
+        return float(self.__interpol.ev(moneyness, maturity))
+
+    @profiled
     def get_volatility(
         self, strike_price: Optional[float] = None, maturity: Optional[float] = None
     ) -> float:
@@ -44,7 +155,57 @@ class Volatility:
                 )
 
             try:
-                return float(self.__interpol(strike_price, maturity))
+                return self.__scalar_lookup(strike_price, maturity)
+            except ValueError:
+                raise ValueError(
+                    "Interpolation failed for the provided strike_price and maturity."
+                )
+        else:
+            raise ValueError(
+                "Volatility surface interpolation has not been initialized."
+            )
+
+    @profiled
+    def get_volatilities(
+        self,
+        moneyness: Union[float, np.ndarray],
+        maturities: Union[float, np.ndarray],
+        grid: bool = False,
+    ) -> np.ndarray:
+        """Vectorized version of `get_volatility`, the surface is evaluated for all the points in one call.
+
+        Args:
+            moneyness (Union[float, np.ndarray]): The strike over spot ratios.
+            maturities (Union[float, np.ndarray]): The maturities in years, broadcastable with `moneyness` (scattered points).
+            grid (bool, optional): Whether to evaluate the grid of every moneyness x every maturity (option chains), `moneyness` and `maturities` are then 1-D. Defaults to False.
+
+        Returns:
+            np.ndarray: The volatilities with the broadcast shape of the inputs, or shape (len(moneyness), len(maturities)) for a grid.
+        """
+        moneyness = np.asarray(moneyness, dtype=float)
+        maturities = np.asarray(maturities, dtype=float)
+        if grid:
+            assert moneyness.ndim == 1 and maturities.ndim == 1, "Error provide 1-D moneyness and maturities for a grid."
+            shape = (moneyness.size, maturities.size)
+        else:
+            moneyness, maturities = np.broadcast_arrays(moneyness, maturities)
+            shape = moneyness.shape
+        if self.__volatility is not None:
+            return np.full(shape, float(self.__volatility))
+        elif self.__interpol is not None:
+            try:
+                if grid and self.__lookup is not None:
+                    moneyness, maturities = np.broadcast_arrays(moneyness[:, None], maturities[None, :])
+                elif grid:
+                    # The spline evaluates grids of increasing coordinates only.
+                    moneyness_order = np.argsort(moneyness)
+                    maturity_order = np.argsort(maturities)
+                    volatilities = np.empty(shape)
+                    volatilities[np.ix_(moneyness_order, maturity_order)] = self.__interpol(
+                        moneyness[moneyness_order], maturities[maturity_order]
+                    )
+                    return volatilities
+                return self.__spline_lookup(moneyness.ravel(), maturities.ravel()).reshape(shape)
             except ValueError:
                 raise ValueError(
                     "Interpolation failed for the provided strike_price and maturity."
@@ -95,6 +256,33 @@ class Volatility:
             return f"Volatility<volatility={self.__volatility:.2f}>"
 
 
+
+class ShiftedVolatility(Volatility):
+    def __init__(self, volatility: Volatility, shift: float) -> None:
+        """Volatility (flat or surface) shifted in parallel, e.g. for the vega of the Monte Carlo products.
+
+        Args:
+            volatility (Volatility): The volatility to shift.
+            shift (float): The absolute shift of the volatilities.
+        """
+        super().__init__()
+        self.__volatility = volatility
+        self.__shift = shift
+
+    def get_volatility(
+        self, strike_price: Optional[float] = None, maturity: Optional[float] = None
+    ) -> float:
+        return self.__volatility.get_volatility(strike_price, maturity) + self.__shift
+
+    def get_volatilities(
+        self,
+        moneyness: Union[float, np.ndarray],
+        maturities: Union[float, np.ndarray],
+        grid: bool = False,
+    ) -> np.ndarray:
+        return self.__volatility.get_volatilities(moneyness, maturities, grid) + self.__shift
+
+
 if __name__ == "__main__":
     volatility_surface_example = {
         (1.0, 0.5): 0.2,
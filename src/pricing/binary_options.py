@@ -1,10 +1,21 @@
-from typing import Optional
+from typing import Dict, Optional, Sequence
 import numpy as np
+from scipy.special import ndtr
 from scipy.stats import norm
+from src.pricing.base.black_scholes import (
+    ArrayLike,
+    lookup_product_volatilities,
+    lookup_rates,
+    lookup_volatilities,
+)
 from src.pricing.base.option_base import OptionBase
+from src.pricing.base.profile import build_profile
+from src.pricing.base.scenario import build_scenario_grid
 from src.pricing.base.volatility import Volatility
 from src.pricing.base.rate import Rate
+from src.utility.constants import VOLATILITY_FLOOR
 from src.utility.types import Maturity, OptionType
+from src.utility.profiling import profiled
 
 
 class BinaryOption(OptionBase):
@@ -30,6 +41,7 @@ class BinaryOption(OptionBase):
             foreign_rate,
         )
 
+    @profiled
     def compute_price(self) -> float:
         effective_rate = self._domestic_rate.get_rate(self._maturity) - (
             self._foreign_rate.get_rate(self._maturity)
@@ -204,6 +216,7 @@ class BinaryOption(OptionBase):
 
         return theta
 
+    @profiled
     def compute_greeks(self):
         return {
             "delta": self.compute_delta(),
@@ -212,3 +225,166 @@ class BinaryOption(OptionBase):
             "rho": self.compute_rho(),
             "vega": self.compute_vega(),
         }
+
+    def __evaluate(
+        self,
+        spot_prices: np.ndarray,
+        maturities_in_years: np.ndarray,
+        volatility_shift: ArrayLike = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        """Vectorized version of the pricing and greeks formulas above (same conventions)."""
+        if self._option_type not in ("call", "put"):
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        sign = 1.0 if self._option_type == "call" else -1.0
+        expired = maturities_in_years <= 0
+        tau = np.where(expired, 1.0, maturities_in_years)
+        domestic_rate = lookup_rates(self._domestic_rate, tau)
+        effective_rate = domestic_rate - (
+            lookup_rates(self._foreign_rate, tau)
+            if self._foreign_rate
+            else self._dividend
+        )
+        r = domestic_rate - self._dividend
+        sigma = lookup_volatilities(
+            self._volatility, self._strike_price / spot_prices, tau, volatility_shift
+        )
+        log_moneyness = np.log(spot_prices / self._strike_price)
+        d1 = (log_moneyness + (r + 0.5 * sigma**2) * tau) / (sigma * np.sqrt(tau))
+        d2 = d1 - sigma * np.sqrt(tau)
+        cdf_d2 = ndtr(sign * d2)
+        pdf_d2 = norm.pdf(d2)
+        discount = np.exp(-r * tau)
+
+        values = {
+            "price": np.exp(-effective_rate * tau) * cdf_d2,
+            "delta": sign * discount * pdf_d2 / (spot_prices * sigma * np.sqrt(tau)),
+            "gamma": -sign * discount * pdf_d2 * d1 / (spot_prices**2 * sigma**2 * tau),
+            "theta": discount
+            * pdf_d2
+            / (2 * tau * sigma * np.sqrt(tau))
+            * (log_moneyness - (r - (sigma**2 / 2) * tau) + sign * r * cdf_d2)
+            / 365,
+            "rho": discount
+            * (sign * np.sqrt(tau) * pdf_d2 / sigma - tau * cdf_d2)
+            / 100,
+            "vega": sign * discount * d1 * pdf_d2 / sigma,
+        }
+        if np.any(expired):
+            values = {name: np.where(expired, 0.0, value) for name, value in values.items()}
+            values["price"] = np.where(
+                expired,
+                (sign * (spot_prices - self._strike_price) > 0).astype(float),
+                values["price"],
+            )
+        return values
+
+    @profiled
+    def compute_profile(
+        self,
+        spot_prices: Sequence[float],
+        horizons: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Price and greeks of the option over a spot grid (payoff and P&L diagrams), in one vectorized evaluation.
+
+        Args:
+            spot_prices (Sequence[float]): The spot prices of the underlying.
+            horizons (Optional[Sequence[float]], optional): The horizons in years from today, the maturity gives the payoff. Defaults to None (today only).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks arrays of shape (len(horizons), len(spot_prices)), or (len(spot_prices),) without horizons.
+        """
+        return build_profile(
+            self.__evaluate,
+            self._spot_price,
+            spot_prices,
+            self._maturity.maturity_in_years,
+            horizons,
+        )
+
+    @profiled
+    def compute_scenarios(
+        self,
+        spot_shifts: Sequence[float],
+        volatility_shifts: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """Revalue the option on a spot shift x volatility shift grid (risk limits heatmaps) in one vectorized evaluation.
+
+        Args:
+            spot_shifts (Sequence[float]): The relative spot shifts (0.05 is +5%).
+            volatility_shifts (Sequence[float]): The absolute volatility shifts (0.01 is +1 volatility point).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks matrices of shape (len(spot_shifts), len(volatility_shifts)).
+        """
+        return build_scenario_grid(
+            self.__evaluate,
+            self._spot_price,
+            spot_shifts,
+            volatility_shifts,
+            self._maturity.maturity_in_years,
+        )
+
+    @classmethod
+    def revalue(
+        cls,
+        options: Sequence["BinaryOption"],
+        spot_returns: np.ndarray,
+        volatility_changes: np.ndarray,
+        rate_shifts: np.ndarray,
+    ) -> np.ndarray:
+        """Full revaluation of many options on market shocks in one vectorized pass (historical VaR).
+
+        The volatility of every option is looked up once at its current moneyness (sticky strike) and then
+        shocked, the rate shocks are parallel shifts of the domestic rate.
+
+        Args:
+            options (Sequence[BinaryOption]): The options to revalue.
+            spot_returns (np.ndarray): The relative spot shocks, shape (len(options), n_scenarios).
+            volatility_changes (np.ndarray): The absolute volatility shocks, broadcastable with the spot shocks.
+            rate_shifts (np.ndarray): The absolute rate shocks, broadcastable with the spot shocks.
+
+        Returns:
+            np.ndarray: The prices, shape (len(options), n_scenarios).
+        """
+        if any(option._option_type not in ("call", "put") for option in options):
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        sign = np.array(
+            [1.0 if option._option_type == "call" else -1.0 for option in options]
+        )[:, None]
+        tau = np.array([option._maturity.maturity_in_years for option in options])[
+            :, None
+        ]
+        dividends = np.array([option._dividend for option in options])[:, None]
+        domestic_rates = (
+            np.array(
+                [option._domestic_rate.get_rate(option._maturity) for option in options]
+            )[:, None]
+            + rate_shifts
+        )
+        carry = np.array(
+            [
+                option._foreign_rate.get_rate(option._maturity)
+                if option._foreign_rate
+                else option._dividend
+                for option in options
+            ]
+        )[:, None]
+        sigma = np.maximum(
+            lookup_product_volatilities(
+                [option._volatility for option in options],
+                [option._strike_price / option._spot_price for option in options],
+                [option._maturity.maturity_in_years for option in options],
+            )[:, None]
+            + volatility_changes,
+            VOLATILITY_FLOOR,
+        )
+        spot_prices = (
+            np.array([option._spot_price for option in options])[:, None]
+            * (1 + spot_returns)
+        )
+        strike_prices = np.array([option._strike_price for option in options])[:, None]
+        d2 = (
+            np.log(spot_prices / strike_prices)
+            + (domestic_rates - dividends - 0.5 * sigma**2) * tau
+        ) / (sigma * np.sqrt(tau))
+        return np.exp(-(domestic_rates - carry) * tau) * ndtr(sign * d2)
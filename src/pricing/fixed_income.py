@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from logging import warn
-from typing import Dict, List, Optional, Union, Callable, Any
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, Union, Callable, Any
+import numpy as np
 from scipy.optimize import minimize
 
+from src.pricing.base.curve_risk import CashFlowSchedule
 from src.pricing.base.rate import Rate
+from src.utility.constants import YTM_MAX_ITERATIONS, YTM_TOLERANCE
 from src.utility.types import Maturity
+from src.utility.profiling import profiled
 
 
 class ABCBond(ABC):
@@ -42,16 +45,46 @@ class Optimization:
 
     def run(self):
         return minimize(
-            lambda x: (self.__target_value - self.__pricing_function(x)) ** 2,
+            lambda x: (self.__target_value - self.__pricing_function(float(x[0]))) ** 2,
             x0=(self.__initial_value),
             method="SLSQP",
             tol=self.__epsilon,
         )
 
 
-class ZeroCouponBond(ABCBond):
-    _price: Optional[float] = None
+def _yields_to_maturity(
+    times: np.ndarray,
+    amounts: np.ndarray,
+    prices: np.ndarray,
+    rate_type: Literal["continuous", "compounded"] = "continuous",
+) -> np.ndarray:
+    """Yields to maturity of many bonds at once, by Newton steps on all the bonds together.
+
+    The yield is solved as a continuous rate z (price = sum(amounts x exp(-z x times))), starting from the yield of a
+    zero coupon paying all the cash flows at their average date, and converted to `rate_type` as `Rate` does.
+
+    Args:
+        times (np.ndarray): The times of the cash flows, shape (n, m).
+        amounts (np.ndarray): The amounts of the cash flows (0 for the padding), shape (n, m).
+        prices (np.ndarray): The prices of the bonds, shape (n,).
+        rate_type (Literal["continuous", "compounded"], optional): The convention of the yields. Defaults to "continuous".
+
+    Returns:
+        np.ndarray: The yields, shape (n,).
+    """
+    assert np.all(prices > 0), "Error provide positive prices."
+    totals = amounts.sum(axis=1)
+    yields = np.log(totals / prices) * totals / (amounts * times).sum(axis=1)
+    for _ in range(YTM_MAX_ITERATIONS):
+        values = amounts * np.exp(-yields[:, None] * times)
+        residuals = values.sum(axis=1) - prices
+        if np.max(np.abs(residuals) / prices) < YTM_TOLERANCE:
+            return yields if rate_type == "continuous" else np.expm1(yields)
+        yields += residuals / (values * times).sum(axis=1)
+    raise ValueError("Error the yield to maturity did not converge, check the cash flows and the prices.")
 
+
+class ZeroCouponBond(ABCBond):
     def __init__(
         self,
         rate: Rate,
@@ -68,7 +101,9 @@ class ZeroCouponBond(ABCBond):
         self.__rate = rate
         self.__maturity = maturity
         self.__nominal = nominal
+        self._price: Optional[float] = None
 
+    @profiled
     def compute_price(self, force_rate: Optional[float] = None) -> float:
         """Compute the price of the bond.
 
@@ -78,18 +113,54 @@ class ZeroCouponBond(ABCBond):
         Returns:
             float: _description_
         """
+        if force_rate is not None:
+            # Prices at a forced rate (YTM solving) are neither cached nor read from the cache.
+            return self.__nominal * self.__rate.discount_factor(
+                maturity=self.__maturity, force_rate=force_rate
+            )
         if self._price is None:
             self._price = self.__nominal * (
-                self.__rate.discount_factor(
-                    maturity=self.__maturity, force_rate=force_rate
-                )
+                self.__rate.discount_factor(maturity=self.__maturity)
             )  # =~100 - TAUX x Maturité
         return self._price
 
-class Bond(ABCBond):
-    _price: Optional[float] = None
-    _ytm: Optional[float] = None
+    def cash_flows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The times in years and the amounts of the cash flows of the bond (see `CurveRisk`)."""
+        return np.array([self.__maturity.maturity_in_years]), np.array([float(self.__nominal)])
+
+    @classmethod
+    def revalue(
+        cls,
+        bonds: Sequence["ZeroCouponBond"],
+        spot_returns: np.ndarray,
+        volatility_changes: np.ndarray,
+        rate_shifts: np.ndarray,
+    ) -> np.ndarray:
+        """Full revaluation of many zero coupon bonds on market shocks in one vectorized pass (historical VaR).
+        Only the rate shocks (parallel shifts, continuously compounded) move the price of a bond.
+
+        Args:
+            bonds (Sequence[ZeroCouponBond]): The bonds to revalue.
+            spot_returns (np.ndarray): The relative spot shocks, shape (len(bonds), n_scenarios).
+            volatility_changes (np.ndarray): The absolute volatility shocks (not used).
+            rate_shifts (np.ndarray): The absolute rate shocks, broadcastable with the spot shocks.
 
+        Returns:
+            np.ndarray: The prices, shape (len(bonds), n_scenarios).
+        """
+        maturities = np.array([bond.__maturity.maturity_in_years for bond in bonds])[
+            :, None
+        ]
+        prices = np.array(
+            [
+                bond.__nominal * bond.__rate.discount_factor(maturity=bond.__maturity)
+                for bond in bonds
+            ]
+        )[:, None] * np.exp(-rate_shifts * maturities)
+        return np.broadcast_to(prices, np.broadcast(prices, spot_returns).shape)
+
+
+class Bond(ABCBond):
     def __init__(
         self,
         rate: Rate,
@@ -104,7 +175,10 @@ class Bond(ABCBond):
         self.__coupon_rate = coupon_rate
         self.__nb_coupon = nb_coupon
         self.__components = self.__run_components()
+        self._price: Optional[float] = None
+        self._ytm: Optional[float] = None
 
+    @profiled
     def compute_price(self, force_rate: Optional[float] = None):
         if self._price is None or force_rate is not None:
             price = sum(
@@ -120,27 +194,71 @@ class Bond(ABCBond):
                 self._price = price
         return self._price
 
+    @classmethod
+    def revalue(
+        cls,
+        bonds: Sequence["Bond"],
+        spot_returns: np.ndarray,
+        volatility_changes: np.ndarray,
+        rate_shifts: np.ndarray,
+    ) -> np.ndarray:
+        """Full revaluation of many bonds on market shocks, the cash flows of all the bonds are revalued
+        in one vectorized pass (historical VaR). Only the rate shocks move the price of a bond.
+
+        Args:
+            bonds (Sequence[Bond]): The bonds to revalue.
+            spot_returns (np.ndarray): The relative spot shocks, shape (len(bonds), n_scenarios).
+            volatility_changes (np.ndarray): The absolute volatility shocks (not used).
+            rate_shifts (np.ndarray): The absolute rate shocks, broadcastable with the spot shocks.
+
+        Returns:
+            np.ndarray: The prices, shape (len(bonds), n_scenarios).
+        """
+        cash_flow_counts = np.array([len(bond.__components) for bond in bonds])
+
+        def per_cash_flow(values: np.ndarray) -> np.ndarray:
+            values = np.asarray(values, dtype=float)
+            if values.ndim < 2 or values.shape[0] == 1:
+                return values
+            return np.repeat(values, cash_flow_counts, axis=0)
+
+        cash_flow_prices = ZeroCouponBond.revalue(
+            [component["zc_bond"] for bond in bonds for component in bond.__components],
+            per_cash_flow(spot_returns),
+            per_cash_flow(volatility_changes),
+            per_cash_flow(rate_shifts),
+        )
+        return np.add.reduceat(
+            cash_flow_prices,
+            np.concatenate(([0], np.cumsum(cash_flow_counts)[:-1])),
+            axis=0,
+        )
+
+    def cash_flows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The times in years and the amounts (coupons and nominal) of the cash flows of the bond (see `CurveRisk`)."""
+        times, amounts = zip(
+            *(component["zc_bond"].cash_flows() for component in self.__components)
+        )
+        return np.concatenate(times), np.concatenate(amounts)
+
     def ytm(self):
-        optimizer = Optimization(
-            pricing_function=lambda rate: self.compute_price(force_rate=rate),
-            target_value=self._price,
-            initial_value=0.01,
+        """Yield to maturity in the convention of the rate (the rate giving the price with `force_rate`)."""
+        times, amounts = self.cash_flows()
+        self._ytm = float(
+            _yields_to_maturity(
+                times[None, :],
+                amounts[None, :],
+                np.array([self.compute_price()]),
+                self.__rate.rate_type,
+            )[0]
         )
-        optim_res = optimizer.run()
-        if optim_res.status == 0:
-            self._ytm = optim_res["x"][0]
-        else:
-            warn("Error while optimzing", optim_res)
         return self._ytm
 
     def __run_components(self):
-        t = self.__maturity.maturity_in_years
-        terms = []
-        step = 1.0 / self.__nb_coupon
-        while t > 0:
-            terms.append(t)
-            t -= step
-        sorted(terms)
+        maturity = self.__maturity.maturity_in_years
+        # Integer number of coupon periods back from the maturity (as `BondPortfolio`), no rounding drift.
+        count = int(np.ceil(maturity * self.__nb_coupon - 1e-9))
+        terms = [maturity - period / self.__nb_coupon for period in range(count - 1, -1, -1)]
         freq_coupon = float(self.__coupon_rate) / self.__nb_coupon * self.__nominal
         coupons: List[Dict[str, Union[str, float, ZeroCouponBond]]] = [
             {
@@ -158,3 +276,96 @@ class Bond(ABCBond):
             for t in terms
         ]
         return coupons
+
+
+class BondPortfolio:
+    def __init__(
+        self,
+        rate: Rate,
+        nominals: Sequence[float],
+        coupon_rates: Sequence[float],
+        frequencies: Sequence[int],
+        maturities: Sequence[float],
+    ) -> None:
+        """Portfolio of fixed coupon bonds priced all at once.
+
+        The coupons of a bond are paid `frequency` times a year back from its maturity (with a short first period),
+        as in `Bond`. The cash flows of all the bonds are laid out in padded matrices (one row per bond, null
+        amounts as padding), discounted with a single `Rate.discount_factors` call. The yields to maturity are
+        solved by Newton steps on all the bonds together, in the convention of the rate as `Bond.ytm`.
+        The duration and the convexity are -1/P x dP/dy and 1/P x d2P/dy2 at the yield (Macaulay duration for a
+        continuous rate, modified duration for a compounded rate).
+
+        Args:
+            rate (Rate): The Rate object that will be used to discount the cash flows.
+            nominals (Sequence[float]): The nominals of the bonds.
+            coupon_rates (Sequence[float]): The annual coupon rates of the bonds.
+            frequencies (Sequence[int]): The numbers of coupons a year of the bonds.
+            maturities (Sequence[float]): The maturities of the bonds in years.
+        """
+        nominals, coupon_rates, maturities = (
+            np.asarray(values, dtype=float) for values in (nominals, coupon_rates, maturities)
+        )
+        frequencies = np.asarray(frequencies, dtype=int)
+        assert (
+            nominals.ndim == 1
+            and nominals.size > 0
+            and nominals.shape == coupon_rates.shape == frequencies.shape == maturities.shape
+        ), "Error provide as many nominals, coupon rates, frequencies and maturities (at least one bond)."
+        assert np.all(nominals > 0), "Error provide positive nominals."
+        assert np.all(maturities > 0) and np.all(frequencies > 0), "Error provide positive maturities and frequencies."
+        self.__rate = rate
+        counts = np.ceil(maturities * frequencies - 1e-9).astype(int)
+        # Number of coupon periods of every cash flow back from the maturity, negative for the padding.
+        periods = counts[:, None] - 1 - np.arange(counts.max())
+        padding = periods < 0
+        times = maturities[:, None] - periods / frequencies[:, None]
+        times[padding] = np.broadcast_to(maturities[:, None], times.shape)[padding]
+        amounts = np.where(padding, 0.0, (nominals * coupon_rates / frequencies)[:, None])
+        amounts[np.arange(counts.size), counts - 1] += nominals
+        self.__schedule = CashFlowSchedule(times, amounts)
+        self.__values: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def cash_flows(self) -> CashFlowSchedule:
+        """The padded cash flows of the bonds (see `CurveRisk` for their key rate DV01)."""
+        return self.__schedule
+
+    def __evaluate(self) -> Dict[str, np.ndarray]:
+        if self.__values is not None:
+            return self.__values
+        times, amounts = self.__schedule
+        prices = (amounts * self.__rate.discount_factors(times)).sum(axis=1)
+        yields = _yields_to_maturity(times, amounts, prices, self.__rate.rate_type)
+        if self.__rate.rate_type == "continuous":
+            values = amounts * np.exp(-yields[:, None] * times)
+            duration = (values * times).sum(axis=1) / prices
+            convexity = (values * times**2).sum(axis=1) / prices
+        else:
+            values = amounts * (1 + yields[:, None]) ** -times
+            duration = (values * times).sum(axis=1) / ((1 + yields) * prices)
+            convexity = (values * times * (times + 1)).sum(axis=1) / ((1 + yields) ** 2 * prices)
+        self.__values = {
+            "price": prices,
+            "ytm": yields,
+            "duration": duration,
+            "convexity": convexity,
+        }
+        return self.__values
+
+    @profiled
+    def compute_price(self) -> np.ndarray:
+        return self.__evaluate()["price"]
+
+    def ytm(self) -> np.ndarray:
+        return self.__evaluate()["ytm"]
+
+    def duration(self) -> np.ndarray:
+        return self.__evaluate()["duration"]
+
+    def convexity(self) -> np.ndarray:
+        return self.__evaluate()["convexity"]
+
+    def compute(self) -> Dict[str, np.ndarray]:
+        """The price, yield to maturity, duration and convexity of every bond, shape (n,) each."""
+        return dict(self.__evaluate())
@@ -0,0 +1,164 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from src.pricing.base.heston import (
+    HestonParameters,
+    calibrate_heston,
+    heston_fft_call_prices,
+    heston_prices,
+    shift_heston_volatility,
+)
+from src.pricing.base.option_base import OptionBase
+from src.pricing.base.rate import Rate
+from src.pricing.base.volatility import Volatility
+from src.utility.types import Maturity, OptionType
+from src.utility.profiling import profiled
+
+
+class HestonOption(OptionBase):
+    def __init__(
+        self,
+        spot_price: float,
+        strike_price: float,
+        maturity: Maturity,
+        rate: Rate,
+        volatility: Volatility,
+        option_type: OptionType,
+        dividend: Optional[float] = None,
+        parameters: Optional[HestonParameters] = None,
+    ) -> None:
+        """Vanilla option priced under the Heston stochastic volatility model by the Carr-Madan FFT.
+
+        Without `parameters`, the model is calibrated to the volatility on the moneyness grid of `calibrate_heston`
+        at the maturity of the option and at its quarter and half.
+        Theta is annual, vega and rho are for a 1% move as in `VanillaOption`. Delta and gamma are the exact
+        derivatives of the FFT prices (the price is homogeneous in the spot and the strike), so with a dividend
+        they are discounted by it. Vega is the move of a 1% shift of both the initial and the long term volatilities.
+        """
+        super().__init__(
+            spot_price, strike_price, maturity, rate, volatility, option_type, dividend
+        )
+        if option_type not in ("call", "put"):
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        self._calibration_error = 0.0
+        if parameters is None:
+            parameters, self._calibration_error = calibrate_heston(
+                volatility,
+                spot_price,
+                rate,
+                maturity.maturity_in_years * np.array([0.25, 0.5, 1.0]),
+                dividend=self._dividend,
+            )
+        self._parameters = parameters
+        self.__values: Optional[Dict[str, float]] = None
+
+    @property
+    def parameters(self) -> HestonParameters:
+        return self._parameters
+
+    @property
+    def calibration_error(self) -> float:
+        """Root mean square of the implied volatility errors of the calibration (0 with given parameters)."""
+        return self._calibration_error
+
+    def __price(self, calls: CubicSpline, maturity_in_years: float, rate: float) -> float:
+        """Price of the option from the FFT call prices (in units of the forward) of a maturity."""
+        forward = self._spot_price * np.exp((rate - self._dividend) * maturity_in_years)
+        price = np.exp(-rate * maturity_in_years) * forward * float(
+            calls(np.log(self._strike_price / forward))
+        )
+        if self._option_type == "put":
+            price -= np.exp(-rate * maturity_in_years) * (forward - self._strike_price)
+        return price
+
+    def __evaluate(self) -> Dict[str, float]:
+        """Price and greeks from one batched FFT on the maturity and its neighbours, and two for the vega."""
+        if self.__values is not None:
+            return self.__values
+        maturity = self._maturity.maturity_in_years
+        rate = self._domestic_rate.get_rate(self._maturity)
+        dividend_discount = np.exp(-self._dividend * maturity)
+        bump = min(1 / 365, 0.5 * maturity)
+        grid, calls = heston_fft_call_prices(
+            [maturity - bump, maturity, maturity + bump], self._parameters
+        )
+        splines = [CubicSpline(grid, row) for row in calls]
+        log_moneyness = np.log(
+            self._strike_price
+            / (self._spot_price * np.exp((rate - self._dividend) * maturity))
+        )
+        call, slope, curvature = (
+            float(splines[1](log_moneyness, order)) for order in range(3)
+        )
+        delta = dividend_discount * (call - slope)
+        rho = -maturity * self._spot_price * dividend_discount * slope
+        if self._option_type == "put":
+            delta -= dividend_discount
+            rho -= maturity * self._strike_price * np.exp(-rate * maturity)
+
+        vegas = []
+        for shift in (0.01, -0.01):
+            shifted_grid, shifted_calls = heston_fft_call_prices(
+                [maturity], shift_heston_volatility(self._parameters, shift)
+            )
+            vegas.append(
+                self.__price(CubicSpline(shifted_grid, shifted_calls[0]), maturity, rate)
+            )
+
+        self.__values = {
+            "price": self.__price(splines[1], maturity, rate),
+            "delta": delta,
+            "gamma": dividend_discount * (curvature - slope) / self._spot_price,
+            "theta": -(
+                self.__price(splines[2], maturity + bump, rate)
+                - self.__price(splines[0], maturity - bump, rate)
+            )
+            / (2 * bump),
+            "vega": (vegas[0] - vegas[1]) / 2,
+            "rho": rho / 100,
+        }
+        return self.__values
+
+    @profiled
+    def compute_price(self) -> float:
+        return self.__evaluate()["price"]
+
+    def compute_delta(self) -> float:
+        return self.__evaluate()["delta"]
+
+    def compute_gamma(self) -> float:
+        return self.__evaluate()["gamma"]
+
+    def compute_theta(self) -> float:
+        return self.__evaluate()["theta"]
+
+    def compute_vega(self) -> float:
+        return self.__evaluate()["vega"]
+
+    def compute_rho(self) -> float:
+        return self.__evaluate()["rho"]
+
+    def compute_greeks(self) -> Dict[str, float]:
+        values = self.__evaluate()
+        return {name: values[name] for name in ("delta", "gamma", "theta", "vega", "rho")}
+
+    def compute_chain(self, strike_prices: Sequence[float]) -> np.ndarray:
+        """Prices of the option for a whole chain of strikes (same maturity and type) in one FFT.
+
+        Args:
+            strike_prices (Sequence[float]): The strikes.
+
+        Returns:
+            np.ndarray: The prices, shape (len(strike_prices),).
+        """
+        return heston_prices(
+            self._spot_price,
+            np.asarray(strike_prices, dtype=float),
+            [self._maturity.maturity_in_years],
+            [self._domestic_rate.get_rate(self._maturity)],
+            self._dividend,
+            self._parameters,
+            self._option_type == "call",
+        )[0]
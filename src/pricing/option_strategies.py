@@ -1,9 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.pricing.base.black_scholes import (
+    ArrayLike,
+    GREEKS,
+    black_scholes_price,
+    black_scholes_price_and_greeks,
+    lookup_rates,
+    lookup_volatilities,
+)
+from src.pricing.base.profile import build_profile
+from src.pricing.base.scenario import build_scenario_grid
 from src.pricing.base.rate import Rate
 from src.pricing.base.volatility import Volatility
-from src.pricing.vanilla_options import VanillaOption
-from src.utility.types import Maturity
+from src.utility.constants import VOLATILITY_FLOOR
+from src.utility.metrics import record_cache_lookup
+from src.utility.types import Maturity, OptionType
+from src.utility.profiling import profiled
+
+# (quantity, option type, strike price), a negative quantity is a short position.
+Leg = Tuple[float, OptionType, float]
 
 
 class OptionStrategy(ABC):
@@ -28,75 +46,254 @@ class OptionStrategy(ABC):
         pass
 
 
-class StraddleStrategy(OptionStrategy):
+class MultiLegStrategy(OptionStrategy):
     def __init__(
         self,
         spot_price: float,
-        strike_price: float,
+        legs: List[Leg],
         maturity: Maturity,
         rate: Rate,
         volatility: Volatility,
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
     ) -> None:
-        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
-        self._strike_price = strike_price
+        """Strategy made of any number of vanilla legs sharing the same underlying and maturity.
 
-    def compute_price(self) -> float:
-        return (
-            VanillaOption(
+        All the legs are priced as one vectorized batch (a single rate lookup and one volatility
+        lookup per leg), the price and the greeks of the strategy are the dot product of the
+        quantities with the leg values.
+
+        Args:
+            spot_price (float): The spot price of the underlying.
+            legs (List[Leg]): The (quantity, option type, strike price) of every leg.
+            maturity (Maturity): The maturity object representing the Maturity of the options.
+            rate (Rate): The rate used to discount the options.
+            volatility (Volatility): The volatility (flat or surface) of the underlying.
+            dividend (Optional[float], optional): The dividend yield. Defaults to None.
+            foreign_rate (Optional[Rate], optional): The foreign rate for FX options. Defaults to None.
+        """
+        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
+        if len(legs) == 0:
+            raise ValueError("Error provide at least one leg.")
+        for _, option_type, _ in legs:
+            if option_type not in ("call", "put"):
+                raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        self._legs = legs
+        self._quantities = np.array([quantity for quantity, _, _ in legs], dtype=float)
+        self._is_call = np.array([option_type == "call" for _, option_type, _ in legs])
+        self._strike_prices = np.array([strike for _, _, strike in legs], dtype=float)
+        self.__leg_values: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def legs(self) -> List[Leg]:
+        return self._legs
+
+    def compute_leg_values(self) -> Dict[str, np.ndarray]:
+        """Price and greeks of every leg (for one unit), computed once and cached.
+
+        Returns:
+            Dict[str, np.ndarray]: The price, delta, gamma, theta, vega and rho arrays, one value per leg.
+        """
+        record_cache_lookup("multi-leg-strategy-legs", self.__leg_values is not None)
+        if self.__leg_values is None:
+            maturity_in_years = self._maturity.maturity_in_years
+            self.__leg_values = black_scholes_price_and_greeks(
                 self._spot_price,
-                self._strike_price,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
+                self._strike_prices,
+                maturity_in_years,
+                self._rate.get_rate(self._maturity),
                 self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-            + VanillaOption(
-                self._spot_price,
-                self._strike_price,
-                self._maturity,
-                self._rate,
+                lookup_volatilities(
+                    self._volatility,
+                    self._strike_prices / self._spot_price,
+                    maturity_in_years,
+                ),
+                self._is_call,
+            )
+        return self.__leg_values
+
+    @profiled
+    def compute_price(self) -> float:
+        return float(self._quantities @ self.compute_leg_values()["price"])
+
+    @profiled
+    def compute_greeks(self) -> Dict[str, float]:
+        leg_values = self.compute_leg_values()
+        return {greek: float(self._quantities @ leg_values[greek]) for greek in GREEKS}
+
+    def __evaluate(
+        self,
+        spot_prices: np.ndarray,
+        maturities_in_years: np.ndarray,
+        volatility_shift: ArrayLike = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        # The legs are stacked on a leading axis and summed with the quantities.
+        strike_prices = self._strike_prices.reshape(-1, 1, 1)
+        leg_values = black_scholes_price_and_greeks(
+            spot_prices,
+            strike_prices,
+            maturities_in_years,
+            lookup_rates(self._rate, maturities_in_years),
+            self._dividend,
+            lookup_volatilities(
                 self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
+                strike_prices / spot_prices,
+                maturities_in_years,
+                volatility_shift,
+            ),
+            self._is_call.reshape(-1, 1, 1),
         )
-    def compute_greeks(self):
-        call_option = VanillaOption(
+        return {
+            name: np.tensordot(self._quantities, values, axes=1)
+            for name, values in leg_values.items()
+        }
+
+    @profiled
+    def compute_profile(
+        self,
+        spot_prices: Sequence[float],
+        horizons: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Price and greeks of the strategy over a spot grid (payoff and P&L diagrams), every leg and
+        every point being evaluated in one vectorized call.
+
+        Args:
+            spot_prices (Sequence[float]): The spot prices of the underlying.
+            horizons (Optional[Sequence[float]], optional): The horizons in years from today, the maturity gives the payoff. Defaults to None (today only).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks arrays of shape (len(horizons), len(spot_prices)), or (len(spot_prices),) without horizons.
+        """
+        return build_profile(
+            self.__evaluate,
             self._spot_price,
-            self._strike_price,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "call",
-            self._dividend,
-            self._foreign_rate,
+            spot_prices,
+            self._maturity.maturity_in_years,
+            horizons,
         )
-        put_option = VanillaOption(
+
+    @profiled
+    def compute_scenarios(
+        self,
+        spot_shifts: Sequence[float],
+        volatility_shifts: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """Revalue the strategy on a spot shift x volatility shift grid (risk limits heatmaps), every leg and
+        every scenario being evaluated in one vectorized call.
+
+        Args:
+            spot_shifts (Sequence[float]): The relative spot shifts (0.05 is +5%).
+            volatility_shifts (Sequence[float]): The absolute volatility shifts (0.01 is +1 volatility point).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks matrices of shape (len(spot_shifts), len(volatility_shifts)).
+        """
+        return build_scenario_grid(
+            self.__evaluate,
             self._spot_price,
-            self._strike_price,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "put",
-            self._dividend,
-            self._foreign_rate,
+            spot_shifts,
+            volatility_shifts,
+            self._maturity.maturity_in_years,
         )
 
-        call_greeks = call_option.compute_greeks()
-        put_greeks = put_option.compute_greeks()
+    @classmethod
+    def revalue(
+        cls,
+        strategies: Sequence["MultiLegStrategy"],
+        spot_returns: np.ndarray,
+        volatility_changes: np.ndarray,
+        rate_shifts: np.ndarray,
+    ) -> np.ndarray:
+        """Full revaluation of many strategies (of any kind) on market shocks, the legs of all the
+        strategies are stacked and revalued in one vectorized pass (historical VaR).
 
-        combined_greeks = {
-            greek: call_greeks[greek] + put_greeks[greek] for greek in call_greeks
-        }
-        
-        return combined_greeks
+        The volatility of every leg is looked up once at its current moneyness (sticky strike) and then
+        shocked, the rate shocks are parallel shifts of the rate.
+
+        Args:
+            strategies (Sequence[MultiLegStrategy]): The strategies to revalue.
+            spot_returns (np.ndarray): The relative spot shocks, shape (len(strategies), n_scenarios).
+            volatility_changes (np.ndarray): The absolute volatility shocks, broadcastable with the spot shocks.
+            rate_shifts (np.ndarray): The absolute rate shocks, broadcastable with the spot shocks.
 
-class StrangleStrategy(OptionStrategy):
+        Returns:
+            np.ndarray: The prices, shape (len(strategies), n_scenarios).
+        """
+        leg_counts = np.array([len(strategy._legs) for strategy in strategies])
+
+        def per_leg(values: np.ndarray) -> np.ndarray:
+            values = np.asarray(values, dtype=float)
+            if values.ndim < 2 or values.shape[0] == 1:
+                return values
+            return np.repeat(values, leg_counts, axis=0)
+
+        strike_prices = np.concatenate(
+            [strategy._strike_prices for strategy in strategies]
+        )[:, None]
+        spot_prices = np.repeat(
+            [strategy._spot_price for strategy in strategies], leg_counts
+        )[:, None]
+        maturities = np.repeat(
+            [strategy._maturity.maturity_in_years for strategy in strategies],
+            leg_counts,
+        )[:, None]
+        volatilities = np.concatenate(
+            [
+                lookup_volatilities(
+                    strategy._volatility,
+                    strategy._strike_prices / strategy._spot_price,
+                    strategy._maturity.maturity_in_years,
+                )
+                for strategy in strategies
+            ]
+        )[:, None]
+        leg_prices = black_scholes_price(
+            spot_prices * (1 + per_leg(spot_returns)),
+            strike_prices,
+            maturities,
+            np.repeat(
+                [strategy._rate.get_rate(strategy._maturity) for strategy in strategies],
+                leg_counts,
+            )[:, None]
+            + per_leg(rate_shifts),
+            np.repeat([strategy._dividend for strategy in strategies], leg_counts)[
+                :, None
+            ],
+            np.maximum(volatilities + per_leg(volatility_changes), VOLATILITY_FLOOR),
+            np.concatenate([strategy._is_call for strategy in strategies])[:, None],
+        )
+        quantities = np.concatenate([strategy._quantities for strategy in strategies])
+        return np.add.reduceat(
+            quantities[:, None] * leg_prices,
+            np.concatenate(([0], np.cumsum(leg_counts)[:-1])),
+            axis=0,
+        )
+
+
+class StraddleStrategy(MultiLegStrategy):
+    def __init__(
+        self,
+        spot_price: float,
+        strike_price: float,
+        maturity: Maturity,
+        rate: Rate,
+        volatility: Volatility,
+        dividend: Optional[float] = None,
+        foreign_rate: Optional[Rate] = None,
+    ) -> None:
+        super().__init__(
+            spot_price,
+            [(1.0, "put", strike_price), (1.0, "call", strike_price)],
+            maturity,
+            rate,
+            volatility,
+            dividend,
+            foreign_rate,
+        )
+        self._strike_price = strike_price
+
+
+class StrangleStrategy(MultiLegStrategy):
     def __init__(
         self,
         spot_price: float,
@@ -118,70 +315,23 @@ class StrangleStrategy(OptionStrategy):
             rate (Rate): _description_
             volatility (Volatility): _description_
         """
-        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
         assert (
             strike_price1 < strike_price2
         ), "Error provide strike_price1 < strike_price2."
+        super().__init__(
+            spot_price,
+            [(1.0, "put", strike_price2), (1.0, "call", strike_price1)],
+            maturity,
+            rate,
+            volatility,
+            dividend,
+            foreign_rate,
+        )
         self._strike_price1 = strike_price1
         self._strike_price2 = strike_price2
 
-    def compute_price(self) -> float:
-        return (
-            VanillaOption(
-                self._spot_price,
-                self._strike_price2,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-            + VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-        )
-
-    def compute_greeks(self):
-        lower_strike_call = VanillaOption(
-            self._spot_price,
-            self._strike_price1,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "call",
-            self._dividend,
-            self._foreign_rate,
-        )
-        higher_strike_put = VanillaOption(
-            self._spot_price,
-            self._strike_price2,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "put",
-            self._dividend,
-            self._foreign_rate,
-        )
-
-        call_greeks = lower_strike_call.compute_greeks()
-        put_greeks = higher_strike_put.compute_greeks()
-
-        combined_greeks = {
-            greek: call_greeks[greek] + put_greeks[greek] for greek in call_greeks
-        }
-        
-        return combined_greeks
-
 
-class ButterflyStrategy(OptionStrategy):
+class ButterflyStrategy(MultiLegStrategy):
     def __init__(
         self,
         spot_price: float,
@@ -194,92 +344,28 @@ class ButterflyStrategy(OptionStrategy):
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
     ) -> None:
-        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
         assert (
             strike_price1 < strike_price2 < strike_price3
         ), "Error provide strike_price1 < strike_price2 < strike_price3."
+        super().__init__(
+            spot_price,
+            [
+                (1.0, "call", strike_price1),
+                (-2.0, "call", strike_price2),
+                (1.0, "call", strike_price3),
+            ],
+            maturity,
+            rate,
+            volatility,
+            dividend,
+            foreign_rate,
+        )
         self._strike_price1 = strike_price1
         self._strike_price2 = strike_price2
         self._strike_price3 = strike_price3
 
-    def compute_price(self) -> float:
-        return (
-            VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-            - 2
-            * VanillaOption(
-                self._spot_price,
-                self._strike_price2,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-            ).compute_price()
-            + VanillaOption(
-                self._spot_price,
-                self._strike_price3,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-        )
 
-    def compute_greeks(self):
-            long_call_low = VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            )
-            short_call_mid = VanillaOption(
-                self._spot_price,
-                self._strike_price2,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            )
-            long_call_high = VanillaOption(
-                self._spot_price,
-                self._strike_price3,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            )
-
-            low_greeks = long_call_low.compute_greeks()
-            mid_greeks = short_call_mid.compute_greeks()
-            high_greeks = long_call_high.compute_greeks()
-
-            combined_greeks = {
-                greek: low_greeks[greek] - 2 * mid_greeks[greek] + high_greeks[greek] for greek in low_greeks
-            }
-            
-            return combined_greeks
-
-
-class CallSpreadStrategy(OptionStrategy):
+class CallSpreadStrategy(MultiLegStrategy):
     def __init__(
         self,
         spot_price: float,
@@ -291,69 +377,23 @@ class CallSpreadStrategy(OptionStrategy):
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
     ) -> None:
-        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
         assert (
             lower_strike < upper_strike
         ), "Error: lower strike must be less than upper strike."
+        super().__init__(
+            spot_price,
+            [(1.0, "call", lower_strike), (-1.0, "call", upper_strike)],
+            maturity,
+            rate,
+            volatility,
+            dividend,
+            foreign_rate,
+        )
         self._lower_strike = lower_strike
         self._upper_strike = upper_strike
 
-    def compute_price(self) -> float:
-        return (
-            VanillaOption(
-                self._spot_price,
-                self._lower_strike,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                option_type="call",
-                dividend=self._dividend,
-                foreign_rate=self._foreign_rate,
-            ).compute_price()
-            - VanillaOption(
-                self._spot_price,
-                self._upper_strike,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-        )
-
-    def compute_greeks(self):
-        long_call = VanillaOption(
-            self._spot_price,
-            self._lower_strike,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "call",
-            self._dividend,
-            self._foreign_rate,
-        )
-        short_call = VanillaOption(
-            self._spot_price,
-            self._upper_strike,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "call",
-            self._dividend,
-            self._foreign_rate,
-        )
-
-        long_call_greeks = long_call.compute_greeks()
-        short_call_greeks = short_call.compute_greeks()
-
-        combined_greeks = {
-            greek: long_call_greeks[greek] - short_call_greeks[greek] for greek in long_call_greeks
-        }
-        
-        return combined_greeks
 
-class PutSpreadStrategy(OptionStrategy):
+class PutSpreadStrategy(MultiLegStrategy):
     def __init__(
         self,
         spot_price: float,
@@ -365,70 +405,23 @@ class PutSpreadStrategy(OptionStrategy):
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
     ) -> None:
-        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
         assert (
             lower_strike < upper_strike
         ), "Error: lower strike must be less than upper strike."
+        super().__init__(
+            spot_price,
+            [(1.0, "put", upper_strike), (-1.0, "put", lower_strike)],
+            maturity,
+            rate,
+            volatility,
+            dividend,
+            foreign_rate,
+        )
         self._lower_strike = lower_strike
         self._upper_strike = upper_strike
 
-    def compute_price(self) -> float:
-        return (
-            VanillaOption(
-                self._spot_price,
-                self._upper_strike,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-            - VanillaOption(
-                self._spot_price,
-                self._lower_strike,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-        )
-        
-    def compute_greeks(self):
-        long_put = VanillaOption(
-            self._spot_price,
-            self._upper_strike,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "put",
-            self._dividend,
-            self._foreign_rate,
-        )
-        short_put = VanillaOption(
-            self._spot_price,
-            self._lower_strike,
-            self._maturity,
-            self._rate,
-            self._volatility,
-            "put",
-            self._dividend,
-            self._foreign_rate,
-        )
-
-        long_put_greeks = long_put.compute_greeks()
-        short_put_greeks = short_put.compute_greeks()
-
-        combined_greeks = {
-            greek: long_put_greeks[greek] - short_put_greeks[greek] for greek in long_put_greeks
-        }
-        
-        return combined_greeks
 
-
-class StripStrategy(OptionStrategy):
+class StripStrategy(MultiLegStrategy):
     def __init__(
         self,
         spot_price: float,
@@ -440,82 +433,37 @@ class StripStrategy(OptionStrategy):
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
     ) -> None:
-        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
+        """Strip: long one call and two puts (bearish straddle).
+
+        Args:
+            spot_price (float): The spot price of the underlying.
+            strike_price1 (float): The strike of the call and of the first put.
+            strike_price2 (float): The strike of the second put.
+            maturity (Maturity): The maturity object representing the Maturity of the options.
+            rate (Rate): The rate used to discount the options.
+            volatility (Volatility): The volatility of the underlying.
+        """
         assert (
             strike_price1 < strike_price2
         ), "Error provide strike_price1 < strike_price2."
+        super().__init__(
+            spot_price,
+            [
+                (1.0, "call", strike_price1),
+                (1.0, "put", strike_price1),
+                (1.0, "put", strike_price2),
+            ],
+            maturity,
+            rate,
+            volatility,
+            dividend,
+            foreign_rate,
+        )
         self._strike_price1 = strike_price1
         self._strike_price2 = strike_price2
 
-    def compute_price(self) -> float:
-        return (
-            2
-            * VanillaOption(
-                self._spot_price,
-                self._strike_price2,
-                maturity=self._maturity,
-                rate=self._rate,
-                dividend=self._dividend,
-                volatility=self._volatility,
-                foreign_rate=self._foreign_rate,
-                option_type="put",
-            ).compute_price()
-            - VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                rate=self._rate,
-                volatility=self._volatility,
-                option_type="put",
-                dividend=self._dividend,
-                foreign_rate=self._foreign_rate,
-            ).compute_price()
-        )
-
-    def compute_greeks(self):
-    
-            call_option = VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            )
-            put_option1 = VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
-                self._dividend,
-                self._foreign_rate,
-            )
-            put_option2 = VanillaOption(
-                self._spot_price,
-                self._strike_price2,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
-                self._dividend,
-                self._foreign_rate,
-            )
-
-            call_greeks = call_option.compute_greeks()
-            put_greeks1 = put_option1.compute_greeks()
-            put_greeks2 = put_option2.compute_greeks()
 
-            combined_greeks = {
-                greek: call_greeks[greek] + put_greeks1[greek] + put_greeks2[greek] for greek in call_greeks
-            }
-            
-            return combined_greeks
-
-class StrapStrategy(OptionStrategy):
+class StrapStrategy(MultiLegStrategy):
     def __init__(
         self,
         spot_price: float,
@@ -527,76 +475,31 @@ class StrapStrategy(OptionStrategy):
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
     ) -> None:
-        super().__init__(spot_price, maturity, rate, volatility, dividend, foreign_rate)
+        """Strap: long two calls and one put (bullish straddle).
+
+        Args:
+            spot_price (float): The spot price of the underlying.
+            strike_price1 (float): The strike of the put and of the first call.
+            strike_price2 (float): The strike of the second call.
+            maturity (Maturity): The maturity object representing the Maturity of the options.
+            rate (Rate): The rate used to discount the options.
+            volatility (Volatility): The volatility of the underlying.
+        """
         assert (
             strike_price1 < strike_price2
         ), "Error provide strike_price1 < strike_price2."
+        super().__init__(
+            spot_price,
+            [
+                (1.0, "call", strike_price1),
+                (1.0, "call", strike_price2),
+                (1.0, "put", strike_price1),
+            ],
+            maturity,
+            rate,
+            volatility,
+            dividend,
+            foreign_rate,
+        )
         self._strike_price1 = strike_price1
         self._strike_price2 = strike_price2
-
-    def compute_price(self) -> float:
-        return (
-            VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-            - 2
-            * VanillaOption(
-                self._spot_price,
-                self._strike_price2,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
-                self._dividend,
-                self._foreign_rate,
-            ).compute_price()
-        )
-
-    def compute_greeks(self):
-            call_option1 = VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            )
-            call_option2 = VanillaOption(
-                self._spot_price,
-                self._strike_price2,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "call",
-                self._dividend,
-                self._foreign_rate,
-            )
-            put_option = VanillaOption(
-                self._spot_price,
-                self._strike_price1,
-                self._maturity,
-                self._rate,
-                self._volatility,
-                "put",
-                self._dividend,
-                self._foreign_rate,
-            )
-
-            call_greeks1 = call_option1.compute_greeks()
-            call_greeks2 = call_option2.compute_greeks()
-            put_greeks = put_option.compute_greeks()
-
-            combined_greeks = {
-                greek: call_greeks1[greek] + call_greeks2[greek] + put_greeks[greek] for greek in call_greeks1
-            }
-            
-            return combined_greeks
\ No newline at end of file
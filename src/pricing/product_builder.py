@@ -0,0 +1,427 @@
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+from scipy.special import ndtr
+
+from src.pricing.base.black_scholes import (
+    black_scholes_price_and_greeks,
+    lookup_volatilities,
+)
+from src.pricing.base.monte_carlo import monte_carlo_valuation
+from src.pricing.base.rate import Rate
+from src.pricing.base.structured_products_base import StructuredProductBase
+from src.pricing.base.volatility import Volatility
+from src.utility.metrics import record_cache_lookup
+from src.utility.profiling import profiled
+from src.utility.types import (
+    BarrierDirection,
+    BarrierType,
+    Maturity,
+    OptionType,
+    ProductKindType,
+)
+
+GREEK_NAMES = ("delta", "gamma", "theta", "rho", "vega")
+
+
+class BondComponent(NamedTuple):
+    """Zero-coupon bond paying 1 at the maturity of the product.
+
+    Attributes:
+        weight (float): The nominal of the bond, negative for a short position.
+    """
+
+    weight: float = 1.0
+
+
+class VanillaComponent(NamedTuple):
+    """European vanilla option on the underlying of the product.
+
+    Attributes:
+        strike_price (float): The strike price.
+        option_type (OptionType): 'call' or 'put'.
+        weight (float): The number of options, negative for a short position.
+    """
+
+    strike_price: float
+    option_type: OptionType
+    weight: float = 1.0
+
+
+class DigitalComponent(NamedTuple):
+    """Cash-or-nothing digital option paying 1 at maturity when it ends in the money.
+
+    Attributes:
+        strike_price (float): The strike price.
+        option_type (OptionType): 'call' (pays above the strike) or 'put' (pays below the strike).
+        weight (float): The cash paid, negative for a short position.
+    """
+
+    strike_price: float
+    option_type: OptionType
+    weight: float = 1.0
+
+
+class BarrierComponent(NamedTuple):
+    """Barrier option on the underlying of the product, the barrier is monitored on the time steps of the simulation.
+
+    Attributes:
+        strike_price (float): The strike price.
+        option_type (OptionType): 'call' or 'put'.
+        barrier_level (float): The barrier level.
+        barrier_type (BarrierType): 'ko' (knock-out) or 'ki' (knock-in).
+        barrier_direction (BarrierDirection): 'up' or 'down'.
+        weight (float): The number of options, negative for a short position.
+    """
+
+    strike_price: float
+    option_type: OptionType
+    barrier_level: float
+    barrier_type: BarrierType
+    barrier_direction: BarrierDirection
+    weight: float = 1.0
+
+
+Component = Union[BondComponent, VanillaComponent, DigitalComponent, BarrierComponent]
+
+
+class _PricingContext(NamedTuple):
+    """Market of the product and settings of the simulation shared by the evaluations of the components."""
+
+    rate: Rate
+    maturity: Maturity
+    spot_price: float
+    volatility: Volatility
+    dividend: float
+    num_paths: int
+    num_steps: int
+    seed: Optional[int]
+
+
+def _option_signs(components: Sequence[Component]) -> np.ndarray:
+    if any(component.option_type not in ("call", "put") for component in components):
+        raise ValueError("Option type not supported. Use 'call' or 'put'.")
+    return np.array([1.0 if component.option_type == "call" else -1.0 for component in components])
+
+
+def _weighted_sum(values: Dict[str, np.ndarray], weights: np.ndarray) -> Dict[str, float]:
+    return {name: float(np.dot(weights, value)) for name, value in values.items()}
+
+
+def _evaluate_bonds(
+    context: _PricingContext, components: Sequence[BondComponent]
+) -> Dict[str, float]:
+    """Zero-coupon bonds, the theta and the rho are the ones of the continuous zero rate of the maturity."""
+    maturity_in_years = context.maturity.maturity_in_years
+    nominal = sum(component.weight for component in components)
+    price = nominal * context.rate.discount_factor(context.maturity)
+    return {
+        "price": price,
+        "delta": 0.0,
+        "gamma": 0.0,
+        "theta": context.rate.get_rate(context.maturity) * price,
+        "rho": -maturity_in_years * price / 100,
+        "vega": 0.0,
+    }
+
+
+def _evaluate_vanillas(
+    context: _PricingContext, components: Sequence[VanillaComponent]
+) -> Dict[str, float]:
+    """Vanilla options in one vectorized Black-Scholes evaluation (conventions of `VanillaOption`)."""
+    maturity_in_years = context.maturity.maturity_in_years
+    strike_prices = np.array([component.strike_price for component in components])
+    values = black_scholes_price_and_greeks(
+        context.spot_price,
+        strike_prices,
+        maturity_in_years,
+        context.rate.get_rate(context.maturity),
+        context.dividend,
+        lookup_volatilities(
+            context.volatility, strike_prices / context.spot_price, maturity_in_years
+        ),
+        _option_signs(components) > 0,
+    )
+    return _weighted_sum(values, np.array([component.weight for component in components]))
+
+
+def _evaluate_digitals(
+    context: _PricingContext, components: Sequence[DigitalComponent]
+) -> Dict[str, float]:
+    """Cash-or-nothing digital options in one vectorized evaluation of the closed forms (same conventions as
+    the vanilla options: the vega and the rho are expressed for a 1% move, the theta per year)."""
+    tau = context.maturity.maturity_in_years
+    spot_price = context.spot_price
+    rate = context.rate.get_rate(context.maturity)
+    strike_prices = np.array([component.strike_price for component in components])
+    sign = _option_signs(components)
+    sigma = lookup_volatilities(context.volatility, strike_prices / spot_price, tau)
+    log_moneyness = np.log(spot_price / strike_prices)
+    drift = rate - context.dividend - 0.5 * sigma**2
+    vol_sqrt_maturity = sigma * np.sqrt(tau)
+    d2 = (log_moneyness + drift * tau) / vol_sqrt_maturity
+    d1 = d2 + vol_sqrt_maturity
+    discount = np.exp(-rate * tau)
+    price = discount * ndtr(sign * d2)
+    # Sensitivity of the price to d2.
+    density = sign * discount * np.exp(-0.5 * d2**2) / np.sqrt(2 * np.pi)
+
+    values = {
+        "price": price,
+        "delta": density / (spot_price * vol_sqrt_maturity),
+        "gamma": -density * d1 / (spot_price**2 * sigma**2 * tau),
+        "theta": rate * price
+        - density * (drift - log_moneyness / tau) / (2 * vol_sqrt_maturity),
+        "rho": (density * np.sqrt(tau) / sigma - tau * price) / 100,
+        "vega": -density * d1 / sigma / 100,
+    }
+    return _weighted_sum(values, np.array([component.weight for component in components]))
+
+
+def _evaluate_barriers(
+    context: _PricingContext, components: Sequence[BarrierComponent]
+) -> Dict[str, float]:
+    """Barrier options by Monte Carlo: every barrier component is paid on the same paths, the running extremes
+    of the paths are computed once per chunk. The volatility is the at the money term structure."""
+    sign = _option_signs(components)
+    if any(component.barrier_type not in ("ko", "ki") for component in components):
+        raise ValueError("Barrier type not supported. Use 'ko' or 'ki'.")
+    if any(component.barrier_direction not in ("up", "down") for component in components):
+        raise ValueError("Barrier direction not supported. Use 'up' or 'down'.")
+    spot_price = context.spot_price
+    # Strikes and barriers in percentage of the spot, the paths are simulated as performances.
+    strikes = np.array([component.strike_price for component in components]) / spot_price
+    barriers = np.array([component.barrier_level for component in components]) / spot_price
+    is_up = np.array([component.barrier_direction == "up" for component in components])
+    is_knock_in = np.array([component.barrier_type == "ki" for component in components])
+    weights = np.array([component.weight for component in components])
+
+    def discounted_payoffs(performances: np.ndarray, discount_factors: np.ndarray) -> np.ndarray:
+        highest = performances.max(axis=-1)[..., None]
+        lowest = performances.min(axis=-1)[..., None]
+        touched = np.where(is_up, highest >= barriers, lowest <= barriers)
+        active = touched == is_knock_in
+        intrinsic = np.maximum(sign * (performances[..., -1:] - strikes), 0.0)
+        return (active * intrinsic) @ weights * discount_factors[..., -1]
+
+    maturity_in_years = context.maturity.maturity_in_years
+    valuation = monte_carlo_valuation(
+        discounted_payoffs,
+        context.rate,
+        [context.volatility],
+        [context.dividend],
+        np.ones((1, 1)),
+        np.array([spot_price]),
+        np.array([spot_price]),
+        maturity_in_years * np.arange(1, context.num_steps + 1) / context.num_steps,
+        num_paths=context.num_paths,
+        seed=context.seed,
+        monitoring_grid=True,
+    )
+    # The valuation is per unit of performance, the delta and the gamma per relative move of the spot.
+    return {
+        "price": spot_price * valuation["price"],
+        "delta": valuation["delta"],
+        "gamma": valuation["gamma"] / spot_price,
+        "theta": spot_price * valuation["theta"],
+        "rho": spot_price * valuation["rho"],
+        "vega": spot_price * valuation["vega"],
+    }
+
+
+# Batch evaluation of each kind of component, the components of a kind are priced together. Adding a kind of
+# component only needs an evaluator here.
+_COMPONENT_EVALUATORS: Dict[
+    Type[Component], Callable[[_PricingContext, Sequence[Component]], Dict[str, float]]
+] = {
+    BondComponent: _evaluate_bonds,
+    VanillaComponent: _evaluate_vanillas,
+    DigitalComponent: _evaluate_digitals,
+    BarrierComponent: _evaluate_barriers,
+}
+
+
+class ComposedProduct(StructuredProductBase):
+    def __init__(
+        self,
+        rate: Rate,
+        maturity: Maturity,
+        spot_price: float,
+        volatility: Volatility,
+        components: Sequence[Component],
+        dividend: Optional[float] = None,
+        product_type: Optional[ProductKindType] = None,
+    ) -> None:
+        """Product defined as a weighted combination of reusable components (zero-coupon bonds, vanilla, digital and
+        barrier options) on one underlying and with one maturity.
+
+        The components are grouped by kind and each group is priced in one batch evaluation: the bonds from one
+        discount factor, the vanilla and the digital options in one vectorized evaluation of their closed forms and
+        the barrier options on one set of Monte Carlo paths. The price and the greeks of the product are the
+        weighted sums of the ones of its components, the conventions are the ones of `VanillaOption`.
+
+        Args:
+            rate (Rate): The rate object (flat or curve).
+            maturity (Maturity): The maturity of the product and of all its components.
+            spot_price (float): The spot price of the underlying.
+            volatility (Volatility): The volatility object (flat or surface).
+            components (Sequence[Component]): The components of the product with their weights.
+            dividend (Optional[float], optional): The dividend yield. Defaults to None.
+            product_type (Optional[ProductKindType], optional): The kind of the product for the built-in definitions. Defaults to None.
+        """
+        super().__init__(product_type)
+        assert len(components) > 0, "Error provide at least one component."
+        assert spot_price > 0, "Error provide a positive spot price."
+        assert maturity.maturity_in_years > 0, "Error provide a positive maturity."
+        self.rate = rate
+        self.maturity = maturity
+        self.spot_price = spot_price
+        self.volatility = volatility
+        self.dividend = dividend if dividend is not None else 0.0
+        self.__groups: Dict[Type[Component], List[Component]] = defaultdict(list)
+        for component in components:
+            if type(component) not in _COMPONENT_EVALUATORS:
+                raise ValueError(
+                    f"Component {type(component).__name__} not supported. Use "
+                    f"{', '.join(klass.__name__ for klass in _COMPONENT_EVALUATORS)}."
+                )
+            self.__groups[type(component)].append(component)
+        self.__valuations: Dict[Tuple[int, int, Optional[int]], Dict[str, float]] = {}
+
+    @property
+    def components(self) -> List[Component]:
+        return [component for group in self.__groups.values() for component in group]
+
+    def __valuation(self, num_paths: int, num_steps: int, seed: Optional[int]) -> Dict[str, float]:
+        key = (num_paths, num_steps, seed)
+        record_cache_lookup("composed-product-valuation", key in self.__valuations)
+        if key not in self.__valuations:
+            context = _PricingContext(
+                self.rate,
+                self.maturity,
+                self.spot_price,
+                self.volatility,
+                self.dividend,
+                num_paths,
+                num_steps,
+                seed,
+            )
+            valuation = dict.fromkeys(("price",) + GREEK_NAMES, 0.0)
+            for klass, components in self.__groups.items():
+                for name, value in _COMPONENT_EVALUATORS[klass](context, components).items():
+                    valuation[name] += value
+            self.__valuations[key] = valuation
+        return self.__valuations[key]
+
+    @profiled
+    def compute_price(
+        self, num_paths: int = 20_000, num_steps: int = 500, seed: Optional[int] = None
+    ) -> float:
+        """Price the product, the simulation settings are only used by the barrier components.
+
+        Args:
+            num_paths (int, optional): The number of paths of the barrier components. Defaults to 20_000.
+            num_steps (int, optional): The number of monitoring dates of the barriers. Defaults to 500.
+            seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+        Returns:
+            float: The price of the product.
+        """
+        return self.__valuation(num_paths, num_steps, seed)["price"]
+
+    @profiled
+    def compute_greeks(
+        self, num_paths: int = 20_000, num_steps: int = 500, seed: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Greeks of the product, the sums of the weighted greeks of its components (the ones of the barrier
+        components are finite differences on the paths of the price).
+
+        Args:
+            num_paths (int, optional): The number of paths of the barrier components. Defaults to 20_000.
+            num_steps (int, optional): The number of monitoring dates of the barriers. Defaults to 500.
+            seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+        Returns:
+            Dict[str, float]: The delta, gamma, theta, rho and vega.
+        """
+        valuation = self.__valuation(num_paths, num_steps, seed)
+        return {greek: valuation[greek] for greek in GREEK_NAMES}
+
+
+def capital_protected_note(
+    rate: Rate,
+    maturity: Maturity,
+    spot_price: float,
+    volatility: Volatility,
+    protection: float = 1.0,
+    participation: float = 1.0,
+    cap: Optional[float] = None,
+    dividend: Optional[float] = None,
+) -> ComposedProduct:
+    """Capital protected note on 100 of nominal: the holder receives at maturity `protection` x 100 plus the
+    participation in the rise of the underlying, capped at `cap` whether given. It is a zero-coupon bond and
+    an at the money call (a call spread when capped).
+
+    Args:
+        rate (Rate): The rate object (flat or curve).
+        maturity (Maturity): The maturity of the note.
+        spot_price (float): The spot price of the underlying, the strike of the note.
+        volatility (Volatility): The volatility object (flat or surface).
+        protection (float, optional): The protected part of the nominal (0.9 is 90%). Defaults to 1.0.
+        participation (float, optional): The participation in the performance of the underlying (1=100%). Defaults to 1.0.
+        cap (Optional[float], optional): The cap of the performance in percentage of the spot price (1.3 caps at +30%). Defaults to None.
+        dividend (Optional[float], optional): The dividend yield. Defaults to None.
+
+    Returns:
+        ComposedProduct: The note.
+    """
+    assert protection >= 0, "Error provide a non negative protection."
+    assert participation > 0, "Error provide a positive participation."
+    assert cap is None or cap > 1, "Error provide a cap above 1 (100% of the spot price)."
+    options = 100 * participation / spot_price
+    components: List[Component] = [
+        BondComponent(100 * protection),
+        VanillaComponent(spot_price, "call", options),
+    ]
+    if cap is not None:
+        components.append(VanillaComponent(cap * spot_price, "call", -options))
+    return ComposedProduct(
+        rate, maturity, spot_price, volatility, components, dividend, "capital-protected-note"
+    )
+
+
+def discount_certificate(
+    rate: Rate,
+    maturity: Maturity,
+    spot_price: float,
+    volatility: Volatility,
+    cap: float,
+    dividend: Optional[float] = None,
+) -> ComposedProduct:
+    """Discount certificate on one unit of the underlying: the holder receives at maturity the underlying capped at
+    the cap level, bought at a discount to the spot. It is a zero-coupon bond paying the cap and a short put struck
+    at the cap (the underlying and a short call).
+
+    Args:
+        rate (Rate): The rate object (flat or curve).
+        maturity (Maturity): The maturity of the certificate.
+        spot_price (float): The spot price of the underlying.
+        volatility (Volatility): The volatility object (flat or surface).
+        cap (float): The cap level in percentage of the spot price (0.95 caps at 95% of the spot).
+        dividend (Optional[float], optional): The dividend yield. Defaults to None.
+
+    Returns:
+        ComposedProduct: The certificate.
+    """
+    assert cap > 0, "Error provide a positive cap."
+    cap_level = cap * spot_price
+    return ComposedProduct(
+        rate,
+        maturity,
+        spot_price,
+        volatility,
+        [BondComponent(cap_level), VanillaComponent(cap_level, "put", -1.0)],
+        dividend,
+        "discount-certificate",
+    )
@@ -0,0 +1,145 @@
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Type
+
+import numpy as np
+
+from src.utility.constants import RISK_CHUNK_SIZE
+from src.utility.profiling import profiled
+
+
+class Position(NamedTuple):
+    """A position of the book.
+
+    Attributes:
+        product (Any): A product priced by the PricingService (options, strategies, structured products, bonds).
+        quantity (float): The number of products held, negative for short positions.
+        underlying (int): The column of the underlying in the shocks matrices.
+    """
+
+    product: Any
+    quantity: float = 1.0
+    underlying: int = 0
+
+
+class MarketShocks(NamedTuple):
+    """Historical market shocks, one row per scenario (e.g. one per day of the historical window).
+
+    Attributes:
+        spot_returns (np.ndarray): Relative spot shocks, shape (n_scenarios, n_underlyings) or (n_scenarios,).
+        volatility_changes (np.ndarray): Absolute volatility shocks, same shape as `spot_returns`.
+        rate_shifts (np.ndarray): Absolute parallel rate shocks, shape (n_scenarios,).
+    """
+
+    spot_returns: np.ndarray
+    volatility_changes: np.ndarray
+    rate_shifts: np.ndarray
+
+
+def _revaluation_class(product: Any) -> Type[Any]:
+    """The class implementing the batched revaluation of a product, all the products sharing it are
+    revalued together (e.g. every option strategy is revalued by `MultiLegStrategy`)."""
+    for klass in type(product).__mro__:
+        if "revalue" in vars(klass):
+            return klass
+    raise ValueError(
+        f"Error the product {type(product).__name__} does not support full revaluation."
+    )
+
+
+class HistoricalVaR:
+    def __init__(
+        self,
+        positions: Sequence[Position],
+        shocks: MarketShocks,
+        confidence_level: float = 0.99,
+    ) -> None:
+        """Full revaluation historical VaR and Expected Shortfall of a book.
+
+        Every position is revalued on every scenario, the products are grouped by kind and each group is
+        revalued in one vectorized pass (by chunks of about `RISK_CHUNK_SIZE` revaluations).
+
+        Args:
+            positions (Sequence[Position]): The positions of the book.
+            shocks (MarketShocks): The historical market shocks.
+            confidence_level (float, optional): The confidence level of the VaR and the ES. Defaults to 0.99.
+        """
+        assert 0 < confidence_level < 1, "Error provide 0 < confidence_level < 1."
+        if len(positions) == 0:
+            raise ValueError("Error provide at least one position.")
+        rate_shifts = np.asarray(shocks.rate_shifts, dtype=float).ravel()
+        n_scenarios = rate_shifts.size
+        self.__positions = positions
+        self.__confidence_level = confidence_level
+        self.__spot_returns = np.asarray(shocks.spot_returns, dtype=float).reshape(
+            n_scenarios, -1
+        )
+        self.__volatility_changes = np.asarray(
+            shocks.volatility_changes, dtype=float
+        ).reshape(n_scenarios, -1)
+        self.__rate_shifts = rate_shifts
+        self.__position_pnl: Optional[np.ndarray] = None
+
+    @profiled
+    def compute_position_pnl(self) -> np.ndarray:
+        """Full revaluation P&L of every position on every scenario, computed once and cached.
+
+        Returns:
+            np.ndarray: The P&L, shape (n_positions, n_scenarios).
+        """
+        if self.__position_pnl is not None:
+            return self.__position_pnl
+
+        groups: Dict[Type[Any], List[int]] = defaultdict(list)
+        for index, position in enumerate(self.__positions):
+            groups[_revaluation_class(position.product)].append(index)
+
+        n_scenarios = self.__rate_shifts.size
+        # The first column is the unshocked scenario, the P&L is computed against it.
+        spot_returns = np.vstack((np.zeros(self.__spot_returns.shape[1]), self.__spot_returns)).T
+        volatility_changes = np.vstack(
+            (np.zeros(self.__volatility_changes.shape[1]), self.__volatility_changes)
+        ).T
+        rate_shifts = np.concatenate(([0.0], self.__rate_shifts))[None, :]
+        chunk_size = max(1, RISK_CHUNK_SIZE // (n_scenarios + 1))
+
+        position_pnl = np.empty((len(self.__positions), n_scenarios))
+        for klass, indices in groups.items():
+            for start in range(0, len(indices), chunk_size):
+                chunk = indices[start : start + chunk_size]
+                underlyings = [self.__positions[index].underlying for index in chunk]
+                values = klass.revalue(
+                    [self.__positions[index].product for index in chunk],
+                    spot_returns[underlyings],
+                    volatility_changes[underlyings],
+                    rate_shifts,
+                )
+                quantities = np.array(
+                    [self.__positions[index].quantity for index in chunk]
+                )[:, None]
+                position_pnl[chunk] = quantities * (values[:, 1:] - values[:, :1])
+        self.__position_pnl = position_pnl
+        return position_pnl
+
+    def compute_pnl(self) -> np.ndarray:
+        """P&L of the book on every scenario.
+
+        Returns:
+            np.ndarray: The P&L vector, shape (n_scenarios,).
+        """
+        return self.compute_position_pnl().sum(axis=0)
+
+    def compute_var(self) -> float:
+        """Value at Risk, the loss (positive number) exceeded with probability 1 - confidence level."""
+        return float(np.quantile(-self.compute_pnl(), self.__confidence_level))
+
+    def compute_expected_shortfall(self) -> float:
+        """Expected Shortfall, the average loss (positive number) beyond the VaR."""
+        losses = -self.compute_pnl()
+        return float(losses[losses >= self.compute_var()].mean())
+
+    def compute_risk(self) -> Dict[str, float]:
+        return {
+            "confidence_level": self.__confidence_level,
+            "var": self.compute_var(),
+            "expected_shortfall": self.compute_expected_shortfall(),
+        }
@@ -0,0 +1,116 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.pricing.base.black_scholes import (
+    black_scholes_price,
+    lookup_rates,
+    lookup_volatilities,
+)
+from src.pricing.base.rate import Rate
+from src.pricing.base.volatility import Volatility
+
+
+def _term_sheet_grid(
+    rate: Rate,
+    volatility: Volatility,
+    spot_price: float,
+    maturities_in_years: Sequence[float],
+    strike_prices: Sequence[float],
+    dividend: float,
+    is_call: bool,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Maturities (column), rates (column) and option prices (maturity x strike) of a term-sheet grid."""
+    maturities = np.asarray(maturities_in_years, dtype=float).reshape(-1, 1)
+    strikes = np.asarray(strike_prices, dtype=float).reshape(1, -1)
+    assert np.all(maturities > 0), "Error provide positive maturities."
+    assert np.all(strikes > 0), "Error provide positive strike prices."
+    rates = lookup_rates(rate, maturities)
+    options = black_scholes_price(
+        spot_price,
+        strikes,
+        maturities,
+        rates,
+        dividend,
+        lookup_volatilities(volatility, strikes / spot_price, maturities),
+        is_call,
+    )
+    return maturities, rates, options
+
+
+def reverse_convertible_coupons(
+    rate: Rate,
+    volatility: Volatility,
+    spot_price: float,
+    maturities_in_years: Sequence[float],
+    strike_prices: Sequence[float],
+    target_price: float,
+    dividend: Optional[float] = None,
+) -> np.ndarray:
+    """Coupons of reverse convertibles giving a target price on a maturity x strike grid (term-sheets), in closed
+    form from one vectorized pricing of the bonds and the puts (the price is linear in the coupon).
+
+    Args:
+        rate (Rate): The rate object (flat or curve).
+        volatility (Volatility): The volatility object (flat or surface).
+        spot_price (float): The spot price of the underlying.
+        maturities_in_years (Sequence[float]): The maturities of the grid.
+        strike_prices (Sequence[float]): The strikes of the embedded put of the grid.
+        target_price (float): The target price for 100 of nominal (e.g. 98 for an issue price of 98%).
+        dividend (Optional[float], optional): The dividend yield. Defaults to None.
+
+    Returns:
+        np.ndarray: The coupons, shape (len(maturities_in_years), len(strike_prices)), NaN where the target price
+        needs a negative coupon.
+    """
+    maturities, rates, puts = _term_sheet_grid(
+        rate,
+        volatility,
+        spot_price,
+        maturities_in_years,
+        strike_prices,
+        dividend if dividend is not None else 0.0,
+        False,
+    )
+    bonds = 100 * rate.discount_factors(maturities)
+    coupons = (target_price - bonds + puts) / (100 * np.exp(-rates * maturities))
+    return np.where(coupons >= 0, coupons, np.nan)
+
+
+def outperformer_participations(
+    rate: Rate,
+    volatility: Volatility,
+    spot_price: float,
+    maturities_in_years: Sequence[float],
+    strike_prices: Sequence[float],
+    target_price: float,
+    dividend: Optional[float] = None,
+) -> np.ndarray:
+    """Participations of outperformer certificates giving a target price on a maturity x strike grid (term-sheets),
+    in closed form from one vectorized pricing of the calls (the price is linear in the participation).
+
+    Args:
+        rate (Rate): The rate object (flat or curve).
+        volatility (Volatility): The volatility object (flat or surface).
+        spot_price (float): The spot price of the underlying.
+        maturities_in_years (Sequence[float]): The maturities of the grid.
+        strike_prices (Sequence[float]): The strikes of the embedded call of the grid.
+        target_price (float): The target price (e.g. 98% of the spot price).
+        dividend (Optional[float], optional): The dividend yield. Defaults to None.
+
+    Returns:
+        np.ndarray: The participations, shape (len(maturities_in_years), len(strike_prices)), NaN where the target
+        price needs a participation of at most 100% (rejected by `OutperformerCertificate`).
+    """
+    dividend = dividend if dividend is not None else 0.0
+    maturities, _, calls = _term_sheet_grid(
+        rate,
+        volatility,
+        spot_price,
+        maturities_in_years,
+        strike_prices,
+        dividend,
+        True,
+    )
+    participations = 1 + (target_price - np.exp(-dividend * maturities) * spot_price) / calls
+    return np.where(participations > 1, participations, np.nan)
@@ -1,12 +1,27 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from src.pricing.base.black_scholes import (
+    ArrayLike,
+    black_scholes_price,
+    black_scholes_price_and_greeks,
+    lookup_product_volatilities,
+    lookup_rates,
+    lookup_volatilities,
+)
+from src.pricing.base.heston import HestonParameters
+from src.pricing.base.monte_carlo import monte_carlo_valuation
+from src.pricing.base.profile import build_profile
+from src.pricing.base.scenario import build_scenario_grid
 from src.pricing.base.rate import Rate
 from src.pricing.base.volatility import Volatility
-from src.utility.types import Maturity, OptionType
+from src.utility.constants import VOLATILITY_FLOOR
+from src.utility.metrics import record_cache_lookup
+from src.utility.types import BasketType, Maturity, OptionType
 from src.pricing.base.structured_products_base import StructuredProductBase
 from src.pricing.vanilla_options import VanillaOption
 from src.pricing.fixed_income import ZeroCouponBond
 import math as m
 import numpy as np
+from src.utility.profiling import profiled
 
 
 class ReverseConvertible(StructuredProductBase):
@@ -18,6 +33,7 @@ class ReverseConvertible(StructuredProductBase):
         volatility: Volatility,
         coupon: float,
         dividend: Optional[float] = None,
+        strike_price: Optional[float] = None,
     ) -> None:
         super().__init__("reverse-convertible")
         self.rate = rate
@@ -26,12 +42,15 @@ class ReverseConvertible(StructuredProductBase):
         self.volatility = volatility
         self.coupon = coupon
         self.dividend = dividend if dividend is not None else 0.0
+        # Strike of the embedded put, the product is struck at the money by default.
+        self.strike_price = strike_price if strike_price is not None else spot_price
 
+    @profiled
     def compute_price(self) -> float:
         bond = ZeroCouponBond(self.rate, self.maturity, 100)
         option = VanillaOption(
             self.spot_price,
-            self.spot_price,
+            self.strike_price,
             self.maturity,
             self.rate,
             self.volatility,
@@ -48,10 +67,28 @@ class ReverseConvertible(StructuredProductBase):
 
         return price
 
+    def solve_coupon(self, target_price: float) -> float:
+        """Coupon giving a target price (e.g. 98 for an issue price of 98%). The price is linear in the
+        coupon, the coupon is solved in closed form from a single pricing of the product.
+
+        Args:
+            target_price (float): The target price for 100 of nominal.
+
+        Returns:
+            float: The coupon.
+        """
+        discount_factor = np.exp(
+            -self.rate.get_rate(self.maturity) * self.maturity.maturity_in_years
+        )
+        return float(
+            self.coupon + (target_price - self.compute_price()) / (100 * discount_factor)
+        )
+
+    @profiled
     def compute_greeks(self) -> Dict[str, float]:
         option = VanillaOption(
             self.spot_price,
-            self.spot_price,
+            self.strike_price,
             self.maturity,
             self.rate,
             self.volatility,
@@ -67,6 +104,146 @@ class ReverseConvertible(StructuredProductBase):
             "vega": option.compute_vega(),
         }
 
+    def __evaluate(
+        self,
+        spot_prices: np.ndarray,
+        maturities_in_years: np.ndarray,
+        volatility_shift: ArrayLike = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        rates = lookup_rates(self.rate, maturities_in_years)
+        put = black_scholes_price_and_greeks(
+            spot_prices,
+            self.strike_price,
+            maturities_in_years,
+            rates,
+            self.dividend,
+            lookup_volatilities(
+                self.volatility,
+                self.strike_price / spot_prices,
+                maturities_in_years,
+                volatility_shift,
+            ),
+            False,
+        )
+        bond_price = 100 * np.array(
+            [
+                self.rate.discount_factor(Maturity(maturity_in_years=t))
+                for t in maturities_in_years.ravel()
+            ]
+        ).reshape(maturities_in_years.shape)
+        discounted_coupon = self.coupon * np.exp(-rates * maturities_in_years) * 100
+        # Same convention as `compute_greeks`: the greeks are the ones of the embedded put.
+        return {**put, "price": bond_price - put["price"] + discounted_coupon}
+
+    @profiled
+    def compute_profile(
+        self,
+        spot_prices: Sequence[float],
+        horizons: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Price and greeks of the product over a spot grid (payoff and P&L diagrams), the strike
+        stays the one fixed today, in one vectorized evaluation.
+
+        Args:
+            spot_prices (Sequence[float]): The spot prices of the underlying.
+            horizons (Optional[Sequence[float]], optional): The horizons in years from today, the maturity gives the payoff. Defaults to None (today only).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks arrays of shape (len(horizons), len(spot_prices)), or (len(spot_prices),) without horizons.
+        """
+        return build_profile(
+            self.__evaluate,
+            self.spot_price,
+            spot_prices,
+            self.maturity.maturity_in_years,
+            horizons,
+        )
+
+    @profiled
+    def compute_scenarios(
+        self,
+        spot_shifts: Sequence[float],
+        volatility_shifts: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """Revalue the product on a spot shift x volatility shift grid (risk limits heatmaps) in one vectorized evaluation.
+
+        Args:
+            spot_shifts (Sequence[float]): The relative spot shifts (0.05 is +5%).
+            volatility_shifts (Sequence[float]): The absolute volatility shifts (0.01 is +1 volatility point).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks matrices of shape (len(spot_shifts), len(volatility_shifts)).
+        """
+        return build_scenario_grid(
+            self.__evaluate,
+            self.spot_price,
+            spot_shifts,
+            volatility_shifts,
+            self.maturity.maturity_in_years,
+        )
+
+    @classmethod
+    def revalue(
+        cls,
+        products: Sequence["ReverseConvertible"],
+        spot_returns: np.ndarray,
+        volatility_changes: np.ndarray,
+        rate_shifts: np.ndarray,
+    ) -> np.ndarray:
+        """Full revaluation of many reverse convertibles on market shocks in one vectorized pass (historical VaR).
+
+        The volatility is looked up once at the strike (sticky strike) and then shocked, the rate shocks are
+        parallel shifts of the rate.
+
+        Args:
+            products (Sequence[ReverseConvertible]): The products to revalue.
+            spot_returns (np.ndarray): The relative spot shocks, shape (len(products), n_scenarios).
+            volatility_changes (np.ndarray): The absolute volatility shocks, broadcastable with the spot shocks.
+            rate_shifts (np.ndarray): The absolute rate shocks, broadcastable with the spot shocks.
+
+        Returns:
+            np.ndarray: The prices, shape (len(products), n_scenarios).
+        """
+        spot_prices = np.array([product.spot_price for product in products])[:, None]
+        strike_prices = np.array([product.strike_price for product in products])[
+            :, None
+        ]
+        maturities = np.array(
+            [product.maturity.maturity_in_years for product in products]
+        )[:, None]
+        rates = (
+            np.array([product.rate.get_rate(product.maturity) for product in products])[
+                :, None
+            ]
+            + rate_shifts
+        )
+        bond_prices = (
+            100
+            * np.array(
+                [product.rate.discount_factor(product.maturity) for product in products]
+            )[:, None]
+            * np.exp(-rate_shifts * maturities)
+        )
+        put_prices = black_scholes_price(
+            spot_prices * (1 + spot_returns),
+            strike_prices,
+            maturities,
+            rates,
+            np.array([product.dividend for product in products])[:, None],
+            np.maximum(
+                lookup_product_volatilities(
+                    [product.volatility for product in products],
+                    [product.strike_price / product.spot_price for product in products],
+                    [product.maturity.maturity_in_years for product in products],
+                )[:, None]
+                + volatility_changes,
+                VOLATILITY_FLOOR,
+            ),
+            False,
+        )
+        coupons = np.array([product.coupon for product in products])[:, None]
+        return bond_prices - put_prices + coupons * np.exp(-rates * maturities) * 100
+
 
 class OutperformerCertificate(StructuredProductBase):
     def __init__(
@@ -78,6 +255,7 @@ class OutperformerCertificate(StructuredProductBase):
         participation: float,
         dividend: Optional[float] = None,
         foreign_rate: Optional[Rate] = None,
+        strike_price: Optional[float] = None,
     ) -> None:
         super().__init__("outperformer-certificate")
         if participation <= 1.0:
@@ -92,11 +270,14 @@ class OutperformerCertificate(StructuredProductBase):
         self.__participation = participation
         self.__dividend = dividend
         self.__foreign_rate = foreign_rate
+        # Strike of the embedded call, the product is struck at the money by default.
+        self.__strike_price = strike_price if strike_price is not None else spot_price
 
+    @profiled
     def compute_price(self) -> float:
         atm_call = VanillaOption(
             self.__spot_price,
-            self.__spot_price,
+            self.__strike_price,
             self.__maturity,
             self.__rate,
             self.__volatility,
@@ -115,10 +296,36 @@ class OutperformerCertificate(StructuredProductBase):
             + (self.__participation - 1) * atm_call.compute_price()
         )
 
+    def solve_participation(self, target_price: float) -> float:
+        """Participation giving a target price (e.g. 98% of the spot price). The price is linear in the
+        participation, the participation is solved in closed form from a single pricing of the call.
+
+        Args:
+            target_price (float): The target price.
+
+        Returns:
+            float: The participation, below 1 whether the target price is below the price of the underlying.
+        """
+        call = VanillaOption(
+            self.__spot_price,
+            self.__strike_price,
+            self.__maturity,
+            self.__rate,
+            self.__volatility,
+            "call",
+            self.__dividend,
+        )
+        dividend = self.__dividend if self.__dividend is not None else 0.0
+        underlying_price = (
+            m.exp(-dividend * self.__maturity.maturity_in_years) * self.__spot_price
+        )
+        return float(1 + (target_price - underlying_price) / call.compute_price())
+
+    @profiled
     def compute_greeks(self, eps: Optional[float] = 0.01) -> Dict[str, float]:
         atm_call = VanillaOption(
             self.__spot_price,
-            self.__spot_price,
+            self.__strike_price,
             self.__maturity,
             self.__rate,
             self.__volatility,
@@ -133,3 +340,458 @@ class OutperformerCertificate(StructuredProductBase):
             "rho": (self.__participation - 1) * atm_call.compute_rho(),
             "vega": (self.__participation - 1) * atm_call.compute_vega(),
         }
+
+    def __evaluate(
+        self,
+        spot_prices: np.ndarray,
+        maturities_in_years: np.ndarray,
+        volatility_shift: ArrayLike = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        dividend = self.__dividend if self.__dividend is not None else 0.0
+        call = black_scholes_price_and_greeks(
+            spot_prices,
+            self.__strike_price,
+            maturities_in_years,
+            lookup_rates(self.__rate, maturities_in_years),
+            dividend,
+            lookup_volatilities(
+                self.__volatility,
+                self.__strike_price / spot_prices,
+                maturities_in_years,
+                volatility_shift,
+            ),
+            True,
+        )
+        values = {
+            greek: (self.__participation - 1) * value for greek, value in call.items()
+        }
+        values["price"] = (
+            np.exp(-dividend * maturities_in_years) * spot_prices + values["price"]
+        )
+        values["delta"] = 1 + values["delta"]
+        return values
+
+    @profiled
+    def compute_profile(
+        self,
+        spot_prices: Sequence[float],
+        horizons: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Price and greeks of the product over a spot grid (payoff and P&L diagrams), the strike
+        stays the one fixed today, in one vectorized evaluation.
+
+        Args:
+            spot_prices (Sequence[float]): The spot prices of the underlying.
+            horizons (Optional[Sequence[float]], optional): The horizons in years from today, the maturity gives the payoff. Defaults to None (today only).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks arrays of shape (len(horizons), len(spot_prices)), or (len(spot_prices),) without horizons.
+        """
+        return build_profile(
+            self.__evaluate,
+            self.__spot_price,
+            spot_prices,
+            self.__maturity.maturity_in_years,
+            horizons,
+        )
+
+    @profiled
+    def compute_scenarios(
+        self,
+        spot_shifts: Sequence[float],
+        volatility_shifts: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """Revalue the product on a spot shift x volatility shift grid (risk limits heatmaps) in one vectorized evaluation.
+
+        Args:
+            spot_shifts (Sequence[float]): The relative spot shifts (0.05 is +5%).
+            volatility_shifts (Sequence[float]): The absolute volatility shifts (0.01 is +1 volatility point).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks matrices of shape (len(spot_shifts), len(volatility_shifts)).
+        """
+        return build_scenario_grid(
+            self.__evaluate,
+            self.__spot_price,
+            spot_shifts,
+            volatility_shifts,
+            self.__maturity.maturity_in_years,
+        )
+
+    @classmethod
+    def revalue(
+        cls,
+        products: Sequence["OutperformerCertificate"],
+        spot_returns: np.ndarray,
+        volatility_changes: np.ndarray,
+        rate_shifts: np.ndarray,
+    ) -> np.ndarray:
+        """Full revaluation of many outperformer certificates on market shocks in one vectorized pass (historical VaR).
+
+        The volatility is looked up once at the strike (sticky strike) and then shocked, the rate shocks are
+        parallel shifts of the rate.
+
+        Args:
+            products (Sequence[OutperformerCertificate]): The products to revalue.
+            spot_returns (np.ndarray): The relative spot shocks, shape (len(products), n_scenarios).
+            volatility_changes (np.ndarray): The absolute volatility shocks, broadcastable with the spot shocks.
+            rate_shifts (np.ndarray): The absolute rate shocks, broadcastable with the spot shocks.
+
+        Returns:
+            np.ndarray: The prices, shape (len(products), n_scenarios).
+        """
+        spot_prices = np.array([product.__spot_price for product in products])[:, None]
+        maturities = np.array(
+            [product.__maturity.maturity_in_years for product in products]
+        )[:, None]
+        dividends = np.array(
+            [
+                product.__dividend if product.__dividend is not None else 0.0
+                for product in products
+            ]
+        )[:, None]
+        strike_prices = np.array(
+            [product.__strike_price for product in products]
+        )[:, None]
+        shocked_spot_prices = spot_prices * (1 + spot_returns)
+        call_prices = black_scholes_price(
+            shocked_spot_prices,
+            strike_prices,
+            maturities,
+            np.array(
+                [product.__rate.get_rate(product.__maturity) for product in products]
+            )[:, None]
+            + rate_shifts,
+            dividends,
+            np.maximum(
+                lookup_product_volatilities(
+                    [product.__volatility for product in products],
+                    [product.__strike_price / product.__spot_price for product in products],
+                    [product.__maturity.maturity_in_years for product in products],
+                )[:, None]
+                + volatility_changes,
+                VOLATILITY_FLOOR,
+            ),
+            True,
+        )
+        participations = np.array(
+            [product.__participation for product in products]
+        )[:, None]
+        return (
+            np.exp(-dividends * maturities) * shocked_spot_prices
+            + (participations - 1) * call_prices
+        )
+
+
+def _basket_underlyings(
+    spot_price: Union[float, Sequence[float]],
+    volatility: Union[Volatility, Sequence[Volatility]],
+    dividend: Union[None, float, Sequence[float]],
+    initial_spot: Union[None, float, Sequence[float]],
+    correlation: Optional[Sequence[Sequence[float]]],
+) -> Tuple[np.ndarray, List[Volatility], np.ndarray, np.ndarray, np.ndarray]:
+    """Spot prices, volatilities, dividends, strike levels and correlation of the underlyings of a product
+    written on one underlying (scalars) or on a basket (sequences)."""
+    spot_prices = np.atleast_1d(np.asarray(spot_price, dtype=float))
+    n_underlyings = spot_prices.size
+    volatilities = (
+        [volatility] if isinstance(volatility, Volatility) else list(volatility)
+    )
+    dividends = np.broadcast_to(
+        np.asarray(dividend if dividend is not None else 0.0, dtype=float),
+        (n_underlyings,),
+    )
+    initial_spots = (
+        spot_prices
+        if initial_spot is None
+        else np.broadcast_to(np.asarray(initial_spot, dtype=float), (n_underlyings,))
+    )
+    if correlation is None:
+        assert n_underlyings == 1, "Error provide the correlation matrix of the underlyings."
+        correlation = [[1.0]]
+    correlation = np.asarray(correlation, dtype=float)
+    assert len(volatilities) == n_underlyings, "Error provide one volatility per underlying."
+    assert correlation.shape == (n_underlyings, n_underlyings) and np.allclose(
+        correlation, correlation.T
+    ), "Error provide a symmetric correlation matrix of shape (n_underlyings, n_underlyings)."
+    assert np.all(spot_prices > 0) and np.all(initial_spots > 0), "Error provide positive spot prices."
+    return spot_prices, volatilities, dividends, initial_spots, correlation
+
+
+def _note_valuation(valuation: Dict[str, float], spot_prices: np.ndarray) -> Dict[str, float]:
+    """Scale a Monte Carlo valuation per unit of nominal to 100 of nominal. The delta and the gamma are
+    expressed per unit of spot for one underlying and for a parallel 1% move of the spots for a basket."""
+    spot_unit = float(spot_prices[0]) if spot_prices.size == 1 else 100.0
+    return {
+        "price": 100 * valuation["price"],
+        "delta": 100 * valuation["delta"] / spot_unit,
+        "gamma": 100 * valuation["gamma"] / spot_unit**2,
+        "theta": 100 * valuation["theta"],
+        "vega": 100 * valuation["vega"],
+        "rho": 100 * valuation["rho"],
+    }
+
+
+class AutocallableNote(StructuredProductBase):
+    def __init__(
+        self,
+        rate: Rate,
+        maturity: Maturity,
+        spot_price: Union[float, Sequence[float]],
+        volatility: Union[Volatility, Sequence[Volatility]],
+        coupon: float,
+        autocall_barrier: float = 1.0,
+        coupon_barrier: float = 0.8,
+        ki_barrier: float = 0.6,
+        memory: bool = True,
+        observation_dates: Optional[Sequence[float]] = None,
+        nb_observations: int = 4,
+        initial_spot: Union[None, float, Sequence[float]] = None,
+        dividend: Union[None, float, Sequence[float]] = None,
+        correlation: Optional[Sequence[Sequence[float]]] = None,
+        basket_type: BasketType = "worst-of",
+        heston_parameters: Optional[HestonParameters] = None,
+    ) -> None:
+        """Autocallable (Phoenix) note on 100 of nominal, written on one underlying or on a worst-of / best-of basket.
+
+        At each observation date, if the performance of the underlying (spot over initial spot) is above the coupon
+        barrier the coupon is paid, with the coupons missed on the previous dates whether `memory`. Before maturity,
+        if the performance is above the autocall barrier the note is redeemed at 100. At maturity, the note is
+        redeemed at 100 unless the performance is below the knock-in barrier, in which case the holder is short
+        the at the money put (redemption at 100 x performance). On a basket, the performance is the worst (or the best)
+        performance of the underlyings.
+
+        Args:
+            rate (Rate): The rate object (flat or curve).
+            maturity (Maturity): The maturity of the note, the last observation date.
+            spot_price (Union[float, Sequence[float]]): The spot price of the underlying, or of each underlying of the basket.
+            volatility (Union[Volatility, Sequence[Volatility]]): The volatility (flat or surface, looked up at the money) of each underlying.
+            coupon (float): The coupon paid per observation date (0.02 is 2% of the nominal).
+            autocall_barrier (float, optional): The autocall barrier in percentage of the initial spot. Defaults to 1.0.
+            coupon_barrier (float, optional): The coupon barrier in percentage of the initial spot. Defaults to 0.8.
+            ki_barrier (float, optional): The knock-in barrier of the put, observed at maturity, in percentage of the initial spot. Defaults to 0.6.
+            memory (bool, optional): Whether the missed coupons are paid back at the next coupon payment. Defaults to True.
+            observation_dates (Optional[Sequence[float]], optional): The observation dates in years, the last one being the maturity. Defaults to None (`nb_observations` evenly spaced dates).
+            nb_observations (int, optional): The number of evenly spaced observation dates when no dates are given. Defaults to 4.
+            initial_spot (Union[None, float, Sequence[float]], optional): The strike level of each underlying (already struck notes). Defaults to None (the spot prices).
+            dividend (Union[None, float, Sequence[float]], optional): The dividend yield of each underlying. Defaults to None.
+            correlation (Optional[Sequence[Sequence[float]]], optional): The correlation matrix of the underlyings of a basket. Defaults to None (one underlying).
+            basket_type (BasketType, optional): The performance of a basket among 'worst-of', 'best-of'. Defaults to "worst-of".
+            heston_parameters (Optional[HestonParameters], optional): Price a note on one underlying under the Heston model with these parameters instead of the volatility. Defaults to None.
+        """
+        super().__init__("autocallable")
+        maturity_in_years = maturity.maturity_in_years
+        if observation_dates is None:
+            assert nb_observations > 0, "Error provide a positive number of observations."
+            observation_dates = maturity_in_years * np.arange(1, nb_observations + 1) / nb_observations
+        observation_dates = np.asarray(observation_dates, dtype=float)
+        assert observation_dates.ndim == 1 and observation_dates.size > 0, "Error provide observation dates."
+        assert observation_dates[0] > 0 and np.all(
+            np.diff(observation_dates) > 0
+        ), "Error provide positive and increasing observation dates."
+        assert np.isclose(
+            observation_dates[-1], maturity_in_years
+        ), "Error the last observation date must be the maturity."
+        assert 0 < ki_barrier and 0 < coupon_barrier and 0 < autocall_barrier, "Error provide positive barriers."
+
+        self.__rate = rate
+        self.__maturity = maturity
+        (
+            self.__spot_prices,
+            self.__volatilities,
+            self.__dividends,
+            self.__initial_spots,
+            self.__correlation,
+        ) = _basket_underlyings(spot_price, volatility, dividend, initial_spot, correlation)
+        self.__coupon = coupon
+        self.__autocall_barrier = autocall_barrier
+        self.__coupon_barrier = coupon_barrier
+        self.__ki_barrier = ki_barrier
+        self.__memory = memory
+        self.__observation_dates = observation_dates
+        self.__basket_type = basket_type
+        self.__heston_parameters = heston_parameters
+        self.__valuations: Dict[Tuple[int, Optional[int]], Dict[str, float]] = {}
+
+    def __discounted_payoffs(
+        self, performances: np.ndarray, discount_factors: np.ndarray
+    ) -> np.ndarray:
+        """Discounted payoffs (per unit of nominal) of the paths, the early redemptions are handled with masks.
+
+        Args:
+            performances (np.ndarray): The performances of the basket at the observation dates, shape (..., n_paths, n_observations).
+            discount_factors (np.ndarray): The discount factors of the observation dates, shape (..., 1, n_observations).
+
+        Returns:
+            np.ndarray: The discounted payoffs, shape (..., n_paths).
+        """
+        alive = np.ones(performances.shape[:-1], dtype=bool)
+        missed_coupons = np.zeros(performances.shape[:-1])
+        payoffs = np.zeros(performances.shape[:-1])
+        last = performances.shape[-1] - 1
+        for i in range(last + 1):
+            performance = performances[..., i]
+            paid = alive & (performance >= self.__coupon_barrier)
+            coupons = self.__coupon * (1 + missed_coupons if self.__memory else 1)
+            payoffs += np.where(paid, coupons, 0.0) * discount_factors[..., i]
+            missed_coupons = np.where(paid, 0.0, missed_coupons + alive)
+            if i < last:
+                called = alive & (performance >= self.__autocall_barrier)
+                payoffs += called * discount_factors[..., i]
+                alive &= ~called
+        redemptions = np.where(performance < self.__ki_barrier, performance, 1.0)
+        payoffs += np.where(alive, redemptions, 0.0) * discount_factors[..., last]
+        return payoffs
+
+    def __valuation(self, num_paths: int, seed: Optional[int]) -> Dict[str, float]:
+        key = (num_paths, seed)
+        record_cache_lookup("autocallable-note-valuation", key in self.__valuations)
+        if key not in self.__valuations:
+            self.__valuations[key] = _note_valuation(
+                monte_carlo_valuation(
+                    self.__discounted_payoffs,
+                    self.__rate,
+                    self.__volatilities,
+                    self.__dividends,
+                    self.__correlation,
+                    self.__spot_prices,
+                    self.__initial_spots,
+                    self.__observation_dates,
+                    self.__basket_type,
+                    num_paths,
+                    seed,
+                    heston_parameters=self.__heston_parameters,
+                ),
+                self.__spot_prices,
+            )
+        return self.__valuations[key]
+
+    @profiled
+    def compute_price(self, num_paths: int = 100_000, seed: Optional[int] = None) -> float:
+        """Price the note by Monte Carlo, the spots are only simulated on the observation dates.
+
+        Args:
+            num_paths (int, optional): The number of paths. Defaults to 100_000.
+            seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+        Returns:
+            float: The price of the note for 100 of nominal.
+        """
+        return self.__valuation(num_paths, seed)["price"]
+
+    @profiled
+    def compute_greeks(
+        self, num_paths: int = 100_000, seed: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Greeks of the note by finite differences on the paths of the price (common random numbers).
+        On a basket, the delta and the gamma are the ones of a parallel 1% move of the spots.
+
+        Args:
+            num_paths (int, optional): The number of paths. Defaults to 100_000.
+            seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+        Returns:
+            Dict[str, float]: The delta, gamma, theta, vega and rho.
+        """
+        valuation = self.__valuation(num_paths, seed)
+        return {greek: valuation[greek] for greek in ("delta", "gamma", "theta", "rho", "vega")}
+
+
+class BasketReverseConvertible(StructuredProductBase):
+    def __init__(
+        self,
+        rate: Rate,
+        maturity: Maturity,
+        spot_price: Sequence[float],
+        volatility: Sequence[Volatility],
+        coupon: float,
+        correlation: Sequence[Sequence[float]],
+        basket_type: BasketType = "worst-of",
+        initial_spot: Optional[Sequence[float]] = None,
+        dividend: Optional[Sequence[float]] = None,
+    ) -> None:
+        """Reverse convertible on a worst-of / best-of basket, on 100 of nominal: the coupon is paid at maturity and the
+        holder is short the at the money put on the performance of the basket. Priced by Monte Carlo.
+
+        Args:
+            rate (Rate): The rate object (flat or curve).
+            maturity (Maturity): The maturity of the product.
+            spot_price (Sequence[float]): The spot price of each underlying.
+            volatility (Sequence[Volatility]): The volatility (flat or surface, looked up at the money) of each underlying.
+            coupon (float): The coupon paid at maturity (0.05 is 5% of the nominal).
+            correlation (Sequence[Sequence[float]]): The correlation matrix of the underlyings.
+            basket_type (BasketType, optional): The performance of the basket among 'worst-of', 'best-of'. Defaults to "worst-of".
+            initial_spot (Optional[Sequence[float]], optional): The strike level of each underlying. Defaults to None (the spot prices).
+            dividend (Optional[Sequence[float]], optional): The dividend yield of each underlying. Defaults to None.
+        """
+        super().__init__("reverse-convertible")
+        self.__rate = rate
+        self.__maturity = maturity
+        (
+            self.__spot_prices,
+            self.__volatilities,
+            self.__dividends,
+            self.__initial_spots,
+            self.__correlation,
+        ) = _basket_underlyings(spot_price, volatility, dividend, initial_spot, correlation)
+        self.__coupon = coupon
+        self.__basket_type = basket_type
+        self.__valuations: Dict[Tuple[int, Optional[int]], Dict[str, float]] = {}
+
+    def __discounted_payoffs(
+        self, performances: np.ndarray, discount_factors: np.ndarray
+    ) -> np.ndarray:
+        return (1 + self.__coupon - np.maximum(1 - performances[..., -1], 0.0)) * discount_factors[..., -1]
+
+    def __valuation(self, num_paths: int, seed: Optional[int]) -> Dict[str, float]:
+        key = (num_paths, seed)
+        record_cache_lookup("basket-reverse-convertible-valuation", key in self.__valuations)
+        if key not in self.__valuations:
+            self.__valuations[key] = _note_valuation(
+                monte_carlo_valuation(
+                    self.__discounted_payoffs,
+                    self.__rate,
+                    self.__volatilities,
+                    self.__dividends,
+                    self.__correlation,
+                    self.__spot_prices,
+                    self.__initial_spots,
+                    np.array([self.__maturity.maturity_in_years]),
+                    self.__basket_type,
+                    num_paths,
+                    seed,
+                ),
+                self.__spot_prices,
+            )
+        return self.__valuations[key]
+
+    @profiled
+    def compute_price(self, num_paths: int = 100_000, seed: Optional[int] = None) -> float:
+        """Price the product by Monte Carlo, the spots are only simulated at maturity.
+
+        Args:
+            num_paths (int, optional): The number of paths. Defaults to 100_000.
+            seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+        Returns:
+            float: The price of the product for 100 of nominal.
+        """
+        return self.__valuation(num_paths, seed)["price"]
+
+    @profiled
+    def compute_greeks(
+        self, num_paths: int = 100_000, seed: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Greeks of the product by finite differences on the paths of the price (common random numbers),
+        the delta and the gamma are the ones of a parallel 1% move of the spots.
+
+        Args:
+            num_paths (int, optional): The number of paths. Defaults to 100_000.
+            seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+        Returns:
+            Dict[str, float]: The delta, gamma, theta, vega and rho.
+        """
+        valuation = self.__valuation(num_paths, seed)
+        return {greek: valuation[greek] for greek in ("delta", "gamma", "theta", "rho", "vega")}
+
@@ -1,10 +1,24 @@
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, Hashable, List, Mapping, Optional, Sequence
 import numpy as np
 from scipy.stats import norm
+from src.pricing.base.black_scholes import (
+    ArrayLike,
+    SpotRepricer,
+    black_scholes_price,
+    black_scholes_price_and_greeks,
+    lookup_product_volatilities,
+    lookup_rates,
+    lookup_volatilities,
+)
 from src.pricing.base.option_base import OptionBase
+from src.pricing.base.profile import build_profile
+from src.pricing.base.scenario import build_scenario_grid
 from src.pricing.base.volatility import Volatility
 from src.pricing.base.rate import Rate
+from src.utility.constants import VOLATILITY_FLOOR
 from src.utility.types import OptionType, Maturity
+from src.utility.profiling import profiled
 
 
 class VanillaOption(OptionBase):
@@ -22,7 +36,9 @@ class VanillaOption(OptionBase):
         super().__init__(
             spot_price, strike_price, maturity, rate, volatility, option_type, dividend,foreign_rate
         )
+        self.__spot_repricer: Optional[SpotRepricer] = None
 
+    @profiled
     def compute_price(self):
         domestic_rate_value = self._domestic_rate.get_rate(self._maturity) 
         dividend_rate = self._dividend if self._dividend is not None else 0.0
@@ -136,6 +152,7 @@ class VanillaOption(OptionBase):
             raise ValueError("Option type not supported. Use 'call' or 'put'.")
         return rho
 
+    @profiled
     def compute_greeks(self):
         return {
             "delta": self.compute_delta(),
@@ -144,3 +161,250 @@ class VanillaOption(OptionBase):
             "vega": self.compute_vega(),
             "rho": self.compute_rho(),
         }
+
+    def spot_repricer(self) -> SpotRepricer:
+        """The incremental pricer of the option (spot independent pieces computed once and cached)."""
+        if self._option_type not in ("call", "put"):
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        if self.__spot_repricer is None:
+            self.__spot_repricer = SpotRepricer(
+                self._strike_price,
+                self._maturity.maturity_in_years,
+                self._domestic_rate.get_rate(self._maturity),
+                self._dividend,
+                self._volatility.get_volatility(
+                    self._strike_price / self._spot_price,
+                    self._maturity.maturity_in_years,
+                ),
+                self._option_type == "call",
+            )
+        return self.__spot_repricer
+
+    def reprice(self, spot_price: float) -> float:
+        """Price of the option for a new spot, only d1, d2 and the cdfs are recomputed (the volatility
+        stays the one of the current moneyness, sticky strike).
+
+        Args:
+            spot_price (float): The new spot price of the underlying.
+
+        Returns:
+            float: The price of the option.
+        """
+        return float(self.spot_repricer().price_and_delta(spot_price)["price"])
+
+    def __evaluate(
+        self,
+        spot_prices: np.ndarray,
+        maturities_in_years: np.ndarray,
+        volatility_shift: ArrayLike = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        if self._option_type not in ("call", "put"):
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        return black_scholes_price_and_greeks(
+            spot_prices,
+            self._strike_price,
+            maturities_in_years,
+            lookup_rates(self._domestic_rate, maturities_in_years),
+            self._dividend,
+            lookup_volatilities(
+                self._volatility,
+                self._strike_price / spot_prices,
+                maturities_in_years,
+                volatility_shift,
+            ),
+            self._option_type == "call",
+        )
+
+    @profiled
+    def compute_profile(
+        self,
+        spot_prices: Sequence[float],
+        horizons: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Price and greeks of the option over a spot grid (payoff and P&L diagrams), in one vectorized evaluation.
+
+        Args:
+            spot_prices (Sequence[float]): The spot prices of the underlying.
+            horizons (Optional[Sequence[float]], optional): The horizons in years from today, the maturity gives the payoff. Defaults to None (today only).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks arrays of shape (len(horizons), len(spot_prices)), or (len(spot_prices),) without horizons.
+        """
+        return build_profile(
+            self.__evaluate,
+            self._spot_price,
+            spot_prices,
+            self._maturity.maturity_in_years,
+            horizons,
+        )
+
+    @profiled
+    def compute_scenarios(
+        self,
+        spot_shifts: Sequence[float],
+        volatility_shifts: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """Revalue the option on a spot shift x volatility shift grid (risk limits heatmaps) in one vectorized evaluation.
+
+        Args:
+            spot_shifts (Sequence[float]): The relative spot shifts (0.05 is +5%).
+            volatility_shifts (Sequence[float]): The absolute volatility shifts (0.01 is +1 volatility point).
+
+        Returns:
+            Dict[str, np.ndarray]: The price, pnl and greeks matrices of shape (len(spot_shifts), len(volatility_shifts)).
+        """
+        return build_scenario_grid(
+            self.__evaluate,
+            self._spot_price,
+            spot_shifts,
+            volatility_shifts,
+            self._maturity.maturity_in_years,
+        )
+
+    @classmethod
+    def revalue(
+        cls,
+        options: Sequence["VanillaOption"],
+        spot_returns: np.ndarray,
+        volatility_changes: np.ndarray,
+        rate_shifts: np.ndarray,
+    ) -> np.ndarray:
+        """Full revaluation of many options on market shocks in one vectorized pass (historical VaR).
+
+        The volatility of every option is looked up once at its current moneyness (sticky strike) and then
+        shocked, the rate shocks are parallel shifts of the rate.
+
+        Args:
+            options (Sequence[VanillaOption]): The options to revalue.
+            spot_returns (np.ndarray): The relative spot shocks, shape (len(options), n_scenarios).
+            volatility_changes (np.ndarray): The absolute volatility shocks, broadcastable with the spot shocks.
+            rate_shifts (np.ndarray): The absolute rate shocks, broadcastable with the spot shocks.
+
+        Returns:
+            np.ndarray: The prices, shape (len(options), n_scenarios).
+        """
+        if any(option._option_type not in ("call", "put") for option in options):
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        spot_prices = np.array([option._spot_price for option in options])[:, None]
+        maturities = np.array(
+            [option._maturity.maturity_in_years for option in options]
+        )[:, None]
+        return black_scholes_price(
+            spot_prices * (1 + spot_returns),
+            np.array([option._strike_price for option in options])[:, None],
+            maturities,
+            np.array(
+                [option._domestic_rate.get_rate(option._maturity) for option in options]
+            )[:, None]
+            + rate_shifts,
+            np.array([option._dividend for option in options])[:, None],
+            np.maximum(
+                lookup_product_volatilities(
+                    [option._volatility for option in options],
+                    [option._strike_price / option._spot_price for option in options],
+                    [option._maturity.maturity_in_years for option in options],
+                )[:, None]
+                + volatility_changes,
+                VOLATILITY_FLOOR,
+            ),
+            np.array([option._option_type == "call" for option in options])[:, None],
+        )
+
+
+class VanillaBook:
+    def __init__(
+        self,
+        options: Sequence[VanillaOption],
+        quantities: Optional[Sequence[float]] = None,
+        underlyings: Optional[Sequence[Hashable]] = None,
+    ) -> None:
+        """Book of vanilla options repriced incrementally when the spots move.
+
+        The contracts are grouped by underlying, each group keeps a vectorized `SpotRepricer` so that a
+        spot tick only recomputes d1, d2 and the cdfs of the contracts written on that underlying.
+
+        Args:
+            options (Sequence[VanillaOption]): The options of the book.
+            quantities (Optional[Sequence[float]], optional): The number of contracts held, negative for short positions. Defaults to None (one of each).
+            underlyings (Optional[Sequence[Hashable]], optional): The underlying of every option. Defaults to None (a single underlying).
+        """
+        if len(options) == 0:
+            raise ValueError("Error provide at least one option.")
+        quantities = [1.0] * len(options) if quantities is None else quantities
+        underlyings = [None] * len(options) if underlyings is None else underlyings
+        assert len(quantities) == len(options) and len(underlyings) == len(
+            options
+        ), "Error provide one quantity and one underlying per option."
+
+        groups: Dict[Hashable, List[int]] = defaultdict(list)
+        for index, underlying in enumerate(underlyings):
+            groups[underlying].append(index)
+        self.__indices = {
+            underlying: np.array(indices) for underlying, indices in groups.items()
+        }
+        if any(option._option_type not in ("call", "put") for option in options):
+            raise ValueError("Option type not supported. Use 'call' or 'put'.")
+        self.__repricers: Dict[Hashable, SpotRepricer] = {}
+        for underlying, indices in groups.items():
+            group = [options[index] for index in indices]
+            self.__repricers[underlying] = SpotRepricer(
+                np.array([option._strike_price for option in group]),
+                np.array([option._maturity.maturity_in_years for option in group]),
+                np.array(
+                    [option._domestic_rate.get_rate(option._maturity) for option in group]
+                ),
+                np.array([option._dividend for option in group]),
+                lookup_product_volatilities(
+                    [option._volatility for option in group],
+                    [option._strike_price / option._spot_price for option in group],
+                    [option._maturity.maturity_in_years for option in group],
+                ),
+                np.array([option._option_type == "call" for option in group]),
+            )
+        self.__quantities = np.asarray(quantities, dtype=float)
+        self.__prices = np.empty(len(options))
+        self.__deltas = np.empty(len(options))
+        for underlying, indices in self.__indices.items():
+            self.update_spot(underlying, options[indices[0]]._spot_price)
+
+    @property
+    def underlyings(self) -> List[Hashable]:
+        return list(self.__indices)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.__prices
+
+    @property
+    def deltas(self) -> np.ndarray:
+        return self.__deltas
+
+    @property
+    def value(self) -> float:
+        return float(self.__quantities @ self.__prices)
+
+    def update_spot(self, underlying: Hashable, spot_price: float) -> None:
+        """Reprice the contracts written on an underlying.
+
+        Args:
+            underlying (Hashable): The underlying whose spot moved.
+            spot_price (float): Its new spot price.
+        """
+        values = self.__repricers[underlying].price_and_delta(spot_price)
+        indices = self.__indices[underlying]
+        self.__prices[indices] = values["price"]
+        self.__deltas[indices] = values["delta"]
+
+    @profiled
+    def reprice(self, spot_prices: Mapping[Hashable, float]) -> float:
+        """Reprice the book after spot updates, only the contracts of the updated underlyings are recomputed.
+
+        Args:
+            spot_prices (Mapping[Hashable, float]): The new spot price of the underlyings that moved.
+
+        Returns:
+            float: The value of the book.
+        """
+        for underlying, spot_price in spot_prices.items():
+            self.update_spot(underlying, spot_price)
+        return self.value
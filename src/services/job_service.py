@@ -0,0 +1,208 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.utility import metrics, profiling
+from src.utility.constants import (
+    DEFAULT_MAX_PENDING_JOBS,
+    DEFAULT_MAX_STORED_JOBS,
+)
+from src.utility.types import JobStatus
+
+
+def _run_instrumented(
+    profile: bool, function: Callable[..., Any], *args: Any
+) -> Tuple[Any, Dict[str, float], Optional[profiling.ProfileStats], Dict[str, Any]]:
+    """Run a function in a worker process and return, along with its result, the stage durations,
+    the profiling statistics (whether `profile`) and the metrics recorded by the worker so that
+    the API process can report them."""
+    with metrics.request_stages() as stages:
+        if profile:
+            with profiling.profiling_session() as profile_stats:
+                result = function(*args)
+        else:
+            result, profile_stats = function(*args), None
+    return result, stages, profile_stats, metrics.registry.drain()
+
+
+class QueueFullError(Exception):
+    """Raised when the pricing pool already holds the maximum number of pending jobs."""
+
+
+class JobService:
+    """
+    Runs CPU-heavy pricing functions (Monte Carlo based products) in a dedicated process pool so
+    they do not hold the GIL of the API worker serving the light, closed-form requests.
+
+    - `run` awaits a pricing function in the pool (synchronous endpoints).
+    - `submit` / `get` implement the asynchronous job API (`POST /jobs`, `GET /jobs/{id}`).
+
+    The number of jobs queued or running in the pool is bounded, once the bound is reached a
+    `QueueFullError` is raised so the API can answer with HTTP 429 (back-pressure).
+    Jobs are kept in memory by the API worker that received them.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending_jobs: Optional[int] = None,
+        max_stored_jobs: int = DEFAULT_MAX_STORED_JOBS,
+    ) -> None:
+        """Constructor of the JobService class.
+
+        Args:
+            max_workers (Optional[int], optional): Number of worker processes. Defaults to the `PRICING_POOL_WORKERS` env var or the CPU count.
+            max_pending_jobs (Optional[int], optional): Maximum number of jobs queued or running at once. Defaults to the `PRICING_MAX_PENDING_JOBS` env var or `DEFAULT_MAX_PENDING_JOBS`.
+            max_stored_jobs (int, optional): Maximum number of jobs (and results) kept in memory, the oldest finished jobs are evicted first. Defaults to DEFAULT_MAX_STORED_JOBS.
+        """
+        self.__max_workers = (
+            max_workers
+            if max_workers is not None
+            else int(os.environ.get("PRICING_POOL_WORKERS", os.cpu_count() or 1))
+        )
+        self.__max_pending_jobs = (
+            max_pending_jobs
+            if max_pending_jobs is not None
+            else int(
+                os.environ.get("PRICING_MAX_PENDING_JOBS", DEFAULT_MAX_PENDING_JOBS)
+            )
+        )
+        self.__max_stored_jobs = max_stored_jobs
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__lock = threading.Lock()
+        self.__pending_jobs = 0
+        self.__jobs: "OrderedDict[str, Future]" = OrderedDict()
+
+    @property
+    def pending_jobs(self) -> int:
+        return self.__pending_jobs
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.__max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.__executor
+
+    def __acquire_slot(self) -> None:
+        with self.__lock:
+            if self.__pending_jobs >= self.__max_pending_jobs:
+                raise QueueFullError(
+                    f"Too many pricing jobs in progress ({self.__pending_jobs}), retry later."
+                )
+            self.__pending_jobs += 1
+
+    def __release_slot(self) -> None:
+        with self.__lock:
+            self.__pending_jobs -= 1
+
+    def __on_job_done(self, future: Future) -> None:
+        self.__release_slot()
+        if not future.cancelled() and future.exception() is None:
+            metrics.registry.merge(future.result()[-1])
+
+    def __submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        self.__acquire_slot()
+        profile = profiling.current_profile() is not None
+        try:
+            try:
+                future = self.__get_executor().submit(
+                    _run_instrumented, profile, function, *args
+                )
+            except BrokenProcessPool:
+                # A worker died (e.g. killed by the OOM killer), start a fresh pool.
+                self.shutdown()
+                future = self.__get_executor().submit(
+                    _run_instrumented, profile, function, *args
+                )
+        except Exception:
+            self.__release_slot()
+            raise
+        future.add_done_callback(self.__on_job_done)
+        return future
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable function in the process pool and await its result.
+
+        Args:
+            function (Callable[..., Any]): A module level function (or static method) to run.
+
+        Raises:
+            QueueFullError: Whether the pool already holds `max_pending_jobs` jobs.
+
+        Returns:
+            Any: The value returned by the function.
+        """
+        result, stages, profile_stats, _ = await asyncio.wrap_future(
+            self.__submit(function, *args)
+        )
+        metrics.record_stages(stages)
+        if profile_stats is not None:
+            profiling.merge_profile(profile_stats)
+        return result
+
+    def submit(self, function: Callable[..., Any], *args: Any) -> str:
+        """Submit a picklable function to the process pool without waiting for it.
+
+        Args:
+            function (Callable[..., Any]): A module level function (or static method) to run.
+
+        Raises:
+            QueueFullError: Whether the pool already holds `max_pending_jobs` jobs.
+
+        Returns:
+            str: The job identifier to be used with `get`.
+        """
+        future = self.__submit(function, *args)
+        job_id = uuid.uuid4().hex
+        with self.__lock:
+            self.__jobs[job_id] = future
+            self.__evict_finished_jobs()
+        return job_id
+
+    def __evict_finished_jobs(self) -> None:
+        overflow = len(self.__jobs) - self.__max_stored_jobs
+        for job_id in [job_id for job_id, job in self.__jobs.items() if job.done()]:
+            if overflow <= 0:
+                break
+            del self.__jobs[job_id]
+            overflow -= 1
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Get the status and, once finished, the result (or error) of a job.
+
+        Args:
+            job_id (str): The identifier returned by `submit`.
+
+        Raises:
+            KeyError: Whether the job does not exist (unknown or evicted).
+
+        Returns:
+            Dict[str, Any]: A dict with the keys `job_id`, `status`, `result` and `error`.
+        """
+        future = self.__jobs[job_id]
+        status: JobStatus
+        result, error = None, None
+        if future.done():
+            exception = future.exception()
+            if exception is None:
+                status, result = "done", future.result()[0]
+            else:
+                status, error = "failed", f"{exception}"
+        elif future.running():
+            status = "running"
+        else:
+            status = "pending"
+        return {"job_id": job_id, "status": status, "result": result, "error": error}
+
+    def shutdown(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
@@ -0,0 +1,182 @@
+import threading
+from typing import Any, Dict, List, Tuple
+
+from pydantic import ValidationError
+
+from src.services.pricing_service import PricingService
+from src.utility.metrics import registry
+from src.utility.schema import (
+    LiveMarketUpdateBaseModel,
+    LiveSubscriptionBaseModel,
+)
+from src.utility.types import ScenarioProductKindType
+
+# Products that can be streamed, the structured products are struck at the spot given in their body
+# so a live spot would restrike them.
+LIVE_PRODUCT_KINDS: Tuple[ScenarioProductKindType, ...] = (
+    "vanilla",
+    "binary",
+    "straddle",
+    "strangle",
+    "butterfly",
+    "call-spread",
+    "put-spread",
+    "strip",
+    "strap",
+)
+
+
+class LivePricingSession:
+    """
+    State of a live repricing connection (WebSocket).
+
+    The client subscribes products on underlyings and pushes market updates (spot, flat volatility, flat rate),
+    the session reprices the products of the updated underlyings. The updates are coalesced: while a
+    pricing round is running the new ticks only overwrite the latest market data of their underlying, so
+    that the next round prices each underlying once with its latest tick whatever the number of ticks received.
+
+    `handle_message` is called by the receiving coroutine and `process_pending` by the pricing worker, the
+    shared state is guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        # subscription id -> (product kind, underlying, product body)
+        self.__subscriptions: Dict[str, Tuple[ScenarioProductKindType, str, Dict[str, Any]]] = {}
+        # underlying -> latest market data (spot_price, volatility, rate)
+        self.__market: Dict[str, Dict[str, float]] = {}
+        self.__pending_underlyings: Dict[str, None] = {}
+        self.__pending_subscriptions: Dict[str, None] = {}
+        self.__outbox: List[Dict[str, Any]] = []
+
+    @property
+    def subscriptions(self) -> List[str]:
+        return list(self.__subscriptions)
+
+    def handle_message(self, message: Any) -> None:
+        """Handle a message of the client (`subscribe`, `unsubscribe` or `update` action), the
+        pricing is deferred to `process_pending`.
+
+        Args:
+            message (Any): The JSON message received.
+        """
+        try:
+            action = message.get("action") if isinstance(message, dict) else None
+            if action == "subscribe":
+                subscription = LiveSubscriptionBaseModel(**message)
+                if subscription.product_kind not in LIVE_PRODUCT_KINDS:
+                    raise ValueError(
+                        f"Error provide a product kind among: {', '.join(LIVE_PRODUCT_KINDS)}"
+                    )
+                with self.__lock:
+                    self.__subscriptions[subscription.subscription_id] = (
+                        subscription.product_kind,
+                        subscription.underlying,
+                        subscription.product,
+                    )
+                    self.__pending_subscriptions[subscription.subscription_id] = None
+            elif action == "unsubscribe":
+                subscription_id = str(message.get("subscription_id"))
+                with self.__lock:
+                    if self.__subscriptions.pop(subscription_id, None) is None:
+                        raise ValueError(f"Unknown subscription {subscription_id}")
+                    self.__pending_subscriptions.pop(subscription_id, None)
+                    self.__outbox.append(
+                        {"type": "unsubscribed", "subscription_id": subscription_id}
+                    )
+            elif action == "update":
+                update = LiveMarketUpdateBaseModel(**message)
+                registry.increment("pricing_live_ticks_total")
+                with self.__lock:
+                    if update.underlying in self.__pending_underlyings:
+                        registry.increment("pricing_live_ticks_coalesced_total")
+                    self.__market.setdefault(update.underlying, {}).update(
+                        update.model_dump(exclude={"underlying"}, exclude_none=True)
+                    )
+                    self.__pending_underlyings[update.underlying] = None
+            else:
+                raise ValueError("Error provide an action among: subscribe, unsubscribe, update")
+        except (ValidationError, ValueError) as e:
+            self.report_error(f"{e}")
+
+    def report_error(self, detail: str) -> None:
+        """Queue an error message for the client, e.g. a frame that is not JSON.
+
+        Args:
+            detail (str): The description of the error.
+        """
+        with self.__lock:
+            self.__outbox.append({"type": "error", "detail": detail})
+
+    def has_pending(self) -> bool:
+        with self.__lock:
+            return bool(
+                self.__outbox or self.__pending_underlyings or self.__pending_subscriptions
+            )
+
+    def process_pending(self) -> List[Dict[str, Any]]:
+        """Price the new subscriptions and the subscriptions of the underlyings updated since the last
+        call, each with the latest market data of its underlying.
+
+        Returns:
+            List[Dict[str, Any]]: The messages to send to the client.
+        """
+        with self.__lock:
+            messages, self.__outbox = self.__outbox, []
+            underlyings = set(self.__pending_underlyings)
+            new_subscriptions = set(self.__pending_subscriptions)
+            self.__pending_underlyings.clear()
+            self.__pending_subscriptions.clear()
+            to_price = [
+                (subscription_id, kind, underlying, dict(product), dict(self.__market.get(underlying, {})))
+                for subscription_id, (kind, underlying, product) in self.__subscriptions.items()
+                if underlying in underlyings or subscription_id in new_subscriptions
+            ]
+
+        for subscription_id, kind, underlying, product, market in to_price:
+            try:
+                result = self.__price(kind, product, market)
+            except Exception as e:
+                messages.append(
+                    {"type": "error", "subscription_id": subscription_id, "detail": f"{e}"}
+                )
+                if subscription_id in new_subscriptions:
+                    with self.__lock:
+                        self.__subscriptions.pop(subscription_id, None)
+                continue
+            if subscription_id in new_subscriptions:
+                messages.append(
+                    {
+                        "type": "subscribed",
+                        "subscription_id": subscription_id,
+                        "underlying": underlying,
+                    }
+                )
+            messages.append(
+                {
+                    "type": "pricing",
+                    "subscription_id": subscription_id,
+                    "underlying": underlying,
+                    "market": market,
+                    "result": result,
+                }
+            )
+        return messages
+
+    @staticmethod
+    def __price(
+        kind: ScenarioProductKindType, product: Dict[str, Any], market: Dict[str, float]
+    ) -> Dict[str, float]:
+        if "spot_price" in market:
+            product["spot_price"] = market["spot_price"]
+        if "volatility" in market:
+            product.pop("volatility_surface", None)
+            product["volatility"] = market["volatility"]
+        if "rate" in market:
+            product.pop("rate_curve", None)
+            product["rate"] = market["rate"]
+        opt = PricingService.build_product(kind, product)
+        return dict(
+            {"price": float(opt.compute_price())},
+            **{greek: float(value) for greek, value in opt.compute_greeks().items()},
+        )
@@ -1,13 +1,21 @@
-from itertools import product
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Tuple, Type
+import numpy as np
 from pydantic import BaseModel
 
-from src.pricing.structured_products import OutperformerCertificate, ReverseConvertible
+from src.pricing.structured_products import (
+    AutocallableNote,
+    OutperformerCertificate,
+    ReverseConvertible,
+)
 from src.pricing.barrier_options import BarrierOption
+from src.pricing.base.black_scholes import GREEKS
+from src.pricing.base.heston import HestonParameters
+from src.pricing.base.parametric_volatility import SSVIVolatility, SVIVolatility
 from src.pricing.base.rate import Rate
 from src.pricing.base.volatility import Volatility
 from src.pricing.binary_options import BinaryOption
-from src.pricing.fixed_income import Bond, ZeroCouponBond
+from src.pricing.fixed_income import Bond, BondPortfolio, ZeroCouponBond
+from src.pricing.heston_options import HestonOption
 from src.pricing.option_strategies import (
     ButterflyStrategy,
     StraddleStrategy,
@@ -17,24 +25,47 @@ from src.pricing.option_strategies import (
     StripStrategy,
     StrapStrategy,
 )
+from src.pricing.product_builder import capital_protected_note, discount_certificate
+from src.pricing.solver import outperformer_participations, reverse_convertible_coupons
 from src.pricing.vanilla_options import VanillaOption
+from src.utility.constants import (
+    MAX_BOND_PORTFOLIO_SIZE,
+    MAX_SCENARIO_POINTS,
+    MAX_SOLVER_GRID_POINTS,
+)
+from src.utility.metrics import stage_timer
+from src.utility.profiling import profiled
 from src.utility.schema import (
+    AutocallableBaseModel,
     BarrierOptionBaseModel,
     BinaryOptionBaseModel,
+    BondPortfolioBaseModel,
     ButterflyStrategyBaseModel,
     CallSpreadStrategyBaseModel,
+    CapitalProtectedNoteBaseModel,
+    DiscountCertificateBaseModel,
+    HestonOptionBaseModel,
     OptionBaseModel,
     OptionStrategyBaseModel,
     OutperformerCertificateBaseModel,
     PutSpreadStrategyBaseModel,
     ReverseConvertibleBaseModel,
+    ScenarioBaseModel,
+    SolverBaseModel,
     StraddleStrategyBaseModel,
     StrangleStrategyBaseModel,
     StrapStrategyBaseModel,
     StripStrategyBaseModel,
     ZeroCouponBondBaseModel,
 )
-from src.utility.types import Maturity
+from src.utility.types import (
+    Maturity,
+    OptionKindType,
+    ProductKindType,
+    ScenarioProductKindType,
+    SolverProductKindType,
+    VolatilityModelType,
+)
 
 
 class PricingService:
@@ -43,16 +74,78 @@ class PricingService:
 
     - Outperformer certificates
     - Reverse convertibles
+    - Autocallable (Phoenix) notes
     - Binary options
     - Vanilla options
     - Barrier options
     - Bonds
     - Zero-coupon bonds
+    - Bond portfolios
     - Option strategies (straddle, strangle, butterfly, call spread, put spread, strip, strap)
 
     Handles input validation and model object creation, ensuring consistency in pricing calculations.
     """
 
+    # Products priced by Monte Carlo, dispatched to the process pool by the API.
+    MONTE_CARLO_OPTION_KINDS: Tuple[OptionKindType, ...] = ("barrier",)
+    MONTE_CARLO_PRODUCT_KINDS: Tuple[ProductKindType, ...] = ("autocallable",)
+
+    # Schemas of the structured products, by kind.
+    STRUCTURED_PRODUCT_SCHEMAS: Dict[ProductKindType, Type[BaseModel]] = {
+        "reverse-convertible": ReverseConvertibleBaseModel,
+        "outperformer-certificate": OutperformerCertificateBaseModel,
+        "autocallable": AutocallableBaseModel,
+        "capital-protected-note": CapitalProtectedNoteBaseModel,
+        "discount-certificate": DiscountCertificateBaseModel,
+    }
+
+    # Classes of the volatility surfaces given in the payloads, by `volatility_model`.
+    VOLATILITY_MODELS: Dict[VolatilityModelType, Type[Volatility]] = {
+        "spline": Volatility,
+        "svi": SVIVolatility,
+        "ssvi": SSVIVolatility,
+    }
+
+    # Products revalued on scenario grids: (schema, pricing class, whether it needs a foreign rate).
+    SCENARIO_PRODUCTS: Dict[
+        ScenarioProductKindType, Tuple[Type[BaseModel], Type[Any], bool]
+    ] = {
+        "vanilla": (OptionBaseModel, VanillaOption, False),
+        "binary": (BinaryOptionBaseModel, BinaryOption, False),
+        "straddle": (StraddleStrategyBaseModel, StraddleStrategy, False),
+        "strangle": (StrangleStrategyBaseModel, StrangleStrategy, False),
+        "butterfly": (ButterflyStrategyBaseModel, ButterflyStrategy, False),
+        "call-spread": (CallSpreadStrategyBaseModel, CallSpreadStrategy, False),
+        "put-spread": (PutSpreadStrategyBaseModel, PutSpreadStrategy, False),
+        "strip": (StripStrategyBaseModel, StripStrategy, False),
+        "strap": (StrapStrategyBaseModel, StrapStrategy, False),
+        "reverse-convertible": (ReverseConvertibleBaseModel, ReverseConvertible, False),
+        "outperformer-certificate": (
+            OutperformerCertificateBaseModel,
+            OutperformerCertificate,
+            True,
+        ),
+    }
+
+    # Structured products solved at a target price: (schema, solved parameter, term-sheet grid solver, constraint
+    # of the solved parameter, not met at the NaN points of the grid).
+    SOLVER_PRODUCTS: Dict[
+        SolverProductKindType, Tuple[Type[BaseModel], str, Callable[..., Any], str]
+    ] = {
+        "reverse-convertible": (
+            ReverseConvertibleBaseModel,
+            "coupon",
+            reverse_convertible_coupons,
+            "a coupon must be positive",
+        ),
+        "outperformer-certificate": (
+            OutperformerCertificateBaseModel,
+            "participation",
+            outperformer_participations,
+            "a participation must be greater than 100%",
+        ),
+    }
+
     @staticmethod
     def __handle_rate_and_rate_curve_base_model(base_model_dict: Dict[str, Any]):
         if "rate" in base_model_dict.keys():
@@ -93,27 +186,21 @@ class PricingService:
 
     @staticmethod
     def __handle_vol_and_vol_surface_base_model(base_model_dict: Dict[str, Any]):
+        volatility_model = base_model_dict.pop("volatility_model", None) or "spline"
         if "volatility" in base_model_dict.keys():
             base_model_dict["volatility"] = Volatility(
                 volatility=base_model_dict["volatility"]
             )
         elif "volatility_surface" in base_model_dict.keys():
-            volatility_surface = {}
-            for comb in product(
-                map(float, base_model_dict["volatility_surface"].keys()),
-                map(
-                    float,
-                    list(base_model_dict["volatility_surface"].items())[0][-1].keys(),
-                ),
-            ):  # type: ignore
-                volatility_surface[comb] = (
-                    base_model_dict["volatility_surface"]
-                    .get(str(comb[0]))
-                    .get(str(comb[-1]), int(comb[-1]))
-                )
-            base_model_dict["volatility_surface"] = Volatility(
-                volatility_surface=volatility_surface
-            )
+            # The payload is keyed by maturity then moneyness, the surfaces by (moneyness, maturity).
+            volatility_surface = {
+                (float(moneyness), float(maturity)): volatility
+                for maturity, smile in base_model_dict["volatility_surface"].items()
+                for moneyness, volatility in smile.items()
+            }
+            base_model_dict["volatility_surface"] = PricingService.VOLATILITY_MODELS[
+                volatility_model
+            ](volatility_surface=volatility_surface)
             base_model_dict["volatility"] = base_model_dict.pop("volatility_surface")
         else:
             raise ValueError(
@@ -122,54 +209,140 @@ class PricingService:
         return base_model_dict
 
     @staticmethod
+    def __build_product_dict(
+        request_received_model: BaseModel,
+        foreign_rate: bool = False,
+        volatility: bool = True,
+    ) -> Dict[str, Any]:
+        """Convert the received schema to the arguments of the pricing classes (validation and market data stages).
+
+        Args:
+            request_received_model (BaseModel): The schema corresponding to the JSON body sent by the user.
+            foreign_rate (bool, optional): Whether the product needs a foreign rate. Defaults to False.
+            volatility (bool, optional): Whether the product needs a volatility. Defaults to True.
+
+        Returns:
+            Dict[str, Any]: The product arguments with Maturity, Rate and Volatility objects.
+        """
+        with stage_timer("validation"):
+            product_dict = request_received_model.model_dump(exclude_unset=True)
+            product_dict["maturity"] = Maturity(
+                maturity_in_years=product_dict["maturity"]
+            )
+        with stage_timer("market-data"):
+            product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
+                product_dict
+            )
+            if foreign_rate:
+                product_dict = PricingService.__handle_foreign_rate_and_foreign_rate_curve_base_model(
+                    product_dict
+                )
+            if volatility:
+                product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
+                    product_dict
+                )
+        return product_dict
+
+    @staticmethod
+    def __price_and_greeks(opt: Any, greeks: bool = True) -> Dict[str, float]:
+        with stage_timer("pricing"):
+            price = opt.compute_price()
+        if not greeks:
+            return {"price": price}
+        with stage_timer("greeks"):
+            return dict({"price": price}, **opt.compute_greeks())
+
+    @staticmethod
+    @profiled
     def process_outperformer_certificate_structured_product(
         request_received_model: OutperformerCertificateBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-
-        product_dict = (
-            PricingService.__handle_foreign_rate_and_foreign_rate_curve_base_model(
-                PricingService.__handle_rate_and_rate_curve_base_model(product_dict)
-            )
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
+        product_dict = PricingService.__build_product_dict(
+            request_received_model, foreign_rate=True
         )
-
         opt = OutperformerCertificate(**product_dict)
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_reverse_convertible_structured_product(
         request_received_model: ReverseConvertibleBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = ReverseConvertible(**product_dict)
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
+    def process_autocallable_structured_product(
+        request_received_model: AutocallableBaseModel,
+    ) -> Dict[str, float]:
+        product_dict = PricingService.__build_product_dict(request_received_model)
+        opt = AutocallableNote(**product_dict)
+        return PricingService.__price_and_greeks(opt)
+
+    @staticmethod
+    @profiled
+    def process_capital_protected_note(
+        request_received_model: CapitalProtectedNoteBaseModel,
+    ) -> Dict[str, float]:
+        product_dict = PricingService.__build_product_dict(request_received_model)
+        opt = capital_protected_note(**product_dict)
+        return PricingService.__price_and_greeks(opt)
+
+    @staticmethod
+    @profiled
+    def process_discount_certificate(
+        request_received_model: DiscountCertificateBaseModel,
+    ) -> Dict[str, float]:
+        product_dict = PricingService.__build_product_dict(request_received_model)
+        opt = discount_certificate(**product_dict)
+        return PricingService.__price_and_greeks(opt)
+
+    @staticmethod
+    @profiled
+    def process_structured_product(
+        product_kind: ProductKindType, request_received_model: BaseModel
+    ) -> Dict[str, float]:
+        """Price a structured product given its kind, this function is picklable so it can run in a worker process.
+
+        Args:
+            product_kind (ProductKindType): The type of structured product to price among 'reverse-convertible', 'outperformer-certificate', 'autocallable', 'capital-protected-note', 'discount-certificate'.
+            request_received_model (BaseModel): The schema corresponding to the structured product.
+
+        Raises:
+            ValueError: Whether the product kind is not supported.
+
+        Returns:
+            Dict[str, float]: The price and the greeks.
+        """
+        if product_kind not in PricingService.STRUCTURED_PRODUCT_SCHEMAS:
+            raise ValueError("Provide valid input.")
+        request_received_model = PricingService.STRUCTURED_PRODUCT_SCHEMAS[product_kind](
+            **request_received_model.model_dump(exclude_unset=True)
+        )
+        if product_kind == "reverse-convertible":
+            return PricingService.process_reverse_convertible_structured_product(
+                request_received_model
+            )
+        if product_kind == "outperformer-certificate":
+            return PricingService.process_outperformer_certificate_structured_product(
+                request_received_model
+            )
+        if product_kind == "autocallable":
+            return PricingService.process_autocallable_structured_product(
+                request_received_model
+            )
+        if product_kind == "capital-protected-note":
+            return PricingService.process_capital_protected_note(request_received_model)
+        return PricingService.process_discount_certificate(request_received_model)
+
+    @staticmethod
+    @profiled
     def process_binary_options(
         request_received_model: BinaryOptionBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = BinaryOption(
             spot_price=product_dict["spot_price"],
             strike_price=product_dict["strike_price"],
@@ -179,22 +352,14 @@ class PricingService:
             option_type=product_dict["option_type"],
             dividend=product_dict["dividend"],
         )
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_vanilla_options(
         request_received_model: OptionBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = VanillaOption(
             spot_price=product_dict["spot_price"],
             strike_price=product_dict["strike_price"],
@@ -205,61 +370,145 @@ class PricingService:
             dividend=product_dict["dividend"],
         )
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_barrier_options(
         request_received_model: BarrierOptionBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
+        product_dict = PricingService.__build_product_dict(request_received_model)
+        opt = BarrierOption(**product_dict)
 
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
+        return PricingService.__price_and_greeks(opt)
+
+    @staticmethod
+    @profiled
+    def process_heston_options(
+        request_received_model: HestonOptionBaseModel,
+    ) -> Dict[str, float]:
+        product_dict = PricingService.__build_product_dict(request_received_model)
+        parameters = [
+            product_dict.pop(name, None) for name in HestonParameters._fields
+        ]
+        if any(value is None for value in parameters) and any(
+            value is not None for value in parameters
+        ):
+            raise ValueError(
+                "Error, provide either all the Heston parameters or none of them to calibrate the model"
+            )
+        opt = HestonOption(
+            spot_price=product_dict["spot_price"],
+            strike_price=product_dict["strike_price"],
+            maturity=product_dict["maturity"],
+            rate=product_dict["rate"],
+            volatility=product_dict["volatility"],
+            option_type=product_dict["option_type"],
+            dividend=product_dict["dividend"],
+            parameters=(
+                HestonParameters(*parameters) if parameters[0] is not None else None
+            ),
         )
-        opt = BarrierOption(**product_dict)
+        return PricingService.__price_and_greeks(opt)
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+    @staticmethod
+    @profiled
+    def process_option(
+        option_kind: OptionKindType, request_received_model: OptionBaseModel
+    ) -> Dict[str, float]:
+        """Price an option given its kind, this function is picklable so it can run in a worker process.
+
+        Args:
+            option_kind (OptionKindType): The type of option to price among 'vanilla', 'binary', 'barrier', 'heston'.
+            request_received_model (OptionBaseModel): The schema corresponding to the option.
+
+        Raises:
+            ValueError: Whether the schema does not match the option kind.
+
+        Returns:
+            Dict[str, float]: The price and the greeks.
+        """
+        if option_kind == "binary" and isinstance(
+            request_received_model, BinaryOptionBaseModel
+        ):
+            return PricingService.process_binary_options(request_received_model)
+        if option_kind == "vanilla" and isinstance(
+            request_received_model, OptionBaseModel
+        ):
+            return PricingService.process_vanilla_options(request_received_model)
+        if option_kind == "barrier" and isinstance(
+            request_received_model, BarrierOptionBaseModel
+        ):
+            return PricingService.process_barrier_options(request_received_model)
+        if option_kind == "heston" and isinstance(
+            request_received_model, OptionBaseModel
+        ):
+            return PricingService.process_heston_options(
+                HestonOptionBaseModel(
+                    **request_received_model.model_dump(exclude_unset=True)
+                )
+            )
+        raise ValueError("Provide valid input.")
 
     @staticmethod
+    @profiled
     def process_vanilla_bond(request_received_model: BaseModel) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
+        product_dict = PricingService.__build_product_dict(
+            request_received_model, volatility=False
         )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
         opt = Bond(**product_dict)
 
-        return {"price": opt.compute_price()}
+        return PricingService.__price_and_greeks(opt, greeks=False)
 
     @staticmethod
+    @profiled
     def process_zero_coupon_bond(
         request_received_model: ZeroCouponBondBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
+        product_dict = PricingService.__build_product_dict(
+            request_received_model, volatility=False
         )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
         opt = ZeroCouponBond(**product_dict)
 
-        return {"price": opt.compute_price()}
+        return PricingService.__price_and_greeks(opt, greeks=False)
 
     @staticmethod
+    @profiled
+    def process_bond_portfolio(
+        request_received_model: BondPortfolioBaseModel,
+    ) -> Dict[str, List[float]]:
+        """Price a whole portfolio of bonds at once.
+
+        Args:
+            request_received_model (BondPortfolioBaseModel): The rate (or rate curve) and the arrays of nominals, coupon rates, frequencies and maturities.
+
+        Raises:
+            ValueError: Whether the portfolio is too large.
+
+        Returns:
+            Dict[str, List[float]]: The price, yield to maturity, duration and convexity of every bond.
+        """
+        with stage_timer("validation"):
+            product_dict = request_received_model.model_dump(exclude_unset=True)
+            if len(product_dict["nominals"]) > MAX_BOND_PORTFOLIO_SIZE:
+                raise ValueError(
+                    f"Error provide at most {MAX_BOND_PORTFOLIO_SIZE} bonds."
+                )
+        with stage_timer("market-data"):
+            product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
+                product_dict
+            )
+        portfolio = BondPortfolio(**product_dict)
+        with stage_timer("pricing"):
+            values = portfolio.compute()
+        return {name: value.tolist() for name, value in values.items()}
+
+    @staticmethod
+    @profiled
     def process_straddle_strategy(
         request_received_model: StraddleStrategyBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = StraddleStrategy(
             spot_price=product_dict["spot_price"],
             strike_price=product_dict["strike_price"],
@@ -269,20 +518,14 @@ class PricingService:
             dividend=product_dict["dividend"],
         )
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_strangle_strategy(
         request_received_model: StrangleStrategyBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = StrangleStrategy(
             spot_price=product_dict["spot_price"],
             strike_price1=product_dict["strike_price1"],
@@ -293,20 +536,14 @@ class PricingService:
             dividend=product_dict["dividend"],
         )
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_butterfly_strategy(
         request_received_model: ButterflyStrategyBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = ButterflyStrategy(
             spot_price=product_dict["spot_price"],
             strike_price1=product_dict["strike_price1"],
@@ -318,20 +555,14 @@ class PricingService:
             dividend=product_dict["dividend"],
         )
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_call_spread_strategy(
         request_received_model: CallSpreadStrategyBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = CallSpreadStrategy(
             spot_price=product_dict["spot_price"],
             lower_strike=product_dict["lower_strike"],
@@ -342,20 +573,14 @@ class PricingService:
             dividend=product_dict["dividend"],
         )
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_put_spread_strategy(
         request_received_model: PutSpreadStrategyBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = PutSpreadStrategy(
             spot_price=product_dict["spot_price"],
             lower_strike=product_dict["lower_strike"],
@@ -366,21 +591,14 @@ class PricingService:
             dividend=product_dict["dividend"],
         )
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_strip_strategy(
         request_received_model: StripStrategyBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
-
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = StripStrategy(
             spot_price=product_dict["spot_price"],
             strike_price1=product_dict["strike_price1"],
@@ -390,20 +608,14 @@ class PricingService:
             volatility=product_dict["volatility"],
             dividend=product_dict["dividend"],
         )
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
 
     @staticmethod
+    @profiled
     def process_strap_strategy(
         request_received_model: StrapStrategyBaseModel,
     ) -> Dict[str, float]:
-        product_dict = request_received_model.model_dump(exclude_unset=True)
-        product_dict = PricingService.__handle_rate_and_rate_curve_base_model(
-            product_dict
-        )
-        product_dict["maturity"] = Maturity(maturity_in_years=product_dict["maturity"])
-        product_dict = PricingService.__handle_vol_and_vol_surface_base_model(
-            product_dict
-        )
+        product_dict = PricingService.__build_product_dict(request_received_model)
         opt = StrapStrategy(
             spot_price=product_dict["spot_price"],
             strike_price1=product_dict["strike_price1"],
@@ -414,4 +626,134 @@ class PricingService:
             dividend=product_dict["dividend"],
         )
 
-        return dict({"price": opt.compute_price()}, **opt.compute_greeks())
+        return PricingService.__price_and_greeks(opt)
+
+    @staticmethod
+    def build_product(
+        product_kind: ScenarioProductKindType, product: Dict[str, Any]
+    ) -> Any:
+        """Validate a product body (same as its pricing endpoint) and build the pricing object.
+
+        Args:
+            product_kind (ScenarioProductKindType): The kind of product, a key of `SCENARIO_PRODUCTS`.
+            product (Dict[str, Any]): The JSON body of the product.
+
+        Raises:
+            ValueError: Whether the product kind is not supported.
+
+        Returns:
+            Any: The pricing object (option, strategy or structured product).
+        """
+        if product_kind not in PricingService.SCENARIO_PRODUCTS:
+            raise ValueError("Provide valid input.")
+        schema, product_class, foreign_rate = PricingService.SCENARIO_PRODUCTS[
+            product_kind
+        ]
+        product_dict = PricingService.__build_product_dict(
+            schema(**product), foreign_rate=foreign_rate
+        )
+        if not foreign_rate:
+            # As in process_vanilla_options, the foreign rate is not used by these products.
+            product_dict.pop("foreign_rate", None)
+        return product_class(**product_dict)
+
+    @staticmethod
+    @profiled
+    def process_scenario(
+        product_kind: ScenarioProductKindType,
+        request_received_model: ScenarioBaseModel,
+    ) -> Dict[str, List]:
+        """Revalue a product on a spot shift x volatility shift grid.
+
+        Args:
+            product_kind (ScenarioProductKindType): The kind of product to revalue.
+            request_received_model (ScenarioBaseModel): The product (same body as its pricing endpoint) and the shifts.
+
+        Raises:
+            ValueError: Whether the product kind is not supported or the grid is too large.
+
+        Returns:
+            Dict[str, List]: The shifts and the price, pnl and greeks matrices (one row per spot shift).
+        """
+        if product_kind not in PricingService.SCENARIO_PRODUCTS:
+            raise ValueError("Provide valid input.")
+        spot_shifts = request_received_model.spot_shifts
+        volatility_shifts = request_received_model.volatility_shifts
+        if len(spot_shifts) * len(volatility_shifts) > MAX_SCENARIO_POINTS:
+            raise ValueError(
+                f"Error provide at most {MAX_SCENARIO_POINTS} scenarios (spot shifts x volatility shifts)."
+            )
+        opt = PricingService.build_product(product_kind, request_received_model.product)
+        with stage_timer("pricing"):
+            scenarios = opt.compute_scenarios(spot_shifts, volatility_shifts)
+        return {
+            "spot_shifts": spot_shifts,
+            "volatility_shifts": volatility_shifts,
+            **{
+                name: scenarios[name].tolist()
+                for name in ("price", "pnl") + GREEKS
+            },
+        }
+
+    @staticmethod
+    @profiled
+    def process_solver(
+        product_kind: SolverProductKindType,
+        request_received_model: SolverBaseModel,
+    ) -> Dict[str, Any]:
+        """Solve the coupon (reverse convertible) or the participation (outperformer certificate) giving a target
+        price on a maturity x strike grid (term-sheets).
+
+        Args:
+            product_kind (SolverProductKindType): The kind of structured product.
+            request_received_model (SolverBaseModel): The product (same body as its pricing endpoint), the target price and the grid.
+
+        Raises:
+            ValueError: Whether the product kind is not supported or the grid is too large.
+
+        Returns:
+            Dict[str, Any]: The solved parameter, the grid and the solved values (one row per maturity), None where the
+            target price is not reachable with a valid parameter, with the reason.
+        """
+        if product_kind not in PricingService.SOLVER_PRODUCTS:
+            raise ValueError("Provide valid input.")
+        schema, parameter, solve_grid, constraint = PricingService.SOLVER_PRODUCTS[
+            product_kind
+        ]
+        # The solved parameter of the body is ignored, any valid value passes the validation.
+        product_dict = PricingService.__build_product_dict(
+            schema(**{**request_received_model.product, parameter: 1.0})
+        )
+        maturities = request_received_model.maturities or [
+            product_dict["maturity"].maturity_in_years
+        ]
+        strike_prices = request_received_model.strike_prices or [
+            product_dict.get("strike_price", product_dict["spot_price"])
+        ]
+        if len(maturities) * len(strike_prices) > MAX_SOLVER_GRID_POINTS:
+            raise ValueError(
+                f"Error provide at most {MAX_SOLVER_GRID_POINTS} grid points (maturities x strikes)."
+            )
+        with stage_timer("pricing"):
+            values = solve_grid(
+                product_dict["rate"],
+                product_dict["volatility"],
+                product_dict["spot_price"],
+                maturities,
+                strike_prices,
+                request_received_model.target_price,
+                product_dict.get("dividend"),
+            )
+        infeasible = np.isnan(values)
+        return {
+            "parameter": parameter,
+            "target_price": request_received_model.target_price,
+            "maturities": maturities,
+            "strike_prices": strike_prices,
+            "values": np.where(infeasible, None, values).tolist(),
+            "infeasible_reason": (
+                f"The target price {request_received_model.target_price} is not reachable at the null grid points, {constraint}."
+                if infeasible.any()
+                else None
+            ),
+        }
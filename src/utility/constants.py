@@ -1 +1,27 @@
-EPSILON = 2e-2  # Choix d'un epsilon pour le calcul des greques des options barrières
\ No newline at end of file
+EPSILON = 2e-2  # Choix d'un epsilon pour le calcul des greques des options barrières
+DEFAULT_MAX_PENDING_JOBS = 32  # Nombre maximal de jobs de pricing en attente dans le pool de processus
+DEFAULT_MAX_STORED_JOBS = 1024  # Nombre maximal de jobs (et résultats) conservés en mémoire
+MONTE_CARLO_CHUNK_SIZE = 2**20  # Nombre de tirages aléatoires simulés par bloc de pas de temps
+DEFAULT_SCENARIO_SPOT_SHIFTS = tuple(round(0.01 * i, 2) for i in range(-10, 11))  # Chocs de spot relatifs par défaut (-10% à +10%)
+DEFAULT_SCENARIO_VOLATILITY_SHIFTS = tuple(round(0.01 * i, 2) for i in range(-5, 6))  # Chocs de volatilité absolus par défaut (-5 à +5 points)
+MAX_SCENARIO_POINTS = 10_000  # Nombre maximal de scénarios (spot x volatilité) par requête
+VOLATILITY_FLOOR = 1e-4  # Volatilité minimale après application d'un choc historique
+RISK_CHUNK_SIZE = 2**20  # Nombre de réévaluations (positions x scénarios) calculées par bloc
+MONTE_CARLO_SPOT_BUMP = 0.01  # Choc de spot relatif des grecques calculées par différences finies Monte Carlo
+MAX_SOLVER_GRID_POINTS = 10_000  # Nombre maximal de points (maturités x strikes) d'une grille de term-sheets
+MAX_AUTOCALL_OBSERVATIONS = 260  # Nombre maximal de dates d'observation d'un autocall (hebdomadaires sur 5 ans)
+DEFAULT_VOLATILITY_LOOKUP_POINTS = (1024, 256)  # Résolution (moneyness x maturité) de la table compilée d'une nappe de volatilité
+LOCAL_VOLATILITY_CAP = 2.0  # Volatilité locale maximale de la grille de Dupire (nappe implicite avec arbitrage)
+HESTON_FFT_POINTS = 4096  # Nombre de points de la FFT de Carr-Madan
+HESTON_FFT_STEP = 0.25  # Pas de la grille d'intégration de la FFT de Carr-Madan
+HESTON_FFT_DAMPING = 1.5  # Facteur d'amortissement alpha du prix du call dans la FFT de Carr-Madan
+DEFAULT_HESTON_CALIBRATION_MONEYNESS = (0.8, 0.85, 0.9, 0.95, 1.0, 1.05, 1.1, 1.15, 1.2)  # Moneyness (K / S) de la calibration de Heston
+HESTON_QE_SWITCH = 1.5  # Seuil psi du schéma QE d'Andersen entre les lois quadratique et exponentielle de la variance
+HESTON_STEPS_PER_YEAR = 52  # Nombre minimal de pas de temps par an (hebdomadaires) des simulations de Heston entre deux dates d'observation
+BOOTSTRAP_TOLERANCE = 1e-12  # Erreur de prix maximale (pour 1 de nominal) des instruments d'une courbe bootstrappée
+BOOTSTRAP_MAX_ITERATIONS = 50  # Nombre maximal d'itérations de Newton du bootstrap d'une courbe de taux
+CURVE_LOOKUP_BUCKETS = 1024  # Nombre de cases de la table uniforme de recherche des segments d'une courbe de taux interpolée
+KEY_RATE_BUMP = 1e-4  # Choc (en taux continu) d'un point de base des sensibilités aux taux clés (DV01)
+YTM_TOLERANCE = 1e-12  # Erreur de prix maximale (pour 1 de prix) du calcul vectorisé des taux actuariels d'un portefeuille d'obligations
+YTM_MAX_ITERATIONS = 50  # Nombre maximal d'itérations de Newton du calcul des taux actuariels d'un portefeuille d'obligations
+MAX_BOND_PORTFOLIO_SIZE = 100_000  # Nombre maximal d'obligations d'une requête de pricing de portefeuille
@@ -0,0 +1,250 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+METRIC_DESCRIPTIONS: Dict[str, str] = {
+    "pricing_request_duration_seconds": "Latency of the pricing API per endpoint and product kind.",
+    "pricing_stage_duration_seconds": "Duration of each pricing stage (validation, market-data, pricing, greeks).",
+    "pricing_monte_carlo_paths_total": "Number of Monte Carlo paths simulated.",
+    "pricing_cache_requests_total": "Number of cache lookups per cache and result (hit/miss).",
+    "pricing_cache_hit_ratio": "Ratio of cache hits over cache lookups per cache.",
+    "pricing_pending_jobs": "Number of jobs queued or running in the pricing process pool.",
+    "pricing_live_ticks_total": "Number of market updates received by the live pricing WebSocket.",
+    "pricing_live_ticks_coalesced_total": "Number of market updates superseded by a newer tick before being priced.",
+}
+
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_stages", default=None
+)
+
+
+def _labels_key(labels: Dict[str, Any]) -> LabelsKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: LabelsKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra is not None else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe metrics registry rendered with the Prometheus text exposition format.
+
+    - Counters are monotonically increasing values (e.g. Monte Carlo paths).
+    - Histograms keep cumulative bucket counts, sum and count of the observed values (e.g. latencies).
+    - Gauges are point in time values (e.g. pending jobs).
+
+    Registries can be drained and merged, this is used to report the metrics recorded in the
+    process pool workers to the API process.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.__buckets = buckets
+        self.__lock = threading.Lock()
+        self.__counters: Dict[str, Dict[LabelsKey, float]] = {}
+        self.__gauges: Dict[str, Dict[LabelsKey, float]] = {}
+        # Per label set: [bucket counts..., +Inf count, sum]
+        self.__histograms: Dict[str, Dict[LabelsKey, List[float]]] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = _labels_key(labels)
+        with self.__lock:
+            series = self.__counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        with self.__lock:
+            self.__gauges.setdefault(name, {})[_labels_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels_key(labels)
+        index = bisect.bisect_left(self.__buckets, value)
+        with self.__lock:
+            series = self.__histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = [0.0] * (len(self.__buckets) + 2)
+            series[key][index] += 1
+            series[key][-1] += value
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        return self.__counters.get(name, {}).get(_labels_key(labels), 0.0)
+
+    def drain(self) -> Dict[str, Dict[str, Dict[LabelsKey, Any]]]:
+        """Return the counters and histograms recorded so far and reset them.
+
+        Returns:
+            Dict[str, Dict[str, Dict[LabelsKey, Any]]]: A picklable snapshot to be given to `merge`.
+        """
+        with self.__lock:
+            snapshot = {"counters": self.__counters, "histograms": self.__histograms}
+            self.__counters, self.__histograms = {}, {}
+        return snapshot
+
+    def merge(self, snapshot: Dict[str, Dict[str, Dict[LabelsKey, Any]]]) -> None:
+        """Add the counters and histograms of a snapshot (see `drain`) to this registry.
+
+        Args:
+            snapshot (Dict[str, Dict[str, Dict[LabelsKey, Any]]]): The snapshot to merge.
+        """
+        with self.__lock:
+            for name, series in snapshot.get("counters", {}).items():
+                own_series = self.__counters.setdefault(name, {})
+                for key, value in series.items():
+                    own_series[key] = own_series.get(key, 0.0) + value
+            for name, series in snapshot.get("histograms", {}).items():
+                own_series = self.__histograms.setdefault(name, {})
+                for key, values in series.items():
+                    if key not in own_series:
+                        own_series[key] = [0.0] * len(values)
+                    own_series[key] = [a + b for a, b in zip(own_series[key], values)]
+
+    def render(self) -> str:
+        """Render every metric with the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            str: The metrics page.
+        """
+        lines: List[str] = []
+        with self.__lock:
+            counters = {name: dict(series) for name, series in self.__counters.items()}
+            gauges = {name: dict(series) for name, series in self.__gauges.items()}
+            histograms = {
+                name: {key: list(values) for key, values in series.items()}
+                for name, series in self.__histograms.items()
+            }
+
+        cache_lookups: Dict[LabelsKey, List[float]] = {}
+        for key, value in counters.get("pricing_cache_requests_total", {}).items():
+            labels = dict(key)
+            hits_and_total = cache_lookups.setdefault(
+                _labels_key({"cache": labels["cache"]}), [0.0, 0.0]
+            )
+            hits_and_total[0] += value if labels["result"] == "hit" else 0.0
+            hits_and_total[1] += value
+        if cache_lookups:
+            gauges["pricing_cache_hit_ratio"] = {
+                key: hits / total for key, (hits, total) in cache_lookups.items()
+            }
+
+        for metric_type, metrics in (("counter", counters), ("gauge", gauges)):
+            for name, series in sorted(metrics.items()):
+                lines.append(f"# HELP {name} {METRIC_DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# HELP {name} {METRIC_DESCRIPTIONS.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, values in sorted(series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.__buckets, values):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{_format_labels(key, ('le', str(bound)))} {cumulative}"
+                    )
+                cumulative += values[len(self.__buckets)]
+                lines.append(
+                    f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {cumulative}"
+                )
+                lines.append(f"{name}_sum{_format_labels(key)} {values[-1]}")
+                lines.append(f"{name}_count{_format_labels(key)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def request_stages() -> Iterator[Dict[str, float]]:
+    """Collect the stage durations (in seconds) of the current request, see `stage_timer`.
+
+    Yields:
+        Iterator[Dict[str, float]]: The stage durations recorded while the context is active.
+    """
+    stages: Dict[str, float] = {}
+    token = _request_stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _request_stages.reset(token)
+
+
+def record_stages(stages: Dict[str, float]) -> None:
+    """Add stage durations measured elsewhere (e.g. in a worker process) to the current request.
+
+    Args:
+        stages (Dict[str, float]): The stage durations in seconds.
+    """
+    current_stages = _request_stages.get()
+    if current_stages is not None:
+        for stage, duration in stages.items():
+            current_stages[stage] = current_stages.get(stage, 0.0) + duration
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Time a pricing stage, the duration is observed in the `pricing_stage_duration_seconds`
+    histogram and added to the stages of the current request (`Server-Timing` header).
+
+    Args:
+        stage (str): The stage name among validation, market-data, pricing and greeks.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        registry.observe("pricing_stage_duration_seconds", duration, stage=stage)
+        record_stages({stage: duration})
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    registry.increment(
+        "pricing_cache_requests_total",
+        count,
+        cache=cache,
+        result="hit" if hit else "miss",
+    )
+
+
+def server_timing_header(stages: Dict[str, float], total: float) -> str:
+    """Format stage durations as a `Server-Timing` header value (durations in milliseconds).
+
+    Args:
+        stages (Dict[str, float]): The stage durations in seconds.
+        total (float): The total duration of the request in seconds.
+
+    Returns:
+        str: The header value.
+    """
+    return ", ".join(
+        f"{stage};dur={duration * 1000:.3f}"
+        for stage, duration in list(stages.items()) + [("total", total)]
+    )
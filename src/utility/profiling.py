@@ -0,0 +1,105 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+PROFILING_ENV_VARIABLE = "PRICING_PROFILE"
+PROFILING_HEADER = "X-Pricing-Profile"
+
+# Function name -> [number of calls, cumulative time in seconds]
+ProfileStats = Dict[str, List[float]]
+
+_profile: ContextVar[Optional[ProfileStats]] = ContextVar("pricing_profile", default=None)
+
+
+def profiling_enabled_by_default() -> bool:
+    """Whether every request has to be profiled (`PRICING_PROFILE=1`), otherwise only the requests
+    carrying the `X-Pricing-Profile` header are."""
+    return os.environ.get(PROFILING_ENV_VARIABLE, "0").lower() in ("1", "true", "yes")
+
+
+def profiled(function: F) -> F:
+    """Decorator recording the number of calls and the cumulative time of a function while a
+    profiling session is active (see `profiling_session`). Outside of a session the overhead
+    is a single context variable lookup.
+
+    Args:
+        function (F): The function or method to profile, it is reported by its qualified name.
+
+    Returns:
+        F: The decorated function.
+    """
+    name = function.__qualname__
+
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        stats = _profile.get()
+        if stats is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            entry = stats.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+
+    return wrapper  # type: ignore
+
+
+@contextmanager
+def profiling_session() -> Iterator[ProfileStats]:
+    """Profile the `profiled` functions called while the context is active.
+
+    Yields:
+        Iterator[ProfileStats]: The number of calls and the cumulative time per function.
+    """
+    stats: ProfileStats = {}
+    token = _profile.set(stats)
+    try:
+        yield stats
+    finally:
+        _profile.reset(token)
+
+
+def current_profile() -> Optional[ProfileStats]:
+    return _profile.get()
+
+
+def merge_profile(stats: ProfileStats) -> None:
+    """Add the statistics recorded elsewhere (e.g. in a worker process) to the current session.
+
+    Args:
+        stats (ProfileStats): The statistics to add.
+    """
+    current_stats = _profile.get()
+    if current_stats is not None:
+        for name, (calls, seconds) in stats.items():
+            entry = current_stats.setdefault(name, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+
+
+def format_profile(stats: ProfileStats) -> str:
+    """Format the statistics as a compact JSON object sorted by cumulative time.
+
+    Args:
+        stats (ProfileStats): The statistics of a profiling session.
+
+    Returns:
+        str: A JSON object mapping the function names to their calls and cumulative time in ms.
+    """
+    return json.dumps(
+        {
+            name: {"calls": int(calls), "ms": round(seconds * 1000, 3)}
+            for name, (calls, seconds) in sorted(
+                stats.items(), key=lambda item: item[1][1], reverse=True
+            )
+        },
+        separators=(",", ":"),
+    )
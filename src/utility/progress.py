@@ -0,0 +1,22 @@
+from typing import Callable, NamedTuple
+
+
+class ProgressEvent(NamedTuple):
+    """Progress of a long computation, emitted once per chunk (never per path or per step).
+
+    Attributes:
+        stage (str): The computation in progress (e.g. "monte-carlo-simulation").
+        completed (int): The number of units (e.g. time steps) already computed.
+        total (int): The total number of units to compute.
+    """
+
+    stage: str
+    completed: int
+    total: int
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
@@ -1,7 +1,19 @@
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
-from src.utility.types import BarrierDirection, BarrierType, OptionType
+from src.utility.constants import (
+    DEFAULT_SCENARIO_SPOT_SHIFTS,
+    DEFAULT_SCENARIO_VOLATILITY_SHIFTS,
+    MAX_AUTOCALL_OBSERVATIONS,
+)
+from src.utility.types import (
+    BarrierDirection,
+    BarrierType,
+    JobStatus,
+    OptionType,
+    ScenarioProductKindType,
+    VolatilityModelType,
+)
 
 
 class PricingResultBaseModel(BaseModel):
@@ -13,6 +25,101 @@ class PricingResultBaseModel(BaseModel):
     vega: float
 
 
+class JobSubmissionBaseModel(BaseModel):
+    job_id: str = Field(..., description="Identifier of the pricing job")
+    status: JobStatus = Field(..., description="Status of the pricing job")
+
+
+class JobResultBaseModel(JobSubmissionBaseModel):
+    result: Optional[PricingResultBaseModel] = Field(
+        default=None, description="Price and greeks, available once the job is done"
+    )
+    error: Optional[str] = Field(
+        default=None, description="Error message whether the job failed"
+    )
+
+
+class ScenarioBaseModel(BaseModel):
+    product: Dict[str, Any] = Field(
+        ..., description="The product to revalue, same body as its pricing endpoint"
+    )
+    spot_shifts: List[float] = Field(
+        default=list(DEFAULT_SCENARIO_SPOT_SHIFTS),
+        description="Relative spot shifts (0.05 is +5%)",
+        min_length=1,
+    )
+    volatility_shifts: List[float] = Field(
+        default=list(DEFAULT_SCENARIO_VOLATILITY_SHIFTS),
+        description="Absolute volatility shifts (0.01 is +1 volatility point)",
+        min_length=1,
+    )
+
+
+class ScenarioResultBaseModel(BaseModel):
+    spot_shifts: List[float]
+    volatility_shifts: List[float]
+    price: List[List[float]]
+    pnl: List[List[float]]
+    delta: List[List[float]]
+    gamma: List[List[float]]
+    theta: List[List[float]]
+    rho: List[List[float]]
+    vega: List[List[float]]
+
+
+class SolverBaseModel(BaseModel):
+    product: Dict[str, Any] = Field(
+        ...,
+        description="The product, same body as its pricing endpoint (the solved coupon or participation is ignored)",
+    )
+    target_price: float = Field(
+        ..., description="Target price, e.g. 98 for a reverse convertible issued at 98%", gt=0
+    )
+    maturities: Optional[List[float]] = Field(
+        default=None,
+        description="Maturities in years of the term-sheet grid, defaults to the maturity of the product",
+        min_length=1,
+    )
+    strike_prices: Optional[List[float]] = Field(
+        default=None,
+        description="Strikes of the term-sheet grid, defaults to the strike of the product",
+        min_length=1,
+    )
+
+
+class SolverResultBaseModel(BaseModel):
+    parameter: str
+    target_price: float
+    maturities: List[float]
+    strike_prices: List[float]
+    values: List[List[Optional[float]]]
+    infeasible_reason: Optional[str] = None
+
+
+class LiveSubscriptionBaseModel(BaseModel):
+    subscription_id: str = Field(..., description="Identifier of the subscription chosen by the client")
+    product_kind: ScenarioProductKindType = Field(..., description="Kind of product")
+    underlying: str = Field(..., description="Underlying whose market updates reprice the product")
+    product: Dict[str, Any] = Field(
+        ..., description="The product, same body as its pricing endpoint"
+    )
+
+
+class LiveMarketUpdateBaseModel(BaseModel):
+    underlying: str = Field(..., description="Underlying of the update")
+    spot_price: Optional[float] = Field(
+        default=None, description="New spot price of the underlying", gt=0
+    )
+    volatility: Optional[float] = Field(
+        default=None,
+        description="New flat volatility, it replaces the volatility surface",
+        gt=0,
+    )
+    rate: Optional[float] = Field(
+        default=None, description="New flat rate, it replaces the rate curve"
+    )
+
+
 class OptionBaseModel(BaseModel):
     spot_price: float = Field(
         default=100.0, description="Spot price of the underlying", gt=0
@@ -39,6 +146,10 @@ class OptionBaseModel(BaseModel):
         default=None,
         description="The implied volatility surface with first keys as maturity and second keys as moneyness.",
     )
+    volatility_model: Optional[VolatilityModelType] = Field(
+        default=None,
+        description="The model of the volatility surface among 'spline' (default, needs a full grid of quotes), 'svi' (SVI smile per maturity) and 'ssvi' (arbitrage-free SSVI surface).",
+    )
     option_type: OptionType
 
 
@@ -52,6 +163,29 @@ class BarrierOptionBaseModel(OptionBaseModel):
     barrier_direction: BarrierDirection = Field(..., description="Barrier type up/down")
 
 
+class HestonOptionBaseModel(OptionBaseModel):
+    initial_variance: Optional[float] = Field(
+        default=None,
+        description="Initial variance of the Heston model. Give the 5 parameters, or none of them to calibrate the model to the volatility.",
+        gt=0,
+    )
+    mean_reversion: Optional[float] = Field(
+        default=None, description="Speed of mean reversion of the variance", gt=0
+    )
+    long_term_variance: Optional[float] = Field(
+        default=None, description="Long term variance", gt=0
+    )
+    volatility_of_variance: Optional[float] = Field(
+        default=None, description="Volatility of the variance", gt=0
+    )
+    correlation: Optional[float] = Field(
+        default=None,
+        description="Correlation between the underlying and its variance",
+        ge=-1,
+        le=1,
+    )
+
+
 class OptionStrategyBaseModel(BaseModel):
     spot_price: float = Field(
         default=100.0, description="Spot price of the underlying", gt=0
@@ -72,6 +206,10 @@ class OptionStrategyBaseModel(BaseModel):
         default=None,
         description="The implied volatility surface with first keys as maturity and second keys as moneyness.",
     )
+    volatility_model: Optional[VolatilityModelType] = Field(
+        default=None,
+        description="The model of the volatility surface among 'spline' (default, needs a full grid of quotes), 'svi' (SVI smile per maturity) and 'ssvi' (arbitrage-free SSVI surface).",
+    )
 
 
 class StraddleStrategyBaseModel(OptionStrategyBaseModel):
@@ -151,6 +289,35 @@ class BondBaseModel(ZeroCouponBondBaseModel):
     nb_coupon: int = Field(default=1, description="Number of coupons in the bond", gt=0)
 
 
+class BondPortfolioBaseModel(BaseModel):
+    rate: Optional[float] = Field(
+        default=None, description="Interest rates to calculate the price (discount)."
+    )
+    rate_curve: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Interest rates curve dictionary maturity as keys and rates as values",
+    )
+    nominals: List[float] = Field(
+        ..., description="Nominal values of the bonds in currency", min_length=1
+    )
+    coupon_rates: List[float] = Field(
+        ..., description="Annual coupon rates of the bonds", min_length=1
+    )
+    frequencies: List[int] = Field(
+        ..., description="Numbers of coupons a year of the bonds", min_length=1
+    )
+    maturities: List[float] = Field(
+        ..., description="Maturities of the bonds in years", min_length=1
+    )
+
+
+class BondPortfolioResultBaseModel(BaseModel):
+    price: List[float]
+    ytm: List[float]
+    duration: List[float]
+    convexity: List[float]
+
+
 class StructuredProduct(BaseModel):
     spot_price: float = Field(
         default=100.0, description="Spot price of the underlying", gt=0
@@ -168,11 +335,18 @@ class StructuredProduct(BaseModel):
         default=None,
         description="The implied volatility surface with first keys as maturity and second keys as moneyness.",
     )
+    volatility_model: Optional[VolatilityModelType] = Field(
+        default=None,
+        description="The model of the volatility surface among 'spline' (default, needs a full grid of quotes), 'svi' (SVI smile per maturity) and 'ssvi' (arbitrage-free SSVI surface).",
+    )
     maturity: float = Field(default=1, description="Maturity in years", gt=0)
 
 
 class ReverseConvertibleBaseModel(StructuredProduct):
     coupon: float = Field(..., description="Coupon rate", ge=0)
+    strike_price: Optional[float] = Field(
+        default=None, description="Strike of the embedded put, defaults to the spot price", gt=0
+    )
 
 
 class OutperformerCertificateBaseModel(StructuredProduct):
@@ -186,3 +360,61 @@ class OutperformerCertificateBaseModel(StructuredProduct):
     participation: float = Field(
         default=1, description="The participation in (%), 1=100%.", ge=1
     )
+    strike_price: Optional[float] = Field(
+        default=None, description="Strike of the embedded call, defaults to the spot price", gt=0
+    )
+
+
+class AutocallableBaseModel(StructuredProduct):
+    coupon: float = Field(..., description="Coupon paid per observation date", ge=0)
+    autocall_barrier: float = Field(
+        default=1.0, description="Autocall barrier in percentage of the initial spot", gt=0
+    )
+    coupon_barrier: float = Field(
+        default=0.8, description="Coupon barrier in percentage of the initial spot", gt=0
+    )
+    ki_barrier: float = Field(
+        default=0.6,
+        description="Knock-in barrier of the put observed at maturity in percentage of the initial spot",
+        gt=0,
+    )
+    memory: bool = Field(
+        default=True, description="Whether the missed coupons are paid back (Phoenix memory)"
+    )
+    observation_dates: Optional[List[float]] = Field(
+        default=None,
+        description="Observation dates in years, the last one being the maturity",
+        min_length=1,
+        max_length=MAX_AUTOCALL_OBSERVATIONS,
+    )
+    nb_observations: int = Field(
+        default=4,
+        description="Number of evenly spaced observation dates when no dates are given",
+        gt=0,
+        le=MAX_AUTOCALL_OBSERVATIONS,
+    )
+    initial_spot: Optional[float] = Field(
+        default=None,
+        description="Strike level of the note, defaults to the spot price",
+        gt=0,
+    )
+
+
+class CapitalProtectedNoteBaseModel(StructuredProduct):
+    protection: float = Field(
+        default=1.0, description="Protected part of the nominal, 0.9=90%", ge=0
+    )
+    participation: float = Field(
+        default=1.0, description="Participation in the rise of the underlying, 1=100%", gt=0
+    )
+    cap: Optional[float] = Field(
+        default=None,
+        description="Cap of the performance in percentage of the spot price, 1.3 caps at +30%",
+        gt=1,
+    )
+
+
+class DiscountCertificateBaseModel(StructuredProduct):
+    cap: float = Field(
+        ..., description="Cap level in percentage of the spot price, 0.95 caps at 95%", gt=0
+    )
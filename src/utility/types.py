@@ -6,14 +6,37 @@ DayCountConvention = Literal["ACT/360", "ACT/365"]
 
 
 OptionType = Literal["call", "put"]
-ProductKindType = Literal["reverse-convertible", "outperformer-certificate"]
-OptionKindType = Literal["vanilla", "binary", "barrier"]
+ProductKindType = Literal[
+    "reverse-convertible",
+    "outperformer-certificate",
+    "autocallable",
+    "capital-protected-note",
+    "discount-certificate",
+]
+OptionKindType = Literal["vanilla", "binary", "barrier", "heston"]
 BondType = Literal["vanilla", "zero-coupon"]
 OptionStrategyType = Literal[
     "straddle", "strangle", "butterfly", "call-spread", "put-spread", "strip", "strap"
 ]
 BarrierDirection = Literal["up", "down"]
 BarrierType = Literal["ko", "ki"]
+BasketType = Literal["worst-of", "best-of"]
+VolatilityModelType = Literal["spline", "svi", "ssvi"]
+JobStatus = Literal["pending", "running", "done", "failed"]
+SolverProductKindType = Literal["reverse-convertible", "outperformer-certificate"]
+ScenarioProductKindType = Literal[
+    "vanilla",
+    "binary",
+    "straddle",
+    "strangle",
+    "butterfly",
+    "call-spread",
+    "put-spread",
+    "strip",
+    "strap",
+    "reverse-convertible",
+    "outperformer-certificate",
+]
 
 
 class Maturity: